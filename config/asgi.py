@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with uvicorn (SERVER_MODE=asgi in entrypoint.sh); setting SERVER_MODE
+here routes the hot read endpoints to their async views.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +14,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('EMAIL_FILTER_PRELOAD', 'True')
+os.environ.setdefault('SERVER_MODE', 'asgi')
 
 application = get_asgi_application()
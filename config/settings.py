@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -33,7 +34,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv('SECRET_KEY')
-DEBUG = os.getenv('DEBUG', 'True')
+DEBUG = os.getenv('DEBUG', 'True').lower() in ('1', 'true', 'yes')
 ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
 
 
@@ -51,7 +52,6 @@ INSTALLED_APPS = [
     'drf_yasg',
     'debug_toolbar',
     'rest_framework',
-    'rest_framework.authtoken',
     'djoser',
     # My apps
     'core',
@@ -65,8 +65,10 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db.routers.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.response_cache.AnonymousResponseCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -87,22 +89,185 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# 'asgi' when served by config.asgi (set there), which routes hot read endpoints to async
+# views; sync-only views such as uploads then run on a pool of ASGI_SYNC_THREADS threads
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+ASGI_SYNC_THREADS = int(os.getenv('ASGI_SYNC_THREADS', 16))
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections come from a bounded per-process pool of DB_POOL_SIZE (core.db.pool), waiting
+# up to DB_POOL_TIMEOUT seconds for a free one; DB_POOL_SIZE=0 falls back to persistent
+# per-thread connections kept for DB_CONN_MAX_AGE seconds
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'core.db.backends.mysql_pool' if DB_POOL_SIZE else 'django.db.backends.mysql',
         'NAME': os.getenv('MYSQL_DATABASE'),  
         'USER': os.getenv('DB_USER'),         
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'max_size': DB_POOL_SIZE,
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+                'max_lifetime': int(os.getenv('DB_POOL_MAX_LIFETIME', 30 * 60)),
+            },
+        } if DB_POOL_SIZE else {},
     }
 }
 
+# Read replicas: DB_REPLICA_HOSTS=host[:port],... adds aliases replica1, replica2, ... with
+# the default credentials. Safe-method reads of REPLICA_READ_MODELS go to a replica lagging
+# at most REPLICA_MAX_LAG_SECONDS (probed every REPLICA_LAG_CHECK_INTERVAL seconds), except
+# for clients that wrote in the last REPLICA_PIN_SECONDS. Token clients are pinned by user id
+# in CACHES[REPLICA_PIN_CACHE], which must be shared by all workers (checked at startup) so
+# a write through one worker is read back from the primary by the others. Without
+# replicas the router isn't installed at all.
+
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    host, _, port = address.strip().partition(':')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'], 'HOST': host, 'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter'] if DATABASE_REPLICAS else []
+REPLICA_READ_MODELS = ['recruitment.job', 'recruitment.category', 'recruitment.tag']
+REPLICA_PIN_CACHE = 'default'
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 10))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 2))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', 5))
+REPLICA_LAG_PROBE = 'core.db.routers.replica_lag'
+
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at memcached or redis
+# so idempotency keys and other shared state are visible to every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'job-board'),
+    },
+    # Rate-limit counters; per-process memory by default so a check costs microseconds,
+    # point it at a shared backend to enforce limits across workers (and for
+    # `manage.py throttle_stats`, which can't read other processes' memory)
+    'throttle': {
+        'BACKEND': os.getenv('THROTTLE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION', 'job-board-throttle'),
+    },
+    # Anonymous responses of public endpoints and their invalidation tags
+    'responses': {
+        'BACKEND': os.getenv('RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', 'job-board-responses'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 5000))},
+    },
+}
+
+# Anonymous response cache: seconds an entry lives (0 disables it), the largest response
+# stored, and the models whose writes invalidate entries; responses reading any other
+# model aren't cached. Invalidation tags live in the cache too, so it needs
+# RESPONSE_CACHE_BACKEND to be shared by all workers (checked at startup): with
+# per-process memory a job deactivated in one worker would still be served by the
+# others, so the cache is then off unless RESPONSE_CACHE_TTL says otherwise.
+RESPONSE_CACHE = 'responses'
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 0 if CACHES[RESPONSE_CACHE]['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache',
+) else 300))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRY_BYTES', 512 * 1024))
+RESPONSE_CACHE_MODELS = ['recruitment.job', 'recruitment.category', 'recruitment.tag', 'core.user']
+
+# Seconds between checks of the shared reference-data version (categories and tags kept in
+# memory by every process); writes are validated against a freshly checked snapshot. The
+# version only reaches other workers through a shared CACHE_BACKEND, and never covers
+# loaddata or raw SQL, so every snapshot is also reloaded after REFERENCE_DATA_MAX_AGE
+# seconds, and an id it lacks is looked up in the database before being rejected.
+REFERENCE_DATA_CHECK_INTERVAL = float(os.getenv('REFERENCE_DATA_CHECK_INTERVAL', 1))
+REFERENCE_DATA_MAX_AGE = float(os.getenv('REFERENCE_DATA_MAX_AGE', 60))
+
+# Seconds a stored response is replayed for a repeated Idempotency-Key, and how long a
+# request still in progress holds its key; keep the latter just above the worker timeout
+# (gunicorn's default is 30s) so a killed worker releases the key soon after
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 60 * 60 * 24))
+IDEMPOTENCY_PENDING_TTL = int(os.getenv('IDEMPOTENCY_PENDING_TTL', 60))
+
+# Token authentication cache: seconds a token's user snapshot lives in the shared cache,
+# and the size/lifetime of the per-process tier in front of it. Logout and user changes
+# only reach other workers through a shared CACHE_BACKEND (checked at startup), so with
+# per-process memory the cache is off (0) and each request loads its token
+AUTH_TOKEN_CACHE_TTL = int(os.getenv('AUTH_TOKEN_CACHE_TTL', 0 if CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache',
+) else 300))
+AUTH_TOKEN_LOCAL_CACHE_TTL = float(os.getenv('AUTH_TOKEN_LOCAL_CACHE_TTL', 5))
+AUTH_TOKEN_LOCAL_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_LOCAL_CACHE_SIZE', 1024))
+
+# API token lifecycle: how long a token lives, how often its last use is recorded (seconds)
+# and how many expired tokens `purge_tokens` deletes per statement
+AUTH_TOKEN_LIFETIME = timedelta(days=int(os.getenv('AUTH_TOKEN_LIFETIME_DAYS', 14)))
+AUTH_TOKEN_LAST_USED_GRANULARITY = int(os.getenv('AUTH_TOKEN_LAST_USED_GRANULARITY', 300))
+AUTH_TOKEN_PURGE_CHUNK_SIZE = int(os.getenv('AUTH_TOKEN_PURGE_CHUNK_SIZE', 1000))
+
+# Sessions: per-process LRU -> shared cache -> database. With SESSION_WRITE_BEHIND_SECONDS
+# above 0, routine session updates are written behind, coalesced per key, once the oldest
+# is that old or SESSION_WRITE_BEHIND_BATCH keys are pending. The cache tiers need
+# CACHE_BACKEND to be shared by all workers (checked at startup): with per-process memory
+# a session logged out in one worker would stay valid in the others, so sessions then
+# live in the database only.
+SESSION_ENGINE = 'django.contrib.sessions.backends.db' if CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache',
+) else 'core.sessions'
+SESSION_LOCAL_CACHE_SIZE = int(os.getenv('SESSION_LOCAL_CACHE_SIZE', 2048))
+SESSION_LOCAL_CACHE_TTL = float(os.getenv('SESSION_LOCAL_CACHE_TTL', 5))
+SESSION_WRITE_BEHIND_SECONDS = float(os.getenv('SESSION_WRITE_BEHIND_SECONDS', 0))
+SESSION_WRITE_BEHIND_BATCH = int(os.getenv('SESSION_WRITE_BEHIND_BATCH', 100))
+SESSION_PURGE_CHUNK_SIZE = int(os.getenv('SESSION_PURGE_CHUNK_SIZE', 1000))
+
+# Bloom filter behind the email availability check: target false-positive rate, minimum
+# capacity, and how long published signups stay in the shared cache for other processes.
+# Signups only reach other workers' filters through a shared CACHE_BACKEND (checked at
+# startup): with per-process memory an email registered in one worker would be reported
+# free by the others, so the filter is then off and every check queries the database.
+# Server processes (config.wsgi / config.asgi) build it at startup; management commands
+# and tests leave EMAIL_FILTER_PRELOAD off and build it on first use
+EMAIL_FILTER_ENABLED = os.getenv('EMAIL_FILTER_ENABLED', str(CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache',
+))).lower() in ('1', 'true', 'yes')
+EMAIL_FILTER_PRELOAD = os.getenv('EMAIL_FILTER_PRELOAD', 'False').lower() in ('1', 'true', 'yes')
+EMAIL_FILTER_ERROR_RATE = float(os.getenv('EMAIL_FILTER_ERROR_RATE', 0.01))
+EMAIL_FILTER_MIN_CAPACITY = int(os.getenv('EMAIL_FILTER_MIN_CAPACITY', 100000))
+EMAIL_FILTER_ENTRY_TTL = int(os.getenv('EMAIL_FILTER_ENTRY_TTL', 60 * 60 * 24))
+
+# Interview calendar feeds: cache lifetime in seconds and how far back past interviews are kept.
+# Interview changes and revoked feed URLs only reach other workers through a shared
+# CACHE_BACKEND (checked at startup), so with per-process memory feeds aren't cached (0)
+# and each poll is rendered from the database
+INTERVIEW_FEED_TTL = int(os.getenv('INTERVIEW_FEED_TTL', 0 if CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache',
+) else 60 * 60 * 24))
+INTERVIEW_FEED_PAST_DAYS = int(os.getenv('INTERVIEW_FEED_PAST_DAYS', 30))
+
+# Interview reminders: minutes before the interview, and the dotted path of the sender class
+INTERVIEW_REMINDER_OFFSETS = [
+    int(offset) for offset in os.getenv('INTERVIEW_REMINDER_OFFSETS', '1440,60').split(',') if offset.strip()
+]
+INTERVIEW_REMINDER_SENDER = os.getenv('INTERVIEW_REMINDER_SENDER', 'recruitment.reminders.EmailReminderSender')
+
+# Email; use EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend locally
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'no-reply@job-board.local')
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -143,6 +308,21 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resumes are only served through permission-checked endpoints.
+# 'django' streams via FileResponse; 'x-accel-redirect' (nginx) or 'x-sendfile' hand the body to the web server.
+PROTECTED_MEDIA_SERVER = os.getenv('PROTECTED_MEDIA_SERVER', 'django')
+PROTECTED_MEDIA_INTERNAL_URL = os.getenv('PROTECTED_MEDIA_INTERNAL_URL', '/protected-media/')
+PROTECTED_MEDIA_PREFIXES = ('resumes/',)
+
+# OpenAPI schema: generated once per code version (CODE_VERSION, e.g. the deployed commit,
+# or a hash of the sources) into SCHEMA_CACHE_DIR and served from there; the docs pages
+# load it from SPEC_URL
+CODE_VERSION = os.getenv('CODE_VERSION', '')
+SCHEMA_CACHE_DIR = os.getenv('SCHEMA_CACHE_DIR', os.path.join(BASE_DIR, 'var', 'schema'))
+SCHEMA_MAX_AGE = int(os.getenv('SCHEMA_MAX_AGE', 300))
+SWAGGER_SETTINGS = {'SPEC_URL': '/swagger.json'}
+REDOC_SETTINGS = {'SPEC_URL': '/swagger.json'}
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -151,16 +331,55 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Stateless JWT mode (djoser's /api/auth/jwt/ endpoints) for clients that want to avoid
+# the token lookup entirely; access tokens carry role/is_staff claims
+JWT_AUTH_ENABLED = os.getenv('JWT_AUTH_ENABLED', 'False').lower() in ('1', 'true', 'yes')
+JWT_DENYLIST_REFRESH_SECONDS = int(os.getenv('JWT_DENYLIST_REFRESH_SECONDS', 30))
+
 REST_FRAMEWORK = {
     'COERCE_DECIMAL_TO_STRING': False,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
+    ) + (('core.authentication.ClaimsJWTAuthentication',) if JWT_AUTH_ENABLED else ()),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'core.throttling.IPThrottle',
+        'core.throttling.EmailThrottle',
+        'core.throttling.UserThrottle',
     ),
+    # '<scope>.<ip|email|user>': budget per sliding window, in cost units
+    'DEFAULT_THROTTLE_RATES': {
+        'auth.ip': os.getenv('THROTTLE_AUTH_IP_RATE', '120/min'),
+        'auth.email': os.getenv('THROTTLE_AUTH_EMAIL_RATE', '30/min'),
+        'auth.user': os.getenv('THROTTLE_AUTH_USER_RATE', '120/min'),
+    },
+}
+
+THROTTLE_CACHE = 'throttle'
+
+# (scope, cost) for third-party views, by URL name or '<url name>:<METHOD>'. Costs reflect
+# how expensive a request is: logins and signups hash a password, check-email doesn't
+THROTTLE_VIEW_SCOPES = {
+    'login': ('auth', 5),
+    'jwt-create': ('auth', 5),
+    'user-list:POST': ('auth', 10),
+    'user-activation': ('auth', 5),
+    'user-resend-activation': ('auth', 5),
+    'user-reset-password': ('auth', 5),
+    'user-reset-password-confirm': ('auth', 5),
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_MINUTES', 5))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_DAYS', 1))),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'core.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'core.serializers.DenylistTokenRefreshSerializer',
 }
 
 DJOSER = {
     'LOGIN_FIELD': 'email',
+    'TOKEN_MODEL': 'core.models.AuthToken',
     'USER_CREATE_PASSWORD_RETYPE': True,
     'SERIALIZERS': {
         'user_create': 'core.serializers.UserSerializer',
@@ -1,27 +1,14 @@
+import re
+
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
-
-from rest_framework import permissions
-
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
+from core.downloads import serve_media
+from core.schema import schema_file, ui_view
+from core.urls import token_urlpatterns
 
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Job Board API",
-        default_version='v1',
-        description="API documentation for the Job Board system.",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="hatef.barin97@gmail.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
 
 urlpatterns = [
     # Admin
@@ -30,6 +17,7 @@ urlpatterns = [
     # Authentication (Djoser)
     path('api/auth/', include('djoser.urls')),
     path('api/auth/', include('djoser.urls.authtoken')),
+    path('api/auth/', include(token_urlpatterns)),
 
     # Core app
     path('api/core/', include('core.urls')),
@@ -37,16 +25,29 @@ urlpatterns = [
     # Recruitment app
     path('api/recruitment/', include('recruitment.urls')),
 
-    # Swagger / ReDoc
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Swagger / ReDoc, from the schema pre-generated by `manage.py generate_schema`
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_file, name='schema-json'),
+    path('swagger/', ui_view('swagger'), name='schema-swagger-ui'),
+    path('redoc/', ui_view('redoc'), name='schema-redoc'),
 ]
 
+# Optional stateless JWT mode
+if settings.JWT_AUTH_ENABLED:
+    from core.urls import jwt_urlpatterns
+
+    urlpatterns += [
+        path('api/auth/', include('djoser.urls.jwt')),
+        path('api/auth/', include(jwt_urlpatterns)),
+    ]
+
 # Debug toolbar (development only)
 if settings.DEBUG:
     import debug_toolbar
     urlpatterns += [path('__debug__/', include(debug_toolbar.urls))]
 
-# Media file serving
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media file serving (development only); protected prefixes such as resumes are
+# reachable exclusively through the permission-checked download endpoints
+if settings.DEBUG:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media),
+    ]
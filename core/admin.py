@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.utils.text import smart_split, unescape_string_literal
 from django.utils.translation import gettext_lazy as _
 
-from core.models import User, EmployerProfile, ApplicantProfile
+from core.models import User, AuthToken, EmployerProfile, ApplicantProfile
+from core.search import search_users
 
 
 
@@ -52,6 +54,14 @@ class UserAdmin(BaseUserAdmin):
             return []
         return [EmployerProfileInline] if obj.role == 'employer' else [ApplicantProfileInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Served from the trigram index instead of icontains scans over `search_fields`
+        terms = [
+            unescape_string_literal(term) if len(term) > 1 and term[0] in '"\'' and term[-1] == term[0] else term
+            for term in smart_split(search_term)
+        ]
+        return search_users(queryset, [term for term in terms if term]), False
+
 
 
 # Employer Profile Admin
@@ -69,4 +79,15 @@ class ApplicantProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'created_at')
     search_fields = ('user__email', 'user__first_name', 'user__last_name')
     readonly_fields = ('created_at',)
-    
\ No newline at end of file
+    
+
+
+
+# API Token Admin
+@admin.register(AuthToken)
+class AuthTokenAdmin(admin.ModelAdmin):
+    list_display = ('user', 'created', 'expires_at', 'last_used_at')
+    search_fields = ('user__email',)
+    readonly_fields = ('key', 'created', 'last_used_at')
+    raw_id_fields = ('user',)
+    ordering = ('-created',)
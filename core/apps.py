@@ -6,4 +6,10 @@ class CoreConfig(AppConfig):
     name = 'core'
     def ready(self):
         import core.signals
+        from django.conf import settings
+        from core.bloom import email_filter
+        from core.caches import check_shared_caches
+        check_shared_caches()
+        if settings.EMAIL_FILTER_ENABLED and settings.EMAIL_FILTER_PRELOAD:
+            email_filter.preload()
         
\ No newline at end of file
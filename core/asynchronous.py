@@ -0,0 +1,194 @@
+"""
+Helpers for serving DRF endpoints from the ASGI entry point (SERVER_MODE = 'asgi').
+
+Hot read endpoints get async views that keep DRF's request handling (authentication,
+permissions, throttling, content negotiation and rendering) but load their data with
+the async ORM. Sync-only views such as uploads and file downloads run on a bounded
+thread pool, as do the chunks of the files and archives they stream.
+"""
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.urls import URLPattern
+from django.views.decorators.csrf import csrf_exempt
+
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+
+
+sync_pool = ThreadPoolExecutor(max_workers=settings.ASGI_SYNC_THREADS, thread_name_prefix='sync-view')
+
+
+def offload(view):
+    """Wrap the sync `view` as an async view that runs on `sync_pool`."""
+    def run(request, *args, **kwargs):
+        # Pool threads outlive requests, so recycle their connections like the handler does
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)):
+                response = response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    run_async = sync_to_async(run, thread_sensitive=False, executor=sync_pool)
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        response = await run_async(request, *args, **kwargs)
+        if response.streaming and not response.is_async:
+            # Django would otherwise read a sync stream into memory before sending it
+            response.streaming_content = _stream_on_pool(response.streaming_content)
+        return response
+    return wrapper
+
+
+async def _stream_on_pool(iterator):
+    next_chunk = sync_to_async(next, thread_sensitive=False, executor=sync_pool)
+    end = object()
+    while (chunk := await next_chunk(iterator, end)) is not end:
+        yield chunk
+
+
+
+class AsyncEndpoint:
+    """
+    One DRF view instance driven from an async view. `start()` runs DRF's `initial()`
+    (authentication, permissions, throttles, content negotiation) in a worker thread,
+    since authenticating may hit the cache or database; the caller then awaits its own
+    queries and returns `respond(data)`.
+
+    Serializers run in the event loop, so everything they read must already be loaded:
+    the viewsets' query plans select and prefetch each relation they serialize.
+    """
+
+    def __init__(self, view_class, request, action=None, **kwargs):
+        self.view = view_class(action=action, args=(), kwargs=kwargs, format_kwarg=None)
+        if action is not None:
+            self.view.action_map = {request.method.lower(): action}
+        self.view.headers = self.view.default_response_headers
+        self.request = self.view.initialize_request(request, **kwargs)
+        self.view.request = self.request
+
+    async def start(self):
+        """Run DRF's checks; returns the error response, or None to go ahead."""
+        try:
+            await sync_to_async(self.view.initial)(self.request, **self.view.kwargs)
+        except Exception as exc:
+            return self.error(exc)
+        return None
+
+    def error(self, exc):
+        return self.finalize(self.view.handle_exception(exc))
+
+    def respond(self, data, status=200):
+        return self.finalize(Response(data, status=status))
+
+    def finalize(self, response):
+        response = self.view.finalize_response(self.request, response)
+        if response.accepted_renderer.format != 'json':
+            # The browsable API renders forms that may query the database; Django renders
+            # it in a thread
+            return response
+        response.render()
+        # A plain HttpResponse keeps Django from hopping to a thread just to call render()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
+
+
+def async_list(viewset_class):
+    """Async `list` for a model viewset: its queryset, filters and serializer over the async ORM."""
+    async def view(request, **kwargs):
+        endpoint = AsyncEndpoint(viewset_class, request, action='list', **kwargs)
+        error = await endpoint.start()
+        if error is not None:
+            return error
+        viewset = endpoint.view
+        try:
+            objects = [obj async for obj in viewset.filter_queryset(viewset.get_queryset())]
+            return endpoint.respond(viewset.get_serializer(objects, many=True).data)
+        except Exception as exc:
+            return endpoint.error(exc)
+    return view
+
+
+def async_retrieve(viewset_class):
+    """Async `retrieve` for a model viewset, looked up by its `lookup_field` like `get_object()`."""
+    async def view(request, **kwargs):
+        endpoint = AsyncEndpoint(viewset_class, request, action='retrieve', **kwargs)
+        error = await endpoint.start()
+        if error is not None:
+            return error
+        viewset = endpoint.view
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        try:
+            queryset = viewset.filter_queryset(viewset.get_queryset())
+            try:
+                obj = await queryset.filter(**{viewset.lookup_field: kwargs[lookup_url_kwarg]}).afirst()
+            except (TypeError, ValueError, DjangoValidationError):
+                obj = None
+            if obj is None:
+                raise NotFound()
+            viewset.check_object_permissions(endpoint.request, obj)
+            return endpoint.respond(viewset.get_serializer(obj).data)
+        except Exception as exc:
+            return endpoint.error(exc)
+    return view
+
+
+def async_action(viewset_class, action):
+    """
+    Async view for a viewset `action` that does no I/O of its own once `initial()` has run,
+    such as one answering from memory; it runs in the event loop.
+    """
+    async def view(request, **kwargs):
+        endpoint = AsyncEndpoint(viewset_class, request, action=action, **kwargs)
+        error = await endpoint.start()
+        if error is not None:
+            return error
+        try:
+            return endpoint.finalize(getattr(endpoint.view, action)(endpoint.request, **kwargs))
+        except Exception as exc:
+            return endpoint.error(exc)
+    return view
+
+
+def async_route(async_view, fallback, methods=('GET', 'HEAD')):
+    """Serve `methods` with `async_view` and every other method with the sync `fallback`."""
+    run_fallback = sync_to_async(fallback)
+
+    @csrf_exempt
+    async def view(request, *args, **kwargs):
+        if request.method in methods:
+            return await async_view(request, *args, **kwargs)
+        return await run_fallback(request, *args, **kwargs)
+    # Keep `cls`, `actions` and `initkwargs` for schema generation and other introspection
+    view.__dict__.update(fallback.__dict__)
+    return view
+
+
+def async_urlpatterns(patterns, views, methods=('GET', 'HEAD'), offloaded=()):
+    """
+    `patterns` with the view of each URL name in `views` routed through `async_route()`
+    for `methods`, and the view of each URL name in `offloaded` run by `offload()`.
+    """
+    routed = []
+    for pattern in patterns:
+        if isinstance(pattern, URLPattern) and pattern.name in views:
+            callback = async_route(views[pattern.name], pattern.callback, methods)
+        elif isinstance(pattern, URLPattern) and pattern.name in offloaded:
+            callback = offload(pattern.callback)
+        else:
+            routed.append(pattern)
+            continue
+        routed.append(URLPattern(pattern.pattern, callback, pattern.default_args, pattern.name))
+    return routed
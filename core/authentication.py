@@ -0,0 +1,209 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from core.lru import LRUCache
+from core.models import User, AuthToken, RevokedAccessToken
+
+
+
+# Every column except the password hash, in model order as from_db() expects
+SNAPSHOT_FIELDS = tuple(field.attname for field in User._meta.concrete_fields if field.attname != 'password')
+
+local_tokens = LRUCache(
+    maxsize=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE, ttl=settings.AUTH_TOKEN_LOCAL_CACHE_TTL,
+)
+
+
+def token_cache_key(key):
+    # Hash the key so raw credentials never appear in the shared cache
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    cache_key = token_cache_key(key)
+    local_tokens.delete(cache_key)
+    cache.delete(cache_key)
+
+
+def snapshot_user(user):
+    return tuple(getattr(user, name) for name in SNAPSHOT_FIELDS)
+
+
+def restore_user(values):
+    # from_db() marks the instance as persisted, so it can still be saved; the password
+    # (and anything else not in the snapshot) is deferred and loaded only if accessed
+    return User.from_db('default', SNAPSHOT_FIELDS, values)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` over `AuthToken`, without the per-request token/user join.
+
+    A token resolves to its expiry, last use and a snapshot of its user, read first from a
+    per-process LRU (`AUTH_TOKEN_LOCAL_CACHE_TTL`, a few seconds) and then from the shared
+    cache (`AUTH_TOKEN_CACHE_TTL`); only a miss in both queries the database. Logout,
+    deleting the token and any save of the user other than a `last_login` bump evict the
+    shared entry immediately, and other workers drop their local copy within the local TTL.
+    Eviction only reaches other workers through a shared cache, so without one (the TTL
+    is then 0) every request loads the token from the database.
+    """
+    model = AuthToken
+    token_fields = ('key', 'user_id', 'created', 'expires_at', 'last_used_at')
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        if not settings.AUTH_TOKEN_CACHE_TTL:
+            cached = self._load_token(key)
+        else:
+            cached = local_tokens.get(cache_key)
+            if cached is None:
+                cached = cache.get(cache_key)
+                if cached is None:
+                    cached = self._load_token(key)
+                    cache.set(cache_key, cached, settings.AUTH_TOKEN_CACHE_TTL)
+                local_tokens.set(cache_key, cached)
+
+        created, expires_at, last_used_at, values = cached
+        now = timezone.now()
+        if expires_at <= now:
+            raise exceptions.AuthenticationFailed('Token has expired.')
+        user = restore_user(values)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        if last_used_at is None or (now - last_used_at).total_seconds() >= settings.AUTH_TOKEN_LAST_USED_GRANULARITY:
+            last_used_at = self._touch(key, cache_key, cached, now)
+        token = AuthToken.from_db('default', self.token_fields, (key, user.pk, created, expires_at, last_used_at))
+        token.user = user
+        return user, token
+
+    def _touch(self, key, cache_key, cached, now):
+        # Whichever worker claims the slot records the use; the rest just refresh their copy
+        if cache.add(f'{cache_key}:touched', True, settings.AUTH_TOKEN_LAST_USED_GRANULARITY):
+            AuthToken.objects.filter(key=key).update(last_used_at=now)
+            if settings.AUTH_TOKEN_CACHE_TTL:
+                cache.set(cache_key, cached[:2] + (now,) + cached[3:], settings.AUTH_TOKEN_CACHE_TTL)
+        if settings.AUTH_TOKEN_CACHE_TTL:
+            local_tokens.set(cache_key, cached[:2] + (now,) + cached[3:])
+        return now
+
+    def _load_token(self, key):
+        """The token's expiry, last use and user snapshot, from the database."""
+        try:
+            token = AuthToken.objects.select_related('user').get(key=key)
+        except AuthToken.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        return token.created, token.expires_at, token.last_used_at, snapshot_user(token.user)
+
+
+
+# Claims copied into JWTs so role checks never need the user row
+CLAIM_FIELDS = ('email', 'role', 'is_staff')
+
+
+def add_user_claims(token, user):
+    for name in CLAIM_FIELDS:
+        token[name] = getattr(user, name)
+    return token
+
+
+def token_user_id(token):
+    # simplejwt serializes the id as a string
+    return User._meta.pk.to_python(token.get(jwt_settings.USER_ID_CLAIM))
+
+
+def user_from_claims(token):
+    values = {'id': token_user_id(token), 'is_active': True}
+    values.update((name, token[name]) for name in CLAIM_FIELDS)
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db('default', names, [values[name] for name in names])
+
+
+class TokenDenylist:
+    """
+    Process-local copy of the unexpired `RevokedAccessToken` rows, reloaded at most every
+    `JWT_DENYLIST_REFRESH_SECONDS`. Only entries that can still match a live token are kept,
+    so it stays small: revoked jtis, plus a per-user cut-off for tokens issued earlier.
+    """
+
+    def __init__(self):
+        self.jtis = frozenset()
+        self.users = {}
+        self.loaded_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        rows = RevokedAccessToken.objects.filter(expires_at__gt=timezone.now()).values_list(
+            'jti', 'user_id', 'created_at'
+        )
+        jtis, users = set(), {}
+        for jti, user_id, created_at in rows:
+            if jti:
+                jtis.add(jti)
+            else:
+                users[user_id] = max(users.get(user_id, created_at), created_at)
+        self.jtis, self.users = frozenset(jtis), users
+        self.loaded_at = time.monotonic()
+
+    def _refresh_if_stale(self):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > settings.JWT_DENYLIST_REFRESH_SECONDS:
+            with self._lock:
+                if self.loaded_at is None or time.monotonic() - self.loaded_at > settings.JWT_DENYLIST_REFRESH_SECONDS:
+                    self.refresh()
+
+    def is_revoked(self, token):
+        self._refresh_if_stale()
+        if token.get(jwt_settings.JTI_CLAIM) in self.jtis:
+            return True
+        cutoff = self.users.get(token_user_id(token))
+        issued = token.get('iat')
+        return cutoff is not None and (issued is None or datetime.fromtimestamp(issued, dt_timezone.utc) < cutoff)
+
+    def revoke_token(self, token, user_id):
+        expires = datetime.fromtimestamp(token['exp'], dt_timezone.utc)
+        RevokedAccessToken.objects.create(jti=token[jwt_settings.JTI_CLAIM], user_id=user_id, expires_at=expires)
+        self.jtis = self.jtis | {token[jwt_settings.JTI_CLAIM]}
+
+    def revoke_user(self, user_id):
+        # `iat` has second resolution; a precise cut-off errs on the side of rejecting
+        # tokens issued within the same second as the change
+        now = timezone.now()
+        RevokedAccessToken.objects.create(
+            user_id=user_id, created_at=now, expires_at=now + jwt_settings.REFRESH_TOKEN_LIFETIME,
+        )
+        self.users = {**self.users, user_id: now}
+
+
+denylist = TokenDenylist()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Stateless JWT authentication: the user is rebuilt from the token's claims (id, email,
+    role, is_staff) without a query, and any other attribute is loaded lazily on access.
+    Revoked tokens are rejected through the in-process `denylist`.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if denylist.is_revoked(token):
+            raise InvalidToken({'detail': 'Token has been revoked.', 'code': 'token_revoked'})
+        return token
+
+    def get_user(self, validated_token):
+        if jwt_settings.USER_ID_CLAIM not in validated_token or any(
+            name not in validated_token for name in CLAIM_FIELDS
+        ):
+            raise InvalidToken('Token contained no recognizable user identification')
+        return user_from_claims(validated_token)
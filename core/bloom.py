@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections, transaction
+from django.db.models.functions import Lower
+
+from core.models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings: no false negatives, and a false-positive rate of
+    about `error_rate` while it holds at most `capacity` items. Positions come from double
+    hashing a single BLAKE2b digest.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def expected_error_rate(self):
+        """False-positive probability for the current number of items."""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+
+class EmailFilter:
+    """
+    Process-local Bloom filter of every registered email (lowercased), used to answer
+    "is this email taken?" without a query when the answer is no.
+
+    Server processes build it from the database at startup (EMAIL_FILTER_PRELOAD), others
+    on first use. New emails are published to a short sequence in the shared cache once
+    their transaction commits, and each check first replays the contiguous run of entries
+    this process hasn't seen, so an email registered through another worker is never
+    reported as free. If an entry stays missing for GAP_TIMEOUT seconds (evicted, or its
+    publisher died between claiming and writing it), or the filter outgrows its capacity,
+    it is rebuilt from the database. That relies on a shared cache, so without one
+    (EMAIL_FILTER_ENABLED off) `might_exist` always defers to the database.
+    """
+    EPOCH_KEY = 'email-filter:epoch'
+    SEQUENCE_KEY = 'email-filter:sequence'
+    ENTRY_KEY = 'email-filter:entry:{}'
+    # Seconds a publisher may take between claiming a position and writing its entry
+    GAP_TIMEOUT = 2
+
+    def __init__(self):
+        self.filter = None
+        self.epoch = None
+        self.position = 0
+        self.gap_since = None
+        self._lock = threading.Lock()
+
+    def _shared_state(self):
+        # The epoch changes whenever the shared cache loses the sequence, which would
+        # otherwise restart from zero and hide entries published since
+        values = cache.get_many([self.EPOCH_KEY, self.SEQUENCE_KEY])
+        if self.EPOCH_KEY not in values:
+            cache.add(self.EPOCH_KEY, uuid.uuid4().hex, None)
+            values = cache.get_many([self.EPOCH_KEY, self.SEQUENCE_KEY])
+        return values.get(self.EPOCH_KEY), values.get(self.SEQUENCE_KEY, 0)
+
+    def rebuild(self):
+        with self._lock:
+            # Read before the scan: publishing happens after commit, so any email published
+            # later is either in the scan or replayed from past this position
+            epoch, position = self._shared_state()
+            count = User.objects.count()
+            bloom = BloomFilter(max(count * 2, settings.EMAIL_FILTER_MIN_CAPACITY), settings.EMAIL_FILTER_ERROR_RATE)
+            emails = User.objects.annotate(email_lower=Lower('email')).values_list('email_lower', flat=True)
+            for email in emails.iterator(chunk_size=5000):
+                bloom.add(email)
+            self.filter, self.epoch, self.position, self.gap_since = bloom, epoch, position, None
+        return bloom
+
+    def preload(self):
+        """Build the filter in a background thread, so startup isn't held up by the scan."""
+        threading.Thread(target=self._preload, name='email-filter-preload', daemon=True).start()
+
+    def _preload(self):
+        try:
+            if self.filter is None:
+                self.rebuild()
+        except DatabaseError:
+            # e.g. before the first migration; the first check builds it instead
+            logger.warning("Could not preload the email filter", exc_info=True)
+        finally:
+            connections.close_all()
+
+    def publish(self, emails):
+        """Make newly registered `emails` visible to every process's filter once they're committed."""
+        emails = [email.lower() for email in emails]
+        if emails and settings.EMAIL_FILTER_ENABLED:
+            transaction.on_commit(lambda: self._publish(emails))
+
+    def _publish(self, emails):
+        self._shared_state()
+        cache.add(self.SEQUENCE_KEY, 0, None)
+        try:
+            position = cache.incr(self.SEQUENCE_KEY)
+        except ValueError:
+            # Evicted in between; the new epoch makes every process rebuild anyway
+            cache.delete(self.EPOCH_KEY)
+            return
+        cache.set(self.ENTRY_KEY.format(position), emails, settings.EMAIL_FILTER_ENTRY_TTL)
+
+    def _sync(self):
+        epoch, latest = self._shared_state()
+        if epoch != self.epoch or latest < self.position:
+            self.rebuild()
+            return
+        start = self.position
+        if latest == start:
+            return
+        keys = [self.ENTRY_KEY.format(position) for position in range(start + 1, latest + 1)]
+        entries = cache.get_many(keys)
+        # The sequence is incremented before the entry is written: stop at the first entry
+        # not written yet, and only rebuild if it stays missing
+        available = 0
+        while available < len(keys) and keys[available] in entries:
+            available += 1
+        if available < len(keys):
+            now = time.monotonic()
+            if available or self.gap_since is None:
+                self.gap_since = now
+            if now - self.gap_since >= self.GAP_TIMEOUT:
+                self.rebuild()
+                return
+        else:
+            self.gap_since = None
+        if self.filter.count >= self.filter.capacity:
+            self.rebuild()
+            return
+        with self._lock:
+            for key in keys[:available]:
+                for email in entries[key]:
+                    self.filter.add(email)
+            self.position = max(self.position, start + available)
+
+    def might_exist(self, email):
+        """False means the email is certainly not registered; True needs a database check."""
+        if not settings.EMAIL_FILTER_ENABLED:
+            return True
+        if self.filter is None:
+            self.rebuild()
+        else:
+            self._sync()
+        return email.lower() in self.filter
+
+
+email_filter = EmailFilter()
@@ -0,0 +1,141 @@
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Normalize literals so queries that differ only by parameters share a fingerprint."""
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class Budget:
+    """Upper bounds for one endpoint action; `max_cpu_ms` is scaled by `QUERY_BUDGET_CPU_SCALE`."""
+
+    def __init__(self, max_queries, max_cpu_ms=250):
+        self.max_queries = max_queries
+        self.max_cpu_ms = max_cpu_ms
+
+    @property
+    def cpu_limit_ms(self):
+        return self.max_cpu_ms * float(os.getenv('QUERY_BUDGET_CPU_SCALE', 1))
+
+    def __repr__(self):
+        return f'Budget(max_queries={self.max_queries}, max_cpu_ms={self.max_cpu_ms})'
+
+
+class Measurement:
+
+    def __init__(self, name, budget, queries, cpu_ms, wall_ms):
+        self.name = name
+        self.budget = budget
+        self.queries = queries
+        self.cpu_ms = cpu_ms
+        self.wall_ms = wall_ms
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    @property
+    def duplicates(self):
+        counts = Counter(fingerprint(sql) for sql in self.queries)
+        return {sql: count for sql, count in counts.items() if count > 1}
+
+    @property
+    def violations(self):
+        problems = []
+        if self.query_count > self.budget.max_queries:
+            problems.append(f'{self.query_count} queries > budget of {self.budget.max_queries}')
+        if self.cpu_ms > self.budget.cpu_limit_ms:
+            problems.append(f'{self.cpu_ms:.1f}ms CPU > budget of {self.budget.cpu_limit_ms:.1f}ms')
+        return problems
+
+    def render(self):
+        status = 'FAIL' if self.violations else 'ok'
+        lines = [
+            f'[{status}] {self.name}: {self.query_count}/{self.budget.max_queries} queries, '
+            f'{self.cpu_ms:.1f}/{self.budget.cpu_limit_ms:.1f}ms CPU, {self.wall_ms:.1f}ms wall'
+        ]
+        lines += [f'    {sql}' for sql in self.queries]
+        lines += [f'    duplicated x{count}: {sql}' for sql, count in self.duplicates.items()]
+        return '\n'.join(lines)
+
+
+class BudgetReport:
+    """Collects measurements for the whole test run."""
+
+    def __init__(self):
+        self.measurements = []
+
+    def add(self, measurement):
+        self.measurements.append(measurement)
+
+    def render(self):
+        return '\n'.join(measurement.render() for measurement in self.measurements)
+
+    def write(self, destination=None):
+        destination = destination or os.getenv('QUERY_BUDGET_REPORT')
+        if not destination or not self.measurements:
+            return
+        if destination == '-':
+            sys.stdout.write(self.render() + '\n')
+        else:
+            with open(destination, 'a') as report_file:
+                report_file.write(self.render() + '\n')
+        self.measurements.clear()
+
+
+report = BudgetReport()
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for per-endpoint budgets: declare `budgets = {'job-list': Budget(3), ...}`
+    and call `assertWithinBudget('job-list', url)` against each seeded dataset size.
+    Every measurement lands in the shared report, which lists the queries, duplicated
+    fingerprints and timings per endpoint; set `QUERY_BUDGET_REPORT` to a file path
+    (or `-` for stdout) to have it written out.
+    """
+    budgets = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        report.write()
+        super().tearDownClass()
+
+    def measure(self, name, method, url, data=None, **extra):
+        budget = self.budgets[name]
+        # Budgets cover the view itself, not answers from the anonymous response cache
+        with override_settings(RESPONSE_CACHE_TTL=0), CaptureQueriesContext(connection) as context:
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            response = getattr(self.client, method)(url, data, **extra)
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+        measurement = Measurement(name, budget, [query['sql'] for query in context.captured_queries], cpu_ms, wall_ms)
+        report.add(measurement)
+        return response, measurement
+
+    def assertWithinBudget(self, name, url, method='get', data=None, status_code=200, **extra):
+        response, measurement = self.measure(name, method, url, data, **extra)
+        self.assertEqual(response.status_code, status_code, f'{name}: unexpected status')
+        if measurement.violations:
+            self.fail(f"{name} is over budget ({'; '.join(measurement.violations)})\n{measurement.render()}")
+        return response, measurement
@@ -0,0 +1,61 @@
+"""
+Startup checks for features that keep cross-process state in a cache: with a per-process
+backend each worker would see only its own writes.
+"""
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.exceptions import ImproperlyConfigured
+
+
+
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared(alias):
+    """Whether cache `alias` is seen by every worker process (memcached, redis, database, files)."""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def require_shared(alias, feature, remedy):
+    if not is_shared(alias):
+        raise ImproperlyConfigured(
+            f"{feature} needs CACHES[{alias!r}] to be shared by every worker process, but it uses "
+            f"{settings.CACHES[alias]['BACKEND']}. {remedy}"
+        )
+
+
+def check_shared_caches():
+    """Raise ImproperlyConfigured for every enabled feature whose cache isn't shared."""
+    if settings.SESSION_ENGINE == 'core.sessions':
+        require_shared(
+            settings.SESSION_CACHE_ALIAS, "The core.sessions engine and its write-behind",
+            "Point CACHE_BACKEND at memcached or redis, or use django.contrib.sessions.backends.db.",
+        )
+    if settings.DATABASE_REPLICAS:
+        require_shared(
+            settings.REPLICA_PIN_CACHE, "Read-your-writes pinning for read replicas",
+            "Point CACHE_BACKEND at memcached or redis, or unset DB_REPLICA_HOSTS.",
+        )
+    if settings.RESPONSE_CACHE_TTL > 0:
+        require_shared(
+            settings.RESPONSE_CACHE, "The anonymous response cache",
+            "Point RESPONSE_CACHE_BACKEND at memcached or redis, or set RESPONSE_CACHE_TTL=0.",
+        )
+    if settings.EMAIL_FILTER_ENABLED:
+        require_shared(
+            DEFAULT_CACHE_ALIAS, "The email availability filter",
+            "Point CACHE_BACKEND at memcached or redis, or set EMAIL_FILTER_ENABLED=false.",
+        )
+    if settings.AUTH_TOKEN_CACHE_TTL > 0:
+        require_shared(
+            DEFAULT_CACHE_ALIAS, "The token authentication cache",
+            "Point CACHE_BACKEND at memcached or redis, or set AUTH_TOKEN_CACHE_TTL=0.",
+        )
+    if settings.INTERVIEW_FEED_TTL > 0:
+        require_shared(
+            DEFAULT_CACHE_ALIAS, "The interview calendar feed cache",
+            "Point CACHE_BACKEND at memcached or redis, or set INTERVIEW_FEED_TTL=0.",
+        )
@@ -0,0 +1,8 @@
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from core.db.pool import PooledDatabaseWrapperMixin
+
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, MySQLDatabaseWrapper):
+    """`django.db.backends.mysql` with pooled connections (ENGINE = 'core.db.backends.mysql_pool')."""
@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import closing
+
+from django.db.utils import OperationalError
+
+
+logger = logging.getLogger(__name__)
+
+# DATABASES[...]['OPTIONS']['pool'] keys and their defaults
+POOL_DEFAULTS = {
+    'max_size': 10,
+    # Seconds to wait for a free connection before raising PoolTimeout
+    'timeout': 5.0,
+    # Seconds before a connection is replaced; keep it below MySQL's wait_timeout
+    'max_lifetime': 30 * 60,
+    # With CONN_HEALTH_CHECKS, connections idle at least this long are pinged on checkout
+    'check_interval': 10.0,
+}
+
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of raw DB-API connections for one database in one process.
+
+    `acquire()` hands out the most recently returned idle connection, opens a new one
+    while fewer than `max_size` exist, and otherwise waits up to `timeout` seconds for
+    one to be released. Connections older than `max_lifetime` are closed instead of being
+    reused, and with `check` given, ones idle for `check_interval` seconds or more are
+    validated first. Counters for sizing the pool are returned by `stats()`.
+    """
+
+    def __init__(self, max_size=10, timeout=5.0, max_lifetime=30 * 60, check_interval=10.0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+        self._idle = deque()
+        self._opened_at = {}
+        self._size = 0
+        self._condition = threading.Condition()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._condition:
+            self.acquired = self.created = self.discarded = self.timeouts = 0
+            self.waits = 0
+            self.wait_seconds = self.max_wait_seconds = 0.0
+
+    def stats(self):
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'acquired': self.acquired,
+                'created': self.created,
+                'discarded': self.discarded,
+                'timeouts': self.timeouts,
+                'waits': self.waits,
+                'wait_seconds': round(self.wait_seconds, 6),
+                'max_wait_seconds': round(self.max_wait_seconds, 6),
+            }
+
+    def _expired(self, connection, now):
+        return now - self._opened_at.get(id(connection), now) >= self.max_lifetime
+
+    def _take(self, deadline):
+        """Return (connection or None to open one, idle seconds), waiting until `deadline`."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                while self._idle:
+                    connection, released_at = self._idle.pop()
+                    if self._expired(connection, now):
+                        self._discard(connection)
+                        continue
+                    return connection, now - released_at
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, 0.0
+                remaining = deadline - now
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection free after {self.timeout:g}s "
+                        f"(pool of {self.max_size}, all in use)."
+                    )
+                self._condition.wait(remaining)
+
+    def acquire(self, connect, check=None):
+        """
+        Check out a connection, calling `connect()` to open one when the pool has room.
+        `check(connection)` returns whether a long-idle connection still works.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            try:
+                connection, idle = self._take(deadline)
+            except PoolTimeout:
+                logger.warning("Database connection pool exhausted: %s", self.stats())
+                raise
+            if connection is None:
+                try:
+                    connection = connect()
+                except BaseException:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._opened_at[id(connection)] = time.monotonic()
+                    self.created += 1
+            elif check is not None and idle >= self.check_interval and not check(connection):
+                with self._condition:
+                    self._discard(connection)
+                continue
+            break
+
+        waited = time.monotonic() - started
+        with self._condition:
+            self.acquired += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            if waited >= 0.001:
+                self.waits += 1
+        return connection
+
+    def release(self, connection, reusable=True):
+        """Return a checked-out connection; it is closed instead if not `reusable`."""
+        with self._condition:
+            if reusable and not self._expired(connection, time.monotonic()):
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+            else:
+                self._discard(connection)
+
+    def _discard(self, connection):
+        # Called with the lock held
+        self._size -= 1
+        self.discarded += 1
+        self._opened_at.pop(id(connection), None)
+        self._condition.notify()
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close every idle connection."""
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.popleft()[0])
+
+    def __len__(self):
+        return self._size
+
+
+pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    """The process-wide pool for the database `alias`, created on first use."""
+    key = (alias, settings_dict['NAME'], settings_dict.get('HOST'), settings_dict.get('PORT'))
+    pool = pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = pools.get(key)
+            if pool is None:
+                options = {**POOL_DEFAULTS, **settings_dict['OPTIONS'].get('pool', {})}
+                pool = pools[key] = ConnectionPool(**options)
+    return pool
+
+
+def pool_stats():
+    """{alias: stats()} for every pool in this process."""
+    return {key[0]: pool.stats() for key, pool in pools.items()}
+
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mix into a backend's DatabaseWrapper to check raw connections out of a per-process
+    `ConnectionPool` instead of opening one per request, and return them on close.
+
+    Use with CONN_MAX_AGE = 0, so Django hands the connection back at the end of every
+    request; CONN_HEALTH_CHECKS turns on validation of long-idle connections at checkout.
+    Pool settings go in OPTIONS['pool'] (see POOL_DEFAULTS). A connection is closed
+    rather than reused if it's released inside a transaction or after an error it
+    didn't recover from.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        # Backends pass OPTIONS through to the driver
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        check = self._check_raw_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None
+        return self.pool.acquire(lambda: connect(conn_params), check)
+
+    @staticmethod
+    def _check_raw_connection(connection):
+        try:
+            with closing(connection.cursor()) as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    def _close(self):
+        if self.connection is None:
+            return
+        reusable = not self.in_atomic_block and (not self.errors_occurred or self.is_usable())
+        connection, self.connection = self.connection, None
+        if reusable and not self.autocommit:
+            try:
+                connection.rollback()
+            except Exception:
+                reusable = False
+        self.pool.release(connection, reusable)
+
+
+def pooled_wrapper_class(wrapper_class):
+    """`wrapper_class` (a backend's DatabaseWrapper) with pooled connections."""
+    if issubclass(wrapper_class, PooledDatabaseWrapperMixin):
+        return wrapper_class
+    return type(f'Pooled{wrapper_class.__name__}', (PooledDatabaseWrapperMixin, wrapper_class), {})
+
+
+def unpooled_wrapper_class(wrapper_class):
+    """The backend `wrapper_class` pools connections for, or `wrapper_class` itself."""
+    return next(cls for cls in wrapper_class.__mro__ if not issubclass(cls, PooledDatabaseWrapperMixin))
@@ -0,0 +1,191 @@
+"""
+Read-replica routing (DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']).
+
+Only reads of REPLICA_READ_MODELS made while serving a safe-method request go to a
+replica; writes, other models, and anything outside a request (commands, signals
+fired by writes) use `default`. `ReplicaPinningMiddleware` marks each request and
+keeps clients that just wrote on the primary for REPLICA_PIN_SECONDS, so they read
+their own writes; pins by user id live in CACHES[REPLICA_PIN_CACHE], which must be
+shared by every worker (checked at startup by core.caches). Replicas lagging more than REPLICA_MAX_LAG_SECONDS are skipped.
+"""
+import contextvars
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+
+from rest_framework.permissions import SAFE_METHODS
+
+
+
+PIN_COOKIE = 'db_pin'
+PIN_KEY = 'replica-pin:{}'
+
+_routing = contextvars.ContextVar('replica_routing', default=None)
+
+
+def is_primary(alias):
+    """
+    Whether `alias` points at the primary itself, as replicas configured as test mirrors
+    of `default` do while the test suite runs; its reads could miss uncommitted test data.
+    """
+    primary, replica = connections[DEFAULT_DB_ALIAS].settings_dict, connections[alias].settings_dict
+    return all(primary[key] == replica[key] for key in ('HOST', 'PORT', 'NAME'))
+
+
+def replica_lag(alias):
+    """
+    Seconds the replica `alias` is behind its source, or None when replication is broken
+    or the replica can't be reached. Backends without replication status report 0.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'mysql':
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW REPLICA STATUS')
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description or ()]
+    except Exception:
+        return None
+    if row is None:
+        # Not replicating at all
+        return None
+    status = dict(zip(columns, row))
+    return status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+
+
+
+class ReplicaMonitor:
+    """Per-process view of replica lag, probed at most every REPLICA_LAG_CHECK_INTERVAL seconds."""
+
+    def __init__(self):
+        self.lag = {}
+        self.checked_at = {}
+        self._lock = threading.Lock()
+
+    def healthy(self, aliases):
+        now = time.monotonic()
+        interval = settings.REPLICA_LAG_CHECK_INTERVAL
+        stale = [alias for alias in aliases if alias not in self.checked_at or now - self.checked_at[alias] >= interval]
+        if stale:
+            probe = import_string(settings.REPLICA_LAG_PROBE)
+            with self._lock:
+                for alias in stale:
+                    self.lag[alias] = probe(alias)
+                    self.checked_at[alias] = now
+        return [
+            alias for alias in aliases
+            if self.lag.get(alias) is not None and self.lag[alias] <= settings.REPLICA_MAX_LAG_SECONDS
+        ]
+
+    def reset(self):
+        with self._lock:
+            self.lag.clear()
+            self.checked_at.clear()
+
+
+monitor = ReplicaMonitor()
+
+
+
+class RequestRouting:
+    """Where one request's replica-eligible reads go; decided on the first such read."""
+
+    def __init__(self, request):
+        self.request = request
+        self._alias = None
+        self._decided = False
+
+    def pinned(self):
+        if self.request.method not in SAFE_METHODS or PIN_COOKIE in self.request.COOKIES:
+            return True
+        # DRF stores the user it authenticated on the underlying request
+        user = getattr(self.request, 'user', None)
+        return bool(user is not None and user.is_authenticated and caches[settings.REPLICA_PIN_CACHE].get(PIN_KEY.format(user.pk)))
+
+    def replica(self):
+        if not self._decided:
+            self._decided = True
+            replicas = [alias for alias in settings.DATABASE_REPLICAS if not is_primary(alias)]
+            if replicas and not self.pinned():
+                healthy = monitor.healthy(replicas)
+                self._alias = random.choice(healthy) if healthy else None
+        return self._alias
+
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or model._meta.label_lower not in settings.REPLICA_READ_MODELS:
+            return DEFAULT_DB_ALIAS
+        return routing.replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would write an instance back to the replica it was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+
+class ReplicaPinningMiddleware:
+    """
+    Expose the request to `ReplicaRouter`, and after a successful write pin the client to
+    the primary for REPLICA_PIN_SECONDS: by cookie, and by user id for token clients
+    that don't keep cookies.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _routing.set(RequestRouting(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = _routing.set(RequestRouting(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if request.method in SAFE_METHODS:
+            return response
+        # Loading a lazy request.user may query the database
+        return await sync_to_async(self.pin)(request, response)
+
+    def pin(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400 or not settings.DATABASE_REPLICAS:
+            return response
+        seconds = settings.REPLICA_PIN_SECONDS
+        response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            caches[settings.REPLICA_PIN_CACHE].set(PIN_KEY.format(user.pk), 1, seconds)
+        return response
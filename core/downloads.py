@@ -0,0 +1,206 @@
+import mimetypes
+import os
+import posixpath
+import re
+import zipfile
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+from django.views.static import serve
+
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    File-like view over `length` bytes of an open file, starting at `start`.
+    `fileno()` is exposed so WSGI servers with `wsgi.file_wrapper` support can still hand
+    the descriptor to `sendfile()`; the bounded `read()` covers every other server.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range `Range` header into an inclusive (start, end) tuple.
+    Returns None when the header should be ignored and raises ValueError when unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start == '':
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError('Unsatisfiable range.')
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError('Unsatisfiable range.')
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def serve_file(request, field_file, filename=None, as_attachment=True):
+    """
+    Stream a stored file to an already-authorized client.
+
+    Depending on `PROTECTED_MEDIA_SERVER` the body is handed off to the web server with
+    `X-Accel-Redirect` (nginx) or `X-Sendfile` (Apache/lighttpd), or served by Django through
+    `FileResponse`, which lets the WSGI server use `sendfile()`. Conditional requests
+    (`If-None-Match`, `If-Modified-Since`) and single byte ranges are honoured.
+    """
+    if not field_file:
+        raise Http404("No file available.")
+    try:
+        path = field_file.path
+        stat = os.stat(path)
+    except (NotImplementedError, FileNotFoundError, ValueError):
+        raise Http404("File not found.")
+
+    filename = filename or os.path.basename(field_file.name)
+    last_modified = int(stat.st_mtime)
+    etag = quote_etag(f'{last_modified:x}-{stat.st_size:x}')
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        return conditional
+
+    server = getattr(settings, 'PROTECTED_MEDIA_SERVER', 'django')
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if server == 'x-accel-redirect':
+        # nginx serves the body (including ranges) from an `internal` location
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_INTERNAL_URL + field_file.name
+    elif server == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range and not _if_range_matches(request, etag, last_modified):
+            byte_range = None
+
+        file = open(path, 'rb')
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = FileResponse(
+                FileRange(file, start, length), status=206, content_type=content_type,
+                as_attachment=as_attachment, filename=filename,
+            )
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        else:
+            response = FileResponse(
+                file, content_type=content_type, as_attachment=as_attachment, filename=filename,
+            )
+        response['Accept-Ranges'] = 'bytes'
+
+    if server != 'django':
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+
+def serve_media(request, path):
+    """
+    Development server for MEDIA_ROOT that never serves PROTECTED_MEDIA_PREFIXES. `serve`
+    normalizes the path itself, so the check runs on the normalized path: otherwise
+    `//resumes/`, `./resumes/` or `a/../resumes/` would reach the files unchecked.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    if path == '..' or path.startswith('../') or (path + '/').startswith(tuple(settings.PROTECTED_MEDIA_PREFIXES)):
+        raise Http404
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+
+class ZipStreamSink:
+    """
+    Write-only, unseekable target for `zipfile.ZipFile`. Because it cannot seek, zipfile
+    emits data descriptors after each member, so the archive can be drained chunk by chunk.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(entries, chunk_size=64 * 1024):
+    """
+    Yield a ZIP archive of `entries`, an iterable of (arcname, field_file) pairs.
+    At most one file chunk is buffered at a time, so memory stays flat regardless of
+    how many files are archived. Members are stored uncompressed: resumes are mostly
+    PDFs that don't shrink, and it keeps the CPU cost per byte negligible.
+    """
+    sink = ZipStreamSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for arcname, field_file in entries:
+            try:
+                field_file.open('rb')
+            except (OSError, ValueError):
+                continue
+            with field_file, archive.open(arcname, mode='w', force_zip64=True) as member:
+                while chunk := field_file.read(chunk_size):
+                    member.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,98 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+# Body digests a client may send (RFC 9530 and its predecessors); any present are fingerprinted
+DIGEST_HEADERS = ('HTTP_CONTENT_DIGEST', 'HTTP_REPR_DIGEST', 'HTTP_DIGEST', 'HTTP_CONTENT_MD5')
+
+
+class IdempotentCreateMixin:
+    """
+    Honour the `Idempotency-Key` header on `create`.
+
+    The first request for a key claims it with an atomic `cache.add()` that lasts
+    `IDEMPOTENCY_PENDING_TTL` seconds, so a worker killed mid-request doesn't pin the key;
+    its response is then stored for `IDEMPOTENCY_KEY_TTL` seconds. Retries are answered from
+    the cache before the request body is parsed, so neither the upload nor the database is
+    touched again. The fingerprint is therefore built from headers only: it deliberately
+    ignores the multipart boundary, which clients may regenerate between attempts, and
+    compares method, path, media type, body length and any body digest the client sent.
+    Clients that may reuse a key for a different body of the same length should send
+    `Content-Digest`.
+    """
+    idempotency_ttl = None
+
+    def create(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = self.get_idempotency_cache_key(request, key)
+        fingerprint = self.get_request_fingerprint(request)
+        ttl = self.idempotency_ttl or settings.IDEMPOTENCY_KEY_TTL
+        pending = {'state': 'pending', 'fingerprint': fingerprint}
+
+        if not cache.add(cache_key, pending, settings.IDEMPOTENCY_PENDING_TTL):
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return self.replay_idempotent_response(stored, fingerprint)
+            # The entry expired between add() and get(); claim it again
+            if not cache.add(cache_key, pending, settings.IDEMPOTENCY_PENDING_TTL):
+                return self.replay_idempotent_response(cache.get(cache_key) or {}, fingerprint)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            # Nothing was committed, so the client is free to retry with the same key
+            cache.delete(cache_key)
+            raise
+
+        if response.status_code >= 500:
+            cache.delete(cache_key)
+        else:
+            cache.set(cache_key, {
+                'state': 'done',
+                'fingerprint': fingerprint,
+                'status': response.status_code,
+                'data': response.data,
+                'headers': {name: response[name] for name in ('Location',) if response.has_header(name)},
+            }, ttl)
+        return response
+
+    def get_idempotency_cache_key(self, request, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f'idempotency:{self.basename}:{request.user.pk}:{digest}'
+
+    def get_request_fingerprint(self, request):
+        media_type = request.META.get('CONTENT_TYPE', '').split(';')[0].strip().lower()
+        parts = [request.method, request.path, media_type, request.META.get('CONTENT_LENGTH', '')]
+        parts += [request.META.get(name, '') for name in DIGEST_HEADERS]
+        return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+    def replay_idempotent_response(self, stored, fingerprint):
+        if stored.get('fingerprint') != fingerprint:
+            return Response(
+                {"detail": "Idempotency-Key was already used for a different request."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if stored.get('state') != 'done':
+            return Response(
+                {"detail": "A request with this Idempotency-Key is still being processed."},
+                status=status.HTTP_409_CONFLICT,
+                headers={'Retry-After': '1'},
+            )
+        headers = dict(stored['headers'], **{'Idempotent-Replayed': 'true'})
+        return Response(stored['data'], status=stored['status'], headers=headers)
@@ -0,0 +1,89 @@
+import copy
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+
+from core.db.pool import get_pool, pooled_wrapper_class, unpooled_wrapper_class
+
+
+
+def simulate(make_wrapper, threads, requests):
+    """
+    Run `requests` request-shaped cycles (connect, one query, close) split over `threads`,
+    each with its own wrapper as Django's per-thread connections are. Returns latencies.
+    """
+    latencies = []
+
+    def worker(count):
+        wrapper = make_wrapper()
+        for _ in range(count):
+            started = time.perf_counter()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            wrapper.close()
+            latencies.append(time.perf_counter() - started)
+
+    workers = [
+        threading.Thread(target=worker, args=(requests // threads + (index < requests % threads),))
+        for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request connection cost with and without the connection pool against a "
+        "database alias (a local MySQL, or any other backend as a stand-in), and print pool wait metrics."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=16, help="Concurrent request threads.")
+        parser.add_argument('--pool-size', type=int, default=8)
+        parser.add_argument('--timeout', type=float, default=5.0, help="Pool acquisition timeout in seconds.")
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        settings_dict = copy.deepcopy(connections.settings[alias])
+        backend = load_backend(settings_dict['ENGINE']).DatabaseWrapper
+        plain, pooled = unpooled_wrapper_class(backend), pooled_wrapper_class(backend)
+
+        plain_settings = dict(settings_dict, CONN_MAX_AGE=0, OPTIONS={
+            name: value for name, value in settings_dict['OPTIONS'].items() if name != 'pool'
+        })
+        pooled_settings = dict(plain_settings, OPTIONS={**plain_settings['OPTIONS'], 'pool': {
+            'max_size': options['pool_size'], 'timeout': options['timeout'],
+        }})
+        pooled_alias = f'{alias}-pool-benchmark'
+        pool = get_pool(pooled_alias, pooled_settings)
+        pool.close()
+        pool.reset_stats()
+
+        self.stdout.write(f"{'mode':<10} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for mode, make_wrapper in (
+            ('unpooled', lambda: plain(plain_settings, alias)),
+            ('pooled', lambda: pooled(pooled_settings, pooled_alias)),
+        ):
+            started = time.perf_counter()
+            latencies = simulate(make_wrapper, options['threads'], options['requests'])
+            elapsed = time.perf_counter() - started
+            p50, p99 = (statistics.quantiles(latencies, n=100)[i] for i in (49, 98))
+            self.stdout.write(f"{mode:<10} {len(latencies) / elapsed:9.1f} {p50 * 1000:9.3f} {p99 * 1000:9.3f}")
+
+        stats = pool.stats()
+        self.stdout.write(
+            f"pool: {stats['created']} connections opened for {stats['acquired']} checkouts, "
+            f"{stats['waits']} waited ({stats['wait_seconds']:.3f}s total, max {stats['max_wait_seconds'] * 1000:.1f} ms), "
+            f"{stats['timeouts']} timed out"
+        )
+        pool.close()
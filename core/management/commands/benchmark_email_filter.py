@@ -0,0 +1,38 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Lower
+
+from core.bloom import email_filter
+from core.models import User
+
+
+
+class Command(BaseCommand):
+    help = "Measure the email filter's false-positive rate and its latency against a database lookup."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--probes', type=int, default=10000, help="Unregistered emails to check.")
+
+    def handle(self, *args, **options):
+        count = options['probes']
+        bloom = email_filter.rebuild()
+        probes = [f'{uuid.uuid4().hex}@example.invalid' for _ in range(count)]
+
+        start = time.perf_counter()
+        false_positives = sum(1 for email in probes if email_filter.might_exist(email))
+        filter_elapsed = time.perf_counter() - start
+
+        sample = probes[:min(count, 1000)]
+        start = time.perf_counter()
+        for email in sample:
+            User.objects.annotate(email_lower=Lower('email')).filter(email_lower=email).exists()
+        query_elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{bloom.count} emails in {len(bloom.bits) / 1024:.1f} KiB, {bloom.hash_count} hashes\n"
+            f"false positives: {false_positives / count:.4%} observed, {bloom.expected_error_rate:.4%} expected\n"
+            f"filter check: {filter_elapsed / count * 1e6:9.1f} µs/request\n"
+            f"db lookup:    {query_elapsed / len(sample) * 1e6:9.1f} µs/request"
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.test import APIRequestFactory
+
+from core.authentication import CachedTokenAuthentication, invalidate_token
+from core.models import User, AuthToken
+
+
+
+class StockTokenAuthentication(TokenAuthentication):
+    model = AuthToken
+
+
+
+class Command(BaseCommand):
+    help = "Compare queries and time per request for stock and cached token authentication."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help="Authentications per backend.")
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        # Throwaway user and token, rolled back at the end
+        with transaction.atomic():
+            user = User.objects.create_user(email='auth-benchmark@example.invalid', password=None, role='applicant')
+            token = AuthToken.objects.create(user=user)
+            request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+
+            for backend in (StockTokenAuthentication(), CachedTokenAuthentication()):
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    for _ in range(count):
+                        backend.authenticate(request)
+                    elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"{type(backend).__name__:<28} {len(context.captured_queries) / count:6.3f} queries/request "
+                    f"{elapsed / count * 1e6:9.1f} µs/request"
+                )
+
+            invalidate_token(token.key)
+            transaction.set_rollback(True)
@@ -0,0 +1,65 @@
+import random
+import time
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import User
+from core.search import SEARCH_FIELDS, index_users, search_users
+
+
+FIRST_NAMES = ('james', 'mary', 'robert', 'patricia', 'john', 'jennifer', 'michael', 'linda', 'david', 'elizabeth')
+LAST_NAMES = ('smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis', 'rodriguez', 'martinez')
+DOMAINS = ('example.com', 'mail.test', 'corp.invalid')
+
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare icontains scans with the trigram index for user search over synthetic users. "
+        "The users are created in a transaction that is rolled back; use --users 5000000 on MySQL "
+        "for production-sized numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000, help="Synthetic users to create.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Users inserted per batch.")
+        parser.add_argument('--runs', type=int, default=5, help="Timed runs per search term.")
+        parser.add_argument('terms', nargs='*', default=['garcia', 'mary.j', 'ro', 'zzq'])
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with transaction.atomic():
+            started = time.perf_counter()
+            self._seed(rng, options['users'], options['batch_size'])
+            self.stdout.write(f"seeded and indexed {options['users']} users in {time.perf_counter() - started:.1f}s")
+
+            for term in options['terms']:
+                scan = User.objects.filter(reduce(or_, (Q(**{f'{name}__icontains': term}) for name in SEARCH_FIELDS)))
+                indexed = search_users(User.objects.all(), [term])
+                for label, queryset in (('icontains', scan), ('trigram', indexed)):
+                    start = time.perf_counter()
+                    for _ in range(options['runs']):
+                        count = len(queryset.order_by('-created_at').values_list('pk', flat=True)[:25])
+                    elapsed = (time.perf_counter() - start) / options['runs']
+                    self.stdout.write(f"{term!r:<12} {label:<10} {elapsed * 1000:9.2f} ms  ({count} shown)")
+            transaction.set_rollback(True)
+
+    def _seed(self, rng, total, batch_size):
+        for start in range(0, total, batch_size):
+            users = []
+            for index in range(start, min(start + batch_size, total)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                users.append(User(
+                    email=f'{first}.{last}{index}@{rng.choice(DOMAINS)}', first_name=first.title(),
+                    last_name=last.title(), role='applicant', password='!',
+                ))
+            User.objects.bulk_create(users)
+            # MySQL doesn't return primary keys from bulk_create(), so read them back
+            ids = dict(User.objects.filter(email__in=[user.email for user in users]).values_list('email', 'pk'))
+            for user in users:
+                user.pk = ids[user.email]
+            index_users(users, replace=False)
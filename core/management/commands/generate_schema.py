@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.schema import generate_schema, schema_path, schema_version
+
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema for the current code version, unless it already exists."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate even if the files exist.")
+
+    def handle(self, *args, **options):
+        version = schema_version()
+        if not options['force'] and all(schema_path(fmt, version).exists() for fmt in ('json', 'yaml')):
+            self.stdout.write(f"Schema for version {version} is up to date.")
+            return
+        paths = generate_schema(version)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated schema version {version}: " + ", ".join(str(path) for path in paths)
+        ))
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import AuthToken
+
+
+
+LEGACY_TABLE = 'authtoken_token'
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy API tokens issued by rest_framework.authtoken (the `authtoken_token` table) into "
+        "core.AuthToken with a fresh expiry, so existing clients stay logged in, then drop that "
+        "table. Run it once when deploying the switch; users that already have a core token are "
+        "skipped. Dropping the table means a key later logged out, rotated or purged can't be "
+        "imported again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tokens per INSERT batch.")
+
+    def handle(self, *args, **options):
+        if LEGACY_TABLE not in connection.introspection.table_names():
+            self.stdout.write(f"No {LEGACY_TABLE} table; nothing to import.")
+            return
+
+        # The app is no longer installed, so its rows are read without the model
+        table = connection.ops.quote_name(LEGACY_TABLE)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT {connection.ops.quote_name("key")}, user_id FROM {table}')
+                rows = cursor.fetchall()
+
+            existing = set(AuthToken.objects.values_list('user_id', flat=True))
+            now = timezone.now()
+            expires_at = now + settings.AUTH_TOKEN_LIFETIME
+            tokens = [
+                AuthToken(key=key, user_id=user_id, created=now, expires_at=expires_at)
+                for key, user_id in rows
+                if user_id not in existing
+            ]
+            AuthToken.objects.bulk_create(tokens, batch_size=options['batch_size'], ignore_conflicts=True)
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {table}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(tokens)} of {len(rows)} legacy token(s), valid until {expires_at:%Y-%m-%d %H:%M}; "
+            f"dropped {LEGACY_TABLE}."
+        ))
@@ -0,0 +1,125 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; returns (status, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while size := int((await reader.readline()).split(b';')[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    connection = headers.get('connection', '').lower()
+    if status_line.startswith(b'HTTP/1.0'):
+        return status, connection == 'keep-alive'
+    return status, connection != 'close'
+
+
+async def run_load(url, total, concurrency, headers=()):
+    """
+    Send `total` GETs for `url` over `concurrency` keep-alive connections.
+    Returns (elapsed seconds, latencies of 2xx/3xx responses, failed requests).
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    request = (
+        f'GET {parts.path or "/"}{"?" + parts.query if parts.query else ""} HTTP/1.1\r\n'
+        f'Host: {parts.netloc}\r\n' + ''.join(f'{header}\r\n' for header in headers) + '\r\n'
+    ).encode('latin-1')
+    remaining = total
+    latencies, failures = [], 0
+
+    async def client():
+        nonlocal remaining, failures
+        connection = None
+        while remaining > 0:
+            remaining -= 1
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(host, port)
+                reader, writer = connection
+                started = time.perf_counter()
+                writer.write(request)
+                status, keep_alive = await read_response(reader)
+                elapsed = time.perf_counter() - started
+            except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                failures += 1
+                connection = None
+                continue
+            if status < 400:
+                latencies.append(elapsed)
+            else:
+                failures += 1
+            if not keep_alive:
+                writer.close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, failures
+
+
+def percentile(values, fraction):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[round(fraction * 100) - 1]
+
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running servers with concurrent keep-alive GETs and compare throughput and "
+        "latency, e.g. --target wsgi=http://localhost:8001 --target asgi=http://localhost:8000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True, help="name=base URL; repeat to compare.")
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help="Path to request on every target; repeatable (default: the job list).",
+        )
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per target and path.")
+        parser.add_argument('--concurrency', type=int, default=50, help="Concurrent connections.")
+        parser.add_argument('--header', action='append', default=[], help="Extra 'Name: value' request header.")
+        parser.add_argument('--warmup', type=int, default=100, help="Unmeasured requests sent first.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, sep, base = target.partition('=')
+            if not sep or not base.startswith('http://'):
+                raise CommandError(f"Expected name=http://host:port, got {target!r}.")
+            targets.append((name, base.rstrip('/')))
+        paths = options['paths'] or ['/api/recruitment/jobs/']
+        concurrency = max(1, min(options['concurrency'], options['requests']))
+
+        self.stdout.write(f"{'target':<10} {'path':<36} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for path in paths:
+            for name, base in targets:
+                url = base + path
+                if options['warmup']:
+                    asyncio.run(run_load(url, options['warmup'], concurrency, options['header']))
+                elapsed, latencies, failures = asyncio.run(
+                    run_load(url, options['requests'], concurrency, options['header'])
+                )
+                self.stdout.write(
+                    f"{name:<10} {path:<36} {len(latencies) / elapsed:9.1f} "
+                    f"{percentile(latencies, 0.5) * 1000:9.2f} {percentile(latencies, 0.99) * 1000:9.2f} {failures:>7}"
+                )
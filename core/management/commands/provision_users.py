@@ -0,0 +1,41 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.provisioning import provision_users
+
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users (and their profiles) from a CSV with an `email` and `password` column and "
+        "optional `role`, `username`, `first_name` and `last_name` columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--role', default='applicant', choices=['applicant', 'employer'],
+                            help="Role for rows without a `role` column.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Users per INSERT batch.")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Password hashing processes (defaults to the CPU count).")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], newline='') as csv_file:
+                rows = list(csv.DictReader(csv_file))
+        except OSError as error:
+            raise CommandError(error)
+        if rows and not {'email', 'password'} <= set(rows[0]):
+            raise CommandError("The CSV needs `email` and `password` columns.")
+
+        report = provision_users(
+            rows, role=options['role'], batch_size=options['batch_size'], workers=options['workers'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report.created} of {report.requested} user(s) in {report.total_seconds:.2f}s "
+            f"({report.users_per_second:.0f} users/s; hashing {report.hash_seconds:.2f}s, "
+            f"inserts {report.insert_seconds:.2f}s)."
+        ))
+        if report.skipped:
+            self.stdout.write(f"Skipped {len(report.skipped)} existing or duplicate email(s).")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.sessions import SessionStore, write_buffer
+
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions in small chunks (a gentler `clearsessions`)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None, help="Sessions deleted per statement.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between chunks.")
+
+    def handle(self, *args, **options):
+        write_buffer.flush()
+        count = SessionStore.clear_expired(chunk_size=options['chunk_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} expired session(s)."))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import AuthToken, RevokedAccessToken
+from core.purging import delete_in_chunks
+
+
+
+class Command(BaseCommand):
+    help = "Delete expired API tokens and JWT denylist entries in small chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None, help="Rows deleted per statement.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between chunks.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size'] or settings.AUTH_TOKEN_PURGE_CHUNK_SIZE
+        tokens = AuthToken.objects.purge_expired(chunk_size, options['pause'])
+        revoked = delete_in_chunks(
+            RevokedAccessToken.objects.filter(expires_at__lte=timezone.now()), chunk_size, options['pause'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {tokens} expired token(s) and {revoked} expired denylist entr{'y' if revoked == 1 else 'ies'}."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.search import rebuild_index
+
+
+
+class Command(BaseCommand):
+    help = "Rebuild the trigram index behind user search in the API and admin."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help="Users indexed per batch.")
+
+    def handle(self, *args, **options):
+        count = rebuild_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} user(s)."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.response_cache import response_cache_stats, stats
+
+
+
+class Command(BaseCommand):
+    help = "Show the anonymous response cache's hit ratio, invalidations and memory use."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Zero the counters after printing them.")
+
+    def handle(self, *args, **options):
+        result = response_cache_stats()
+        for name, value in result.items():
+            if name == 'hit_ratio':
+                value = f"{value:.1%}"
+            elif value is None:
+                value = "n/a (not a per-process cache)"
+            self.stdout.write(f"{name:<14} {value}")
+        if options['reset']:
+            stats.reset()
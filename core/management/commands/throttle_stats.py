@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.caches import is_shared
+from core.throttling import rejection_counts, reset_rejection_counts
+
+
+
+class Command(BaseCommand):
+    help = (
+        "Show how many requests each throttle scope has rejected (per key kind). The counters "
+        "live in the throttle cache, so this needs THROTTLE_CACHE_BACKEND to be shared by the workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Zero the counters after printing them.")
+
+    def handle(self, *args, **options):
+        if not is_shared(settings.THROTTLE_CACHE):
+            # This process's own counters are always zero; the workers' are out of reach
+            raise CommandError(
+                f"The throttle cache uses {settings.CACHES[settings.THROTTLE_CACHE]['BACKEND']}, so each "
+                "worker counts its rejections in its own memory. Point THROTTLE_CACHE_BACKEND at "
+                "memcached or redis to collect them here."
+            )
+        for (scope, kind), count in sorted(rejection_counts().items()):
+            self.stdout.write(f"{scope:<16} {kind:<6} {count}")
+        if options['reset']:
+            reset_rejection_counts()
@@ -0,0 +1,168 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query import normalize_prefetch_lookups
+
+from rest_framework import permissions, serializers
+
+
+
+class QueryPlan:
+    """The joins, prefetches and columns one serializer needs from its model."""
+
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.only = {'pk'}
+        self.complete = True
+
+    def __repr__(self):
+        return (
+            f'QueryPlan(select_related={sorted(self.select_related)}, '
+            f'prefetch_related={sorted(self.prefetch_related)}, '
+            f'only={sorted(self.only) if self.complete else None})'
+        )
+
+
+def _join(*parts):
+    return '__'.join(part for part in parts if part)
+
+
+def _get_relation(model, name):
+    """Resolve `name` on `model`, accepting reverse accessor names such as `applications`."""
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        for relation in model._meta.related_objects:
+            if relation.get_accessor_name() == name:
+                return relation
+    return None
+
+
+def _nested_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def build_query_plan(serializer, model, prefix='', plan=None):
+    """
+    Walk the readable fields of `serializer` and record the minimal set of
+    `select_related`/`prefetch_related`/`only()` lookups for `model`.
+    Sources that don't map onto model fields (methods, properties, `SerializerMethodField`)
+    leave the plan incomplete, in which case no column restriction is applied.
+    """
+    plan = plan or QueryPlan()
+    for field in serializer.fields.values():
+        if field.write_only or isinstance(field, serializers.HiddenField):
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            plan.complete = False
+            continue
+        if field.source == '*':
+            nested = _nested_serializer(field)
+            if nested is not None:
+                build_query_plan(nested, model, prefix, plan)
+            else:
+                plan.complete = False
+            continue
+
+        current_model, path = model, prefix
+        attrs = field.source_attrs
+        for index, attr in enumerate(attrs):
+            model_field = _get_relation(current_model, attr)
+            if model_field is None:
+                plan.complete = False
+                break
+            is_last = index == len(attrs) - 1
+            if not model_field.is_relation:
+                plan.only.add(_join(path, attr))
+                break
+
+            if model_field.many_to_many or model_field.one_to_many:
+                lookup = _join(path, attr)
+                plan.prefetch_related.add(lookup)
+                nested = _nested_serializer(field) if is_last else None
+                if nested is not None:
+                    child = build_query_plan(nested, model_field.related_model)
+                    plan.prefetch_related.update(_join(lookup, sub) for sub in child.select_related)
+                    plan.prefetch_related.update(_join(lookup, sub) for sub in child.prefetch_related)
+                # Columns of prefetched rows are chosen by the prefetch query, not by only()
+                plan.only.discard(lookup)
+                break
+
+            concrete = getattr(model_field, 'concrete', False)
+            if is_last and concrete and isinstance(field, serializers.PrimaryKeyRelatedField):
+                # The related pk is already on this row
+                plan.only.add(_join(path, attr))
+                break
+
+            lookup = _join(path, attr)
+            plan.select_related.add(lookup)
+            plan.only.add(lookup)
+            current_model, path = model_field.related_model, lookup
+
+            if is_last:
+                nested = _nested_serializer(field)
+                if nested is not None:
+                    build_query_plan(nested, current_model, path, plan)
+                else:
+                    # RelatedFields other than pk-only ones read arbitrary attributes of the target
+                    plan.complete = False
+    return plan
+
+
+class SerializerQueryPlanMixin:
+    """
+    Derive `select_related`/`prefetch_related`/`only()` for the queryset from the
+    serializer's dotted `source` paths and nested serializers, so new serializer
+    fields can't silently introduce N+1 queries.
+
+    The plan is applied in `filter_queryset`, which `list` and `get_object` both call,
+    so it composes with any view-specific `get_queryset`. Column restriction with
+    `only()` is limited to safe methods to keep writes working on fully loaded rows.
+    """
+    _query_plans = {}
+
+    def get_query_plan(self, serializer_class, model):
+        key = (serializer_class, model)
+        if key not in self._query_plans:
+            serializer = serializer_class(context=self.get_serializer_context())
+            self._query_plans[key] = build_query_plan(serializer, model)
+        return self._query_plans[key]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self.apply_query_plan(queryset)
+
+    def apply_query_plan(self, queryset):
+        plan = self.get_query_plan(self.get_serializer_class(), queryset.model)
+
+        if plan.select_related and queryset.query.select_related is not True:
+            queryset = queryset.select_related(*sorted(plan.select_related))
+
+        seen = {lookup.prefetch_to for lookup in normalize_prefetch_lookups(queryset._prefetch_related_lookups)}
+        missing = sorted(lookup for lookup in plan.prefetch_related if lookup not in seen)
+        if missing:
+            queryset = queryset.prefetch_related(*missing)
+
+        deferred_fields, defer = queryset.query.deferred_loading
+        if (
+            plan.complete
+            and not deferred_fields and defer
+            and self.request.method in permissions.SAFE_METHODS
+        ):
+            # Joins added by get_queryset must keep their FK column loaded
+            existing = queryset.query.select_related
+            only = set(plan.only)
+            if isinstance(existing, dict):
+                only.update(_flatten_select_related(existing))
+            queryset = queryset.only(*sorted(only))
+        return queryset
+
+
+def _flatten_select_related(tree, prefix=''):
+    for name, children in tree.items():
+        path = _join(prefix, name)
+        yield path
+        yield from _flatten_select_related(children, path)
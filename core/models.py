@@ -1,7 +1,13 @@
+import secrets
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from core.purging import delete_in_chunks
+
 
 
 class UserManager(BaseUserManager):
@@ -40,11 +46,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Signed into interview feed URLs; rotating it revokes every URL handed out before
+    feed_nonce = models.CharField(max_length=32, blank=True, default='', editable=False)
+
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
+    class Meta:
+        indexes = [
+            # Case-insensitive email lookups (check-email, provisioning) compare LOWER(email)
+            models.Index(Lower('email'), name='core_user_email_lower_idx'),
+        ]
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
@@ -73,3 +88,89 @@ class ApplicantProfile(models.Model):
 
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.email}'s Profile"
+
+
+
+class AuthTokenManager(models.Manager):
+
+    def get_or_create(self, defaults=None, **kwargs):
+        # djoser logs users in with get_or_create(user=...): hand out a fresh token, not an expired one
+        token, created = super().get_or_create(defaults=defaults, **kwargs)
+        if not created and token.is_expired:
+            token = token.rotate()
+        return token, created
+
+    def purge_expired(self, chunk_size=1000, pause=0):
+        """Delete expired tokens in chunks found through the `expires_at` index."""
+        return delete_in_chunks(self.filter(expires_at__lte=timezone.now()), chunk_size, pause)
+
+
+
+class AuthToken(models.Model):
+    """
+    API token for `Authorization: Token <key>`, in place of rest_framework.authtoken's
+    Token: it expires `AUTH_TOKEN_LIFETIME` after it is issued and can be rotated.
+    `last_used_at` is only written once per `AUTH_TOKEN_LAST_USED_GRANULARITY`.
+    """
+    key = models.CharField(max_length=40, primary_key=True)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='auth_token')
+    created = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    objects = AuthTokenManager()
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = secrets.token_hex(20)
+        if not self.expires_at:
+            self.expires_at = self.created + settings.AUTH_TOKEN_LIFETIME
+        super().save(*args, **kwargs)
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def rotate(self):
+        """Replace this token with a new key and lifetime; the old key stops working at once."""
+        with transaction.atomic():
+            self.delete()
+            return AuthToken.objects.create(user_id=self.user_id)
+
+    def __str__(self):
+        return f'Token for {self.user_id} (expires {self.expires_at:%Y-%m-%d %H:%M})'
+
+
+
+class RevokedAccessToken(models.Model):
+    """
+    JWT denylist entry. With a `jti` it revokes that one token; with an empty `jti` it revokes
+    every token of `user` issued before `created_at` (role, password or activation changes).
+    Rows are useless once `expires_at` passes and are skipped when the denylist is loaded.
+    """
+    jti = models.CharField(max_length=64, blank=True, db_index=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'Revoked {self.jti or "all tokens"} for {self.user_id}'
+
+
+
+class UserSearchGram(models.Model):
+    """
+    One row per distinct search gram of a user's email and names: every lowercased trigram,
+    plus '^' followed by the first one or two characters of each word for short prefixes.
+    Maintained by `core.search`; see `search_users()`.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_grams')
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['gram', 'user'], name='core_usersearchgram_gram_user_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.gram!r} for {self.user_id}'
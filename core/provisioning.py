@@ -0,0 +1,133 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.dispatch import Signal
+
+from core.models import User, EmployerProfile, ApplicantProfile
+
+
+
+# Sent once per batch with the batch's saved `users`, inside its transaction just as
+# post_save would be. bulk_create() sends no post_save, so the `create_user_profile`
+# receiver never runs for provisioned users (their profiles are bulk-created here instead);
+# anything else that reacts to new users must also listen to this signal.
+users_provisioned = Signal()
+
+PROFILE_MODELS = {'employer': EmployerProfile, 'applicant': ApplicantProfile}
+USER_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def _init_worker():
+    # Needed under the "spawn" start method; a no-op for forked workers
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None, chunksize=64):
+    """Hash `passwords` with the configured hasher, spread over `workers` processes (1 = inline)."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < chunksize:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+class ProvisioningReport:
+
+    def __init__(self):
+        self.requested = 0
+        self.created = 0
+        self.skipped = []
+        self.hash_seconds = 0.0
+        self.insert_seconds = 0.0
+
+    @property
+    def total_seconds(self):
+        return self.hash_seconds + self.insert_seconds
+
+    @property
+    def users_per_second(self):
+        return self.created / self.total_seconds if self.total_seconds else 0.0
+
+    def as_dict(self):
+        return {
+            'requested': self.requested,
+            'created': self.created,
+            'skipped': self.skipped,
+            'hash_seconds': round(self.hash_seconds, 3),
+            'insert_seconds': round(self.insert_seconds, 3),
+            'users_per_second': round(self.users_per_second, 1),
+        }
+
+
+def _existing_emails(emails, batch_size):
+    existing = set()
+    for start in range(0, len(emails), batch_size):
+        chunk = emails[start:start + batch_size]
+        existing.update(
+            User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=chunk)
+            .values_list('email_lower', flat=True)
+        )
+    return existing
+
+
+def provision_users(rows, role='applicant', batch_size=1000, workers=None):
+    """
+    Create users from dicts with `email`, `password` and optional `role`, `username`,
+    `first_name` and `last_name`, plus the profile matching each role.
+
+    Emails that already exist (case-insensitively) or repeat within `rows` are skipped.
+    Passwords are hashed up front across a process pool; users and profiles are then
+    inserted with `bulk_create()` one transaction per batch. No `post_save` is sent for
+    these rows: `users_provisioned` is sent for each batch instead.
+    """
+    report = ProvisioningReport()
+    report.requested = len(rows)
+
+    seen, pending = set(), []
+    for row in rows:
+        email = User.objects.normalize_email(row['email'])
+        key = email.lower()
+        if key in seen:
+            report.skipped.append(email)
+            continue
+        seen.add(key)
+        pending.append(dict(row, email=email, role=row.get('role') or role))
+
+    started = time.perf_counter()
+    existing = _existing_emails(sorted(seen), batch_size)
+    if existing:
+        report.skipped.extend(row['email'] for row in pending if row['email'].lower() in existing)
+        pending = [row for row in pending if row['email'].lower() not in existing]
+    report.insert_seconds += time.perf_counter() - started
+
+    started = time.perf_counter()
+    hashes = hash_passwords([row.get('password') for row in pending], workers=workers)
+    report.hash_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        users = [
+            User(
+                email=row['email'], password=hashed, role=row['role'],
+                **{name: row.get(name) or '' for name in USER_FIELDS},
+            )
+            for row, hashed in zip(batch, hashes[start:start + batch_size])
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            # MySQL doesn't return primary keys from bulk_create(), so read them back
+            ids = dict(User.objects.filter(email__in=[user.email for user in users]).values_list('email', 'pk'))
+            for user in users:
+                user.pk = ids[user.email]
+            for role_name, model in PROFILE_MODELS.items():
+                model.objects.bulk_create([model(user_id=user.pk) for user in users if user.role == role_name])
+            users_provisioned.send(sender=User, users=users)
+        report.created += len(users)
+    report.insert_seconds += time.perf_counter() - started
+    return report
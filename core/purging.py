@@ -0,0 +1,19 @@
+import time
+
+
+
+def delete_in_chunks(queryset, chunk_size=1000, pause=0):
+    """
+    Delete the rows of `queryset` `chunk_size` primary keys at a time, optionally sleeping
+    `pause` seconds in between, so no single statement locks a large range of the table.
+    The filter is re-applied to each chunk; returns the number of rows deleted.
+    """
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+        if pks:
+            deleted += queryset.filter(pk__in=pks).delete()[0]
+        if len(pks) < chunk_size:
+            return deleted
+        if pause:
+            time.sleep(pause)
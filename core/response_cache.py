@@ -0,0 +1,308 @@
+"""
+Shared cache of the responses anonymous clients get from public read endpoints
+(MIDDLEWARE: 'core.response_cache.AnonymousResponseCacheMiddleware').
+
+A GET or HEAD without credentials is cacheable when its view lets anyone read it: every
+permission class is AllowAny or IsAuthenticatedOrReadOnly, and none is chosen per request.
+Entries are keyed by host, path, sorted query parameters and Accept header, and tagged
+with each model instance created while building the response (recorded via post_init),
+plus the model's whole collection for `list` actions. Writes move the version of the
+tags they affect, immediately and again on commit; an entry whose tags moved is stale,
+so only the responses that showed a changed row are recomputed. Responses that loaded
+a model outside RESPONSE_CACHE_MODELS are never stored, as nothing would invalidate them.
+"""
+import contextvars
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re
+from django.utils.http import urlencode
+
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.views import APIView
+
+from core.throttling import resolve_scope
+
+
+
+PUBLIC_PERMISSIONS = (AllowAny, IsAuthenticatedOrReadOnly)
+ENTRY_KEY = 'response:{}'
+TAG_KEY = 'response-tag:{}'
+STATS_KEY = 'response-stats:{}'
+STATS = ('hits', 'misses', 'stale', 'stores', 'skipped', 'invalidations', 'stored_bytes')
+# Seconds between pushes of a process's counters to the shared cache
+STATS_FLUSH_INTERVAL = 5
+
+_loaded = contextvars.ContextVar('response_cache_loaded', default=None)
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE]
+
+
+def instance_tag(label, pk):
+    return f'{label}:{pk}'
+
+
+def collection_tag(label):
+    return f'{label}:*'
+
+
+
+class ResponseCacheStats:
+    """Counters kept per process and added to the shared ones every STATS_FLUSH_INTERVAL seconds."""
+
+    def __init__(self):
+        self.pending = Counter()
+        self.flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.pending[name] += amount
+            due = time.monotonic() - self.flushed_at >= STATS_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self.pending = self.pending, Counter()
+            self.flushed_at = time.monotonic()
+        cache = get_cache()
+        for name, amount in pending.items():
+            key = STATS_KEY.format(name)
+            if not cache.add(key, amount, None):
+                try:
+                    cache.incr(key, amount)
+                except ValueError:
+                    cache.set(key, amount, None)
+
+    def reset(self):
+        with self._lock:
+            self.pending.clear()
+        get_cache().delete_many([STATS_KEY.format(name) for name in STATS])
+
+
+stats = ResponseCacheStats()
+
+
+def response_cache_stats():
+    """
+    Shared counters plus this process's unflushed ones, the hit ratio over all lookups
+    and, for a per-process LocMemCache, the entries held and the bytes they take.
+    """
+    stats.flush()
+    stored = get_cache().get_many([STATS_KEY.format(name) for name in STATS])
+    result = {name: stored.get(STATS_KEY.format(name), 0) for name in STATS}
+    lookups = result['hits'] + result['misses'] + result['stale']
+    result['hit_ratio'] = result['hits'] / lookups if lookups else 0.0
+    result['entries'] = result['memory_bytes'] = None
+    cache = get_cache()
+    if isinstance(cache, LocMemCache):
+        with cache._lock:
+            values = [value for key, value in cache._cache.items() if key.startswith(cache.make_key(ENTRY_KEY.format('')))]
+        result['entries'] = len(values)
+        result['memory_bytes'] = sum(len(value) for value in values)
+    return result
+
+
+
+def record(label, pk):
+    """Note that the response being built, if cacheable, shows row `pk` of model `label`."""
+    loaded = _loaded.get()
+    if loaded is not None:
+        loaded.add((label, pk))
+
+
+def record_instance(instance):
+    """post_init hook: note the instance if a cacheable response is being built."""
+    if _loaded.get() is not None:
+        record(instance._meta.label_lower, instance.pk)
+
+
+def invalidate(tags):
+    """Make every entry tagged with one of `tags` stale, now and once the transaction commits."""
+    tags = list(tags)
+    _move_versions(tags)
+    transaction.on_commit(lambda: _move_versions(tags))
+
+
+def invalidate_instance(instance):
+    label = instance._meta.label_lower
+    invalidate([instance_tag(label, instance.pk), collection_tag(label)])
+
+
+def _move_versions(tags):
+    # Versions are timestamps, so a response rendered before the write can tell it's outdated
+    now = time.time()
+    get_cache().set_many({TAG_KEY.format(tag): now for tag in tags}, None)
+    stats.count('invalidations', len(tags))
+
+
+
+def is_anonymous(request):
+    return 'HTTP_AUTHORIZATION' not in request.META and settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def cacheable_view(view_func, request):
+    """The (view class, action) behind `view_func` when anyone may read it, else None."""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None or not issubclass(cls, APIView) or cls.get_permissions is not APIView.get_permissions:
+        return None
+    initkwargs = getattr(view_func, 'initkwargs', {})
+    permission_classes = initkwargs.get('permission_classes', cls.permission_classes)
+    if not all(issubclass(permission, PUBLIC_PERMISSIONS) for permission in permission_classes):
+        return None
+    # Hits never reach DRF's throttles
+    if resolve_scope(request, cls):
+        return None
+    action = getattr(view_func, 'actions', {}).get('get')
+    return cls, action
+
+
+def cache_key(request):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    accept = request.headers.get('Accept', '').replace(' ', '')
+    source = '\n'.join((request.get_host(), request.path, query, accept))
+    return ENTRY_KEY.format(hashlib.sha256(source.encode()).hexdigest())
+
+
+
+class CacheableRequest:
+
+    def __init__(self, key, tags):
+        self.key = key
+        self.tags = tags
+        self.started = time.time()
+        self.hit = False
+
+
+
+class AnonymousResponseCacheMiddleware:
+    """
+    Answer anonymous reads of public endpoints from RESPONSE_CACHE, storing successful
+    responses for RESPONSE_CACHE_TTL seconds. Keep it last, so the middleware above
+    still processes every response.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.applies(request):
+            return self.get_response(request)
+        loaded = set()
+        token = _loaded.set(loaded)
+        try:
+            response = self.get_response(request)
+        finally:
+            _loaded.reset(token)
+        state = self.pending_store(request)
+        return response if state is None else self.store(state, response, loaded)
+
+    async def __acall__(self, request):
+        if not self.applies(request):
+            return await self.get_response(request)
+        loaded = set()
+        token = _loaded.set(loaded)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _loaded.reset(token)
+        state = self.pending_store(request)
+        return response if state is None else await sync_to_async(self.store)(state, response, loaded)
+
+    @staticmethod
+    def applies(request):
+        return settings.RESPONSE_CACHE_TTL > 0 and request.method in ('GET', 'HEAD') and is_anonymous(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.applies(request):
+            return None
+        view = cacheable_view(view_func, request)
+        if view is None:
+            return None
+        cls, action = view
+        tags = set()
+        if action == 'list':
+            queryset = getattr(cls, 'queryset', None)
+            if queryset is None:
+                return None
+            tags.add(collection_tag(queryset.model._meta.label_lower))
+        request._response_cache = state = CacheableRequest(cache_key(request), tags)
+        response = self.lookup(state)
+        state.hit = response is not None
+        return response
+
+    def lookup(self, state):
+        cache = get_cache()
+        entry = cache.get(state.key)
+        if entry is None:
+            stats.count('misses')
+            return None
+        versions, status, headers, content = entry
+        if cache.get_many(list(versions)) != versions:
+            stats.count('stale')
+            return None
+        stats.count('hits')
+        response = HttpResponse(content, status=status)
+        for header, value in headers:
+            response[header] = value
+        return response
+
+    @staticmethod
+    def pending_store(request):
+        # HEAD responses may have had their body stripped
+        state = getattr(request, '_response_cache', None)
+        return state if state is not None and not state.hit and request.method == 'GET' else None
+
+    def store(self, state, response, loaded):
+        if not self.storable(response, loaded):
+            stats.count('skipped')
+            return response
+
+        tags = state.tags | {instance_tag(label, pk) for label, pk in loaded}
+        cache = get_cache()
+        keys = [TAG_KEY.format(tag) for tag in tags]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                cache.add(key, state.started, None)
+        if len(versions) < len(keys):
+            versions = cache.get_many(keys)
+        # A tag moved (or was evicted and re-added) after this request started: the
+        # response may show what a concurrent write replaced
+        if len(versions) < len(keys) or any(version > state.started for version in versions.values()):
+            stats.count('skipped')
+            return response
+
+        content = response.content
+        cache.set(state.key, (versions, response.status_code, list(response.items()), content), settings.RESPONSE_CACHE_TTL)
+        stats.count('stores')
+        stats.count('stored_bytes', len(content))
+        return response
+
+    @staticmethod
+    def storable(response, loaded):
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return False
+        if len(response.content) > settings.RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            return False
+        directives = {directive.strip().lower() for directive in cc_delim_re.split(response.get('Cache-Control', ''))}
+        if directives & {'private', 'no-store', 'no-cache'}:
+            return False
+        return all(label in settings.RESPONSE_CACHE_MODELS for label, _ in loaded)
@@ -0,0 +1,177 @@
+"""
+OpenAPI schema generated once per code version and served from a file.
+
+`python manage.py generate_schema` (run by entrypoint.sh) writes the JSON and YAML
+documents, plus gzipped copies, to SCHEMA_CACHE_DIR under a name derived from
+`schema_version()`. `schema_file` serves them with an ETag, answering conditional
+requests with 304 and gzip-capable clients with the precompressed copy; a missing
+file is generated on first request. drf-yasg is only imported to generate a schema
+or render the Swagger UI / ReDoc pages.
+"""
+import functools
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
+
+from rest_framework import permissions
+
+
+FORMATS = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+# Directories whose Python sources define the API; their contents version the schema
+SOURCE_DIRS = ('config', 'core', 'recruitment')
+
+
+def get_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Job Board API",
+        default_version='v1',
+        description="API documentation for the Job Board system.",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="hatef.barin97@gmail.com"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+@functools.cache
+def get_schema_view_class():
+    from drf_yasg.views import get_schema_view
+
+    return get_schema_view(get_info(), public=True, permission_classes=[permissions.AllowAny])
+
+
+@functools.cache
+def schema_version():
+    """
+    CODE_VERSION (e.g. the deployed commit) when set, otherwise a hash of the API's
+    source files, combined with the settings that change which endpoints exist.
+    """
+    digest = hashlib.sha256()
+    if settings.CODE_VERSION:
+        digest.update(settings.CODE_VERSION.encode())
+    else:
+        base = Path(settings.BASE_DIR)
+        for directory in SOURCE_DIRS:
+            for path in sorted((base / directory).rglob('*.py')):
+                if 'tests' in path.relative_to(base).parts:
+                    continue
+                digest.update(str(path.relative_to(base)).encode())
+                digest.update(path.read_bytes())
+    digest.update(f'jwt={settings.JWT_AUTH_ENABLED}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def schema_path(fmt, version=None):
+    return Path(settings.SCHEMA_CACHE_DIR) / f'openapi-{version or schema_version()}.{fmt}'
+
+
+def _write_atomic(path, data):
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    with os.fdopen(handle, 'wb') as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+def generate_schema(version=None):
+    """Generate the schema and write every format (and its gzipped copy); returns the paths."""
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+    generator = get_schema_view_class().generator_class(get_info())
+    schema = generator.get_schema(request=None, public=True)
+    Path(settings.SCHEMA_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    written = []
+    for fmt, codec in (('json', OpenAPICodecJson), ('yaml', OpenAPICodecYaml)):
+        body = codec(validators=[]).encode(schema)
+        path = schema_path(fmt, version)
+        _write_atomic(path, body)
+        _write_atomic(path.with_name(path.name + '.gz'), gzip.compress(body, mtime=0))
+        written.append(path)
+    return written
+
+
+
+class SchemaDocument:
+
+    def __init__(self, fmt, body, compressed):
+        self.content_type = FORMATS[fmt]
+        self.body = body
+        self.compressed = compressed
+        self.etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+_documents = {}
+_generate_lock = threading.Lock()
+
+
+def get_document(fmt):
+    """The schema document for the current code version, read from disk once per process."""
+    version = schema_version()
+    document = _documents.get((fmt, version))
+    if document is None:
+        path = schema_path(fmt, version)
+        if not path.exists():
+            with _generate_lock:
+                if not path.exists():
+                    generate_schema(version)
+        document = _documents[(fmt, version)] = SchemaDocument(
+            fmt, path.read_bytes(), path.with_name(path.name + '.gz').read_bytes(),
+        )
+    return document
+
+
+@csrf_exempt
+@require_safe
+def schema_file(request, format):
+    fmt = format.lstrip('.')
+    if fmt not in FORMATS:
+        raise Http404
+    document = get_document(fmt)
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (document.etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(document.compressed, content_type=document.content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(document.body, content_type=document.content_type)
+    response['ETag'] = document.etag
+    response['Cache-Control'] = f'public, max-age={settings.SCHEMA_MAX_AGE}'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def ui_view(renderer):
+    """drf-yasg's `renderer` ('swagger' or 'redoc') page, importing drf-yasg on first use."""
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return _ui_view(renderer)(request, *args, **kwargs)
+    return view
+
+
+@functools.cache
+def _ui_view(renderer):
+    from drf_yasg import openapi
+    from rest_framework.response import Response
+
+    class UIView(get_schema_view_class()):
+        def get(self, request, version='', format=None):
+            # The page only shows the title and version and loads the cached schema from
+            # SWAGGER_SETTINGS['SPEC_URL'], so nothing is generated here
+            return Response(openapi.Swagger(info=get_info(), _prefix='/', _version=version or None, paths=openapi.Paths({})))
+
+    return UIView.with_ui(renderer, cache_timeout=0)
@@ -0,0 +1,109 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from rest_framework import filters
+
+from core.models import User, UserSearchGram
+
+
+
+# ==========================
+# GRAMS
+# ==========================
+
+SEARCH_FIELDS = ('email', 'first_name', 'last_name')
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def trigrams(value):
+    return {value[index:index + 3] for index in range(len(value) - 2)}
+
+
+def user_grams(user):
+    """Lowercased trigrams of every search field, plus '^' + one- and two-character word prefixes."""
+    grams = set()
+    for name in SEARCH_FIELDS:
+        value = (getattr(user, name) or '').lower()
+        grams |= trigrams(value)
+        for word in WORD_RE.findall(value):
+            grams.update(('^' + word[:1], '^' + word[:2]))
+    return grams
+
+
+def term_grams(term):
+    """Grams a user must have to match `term`; terms under three characters match word prefixes."""
+    term = term.lower()
+    return trigrams(term) if len(term) >= 3 else {'^' + term}
+
+
+
+# ==========================
+# INDEXING
+# ==========================
+
+def index_users(users, replace=True):
+    """(Re)write the search grams of `users`, which must already have primary keys."""
+    with transaction.atomic(savepoint=False):
+        if replace:
+            UserSearchGram.objects.filter(user__in=[user.pk for user in users]).delete()
+        # Accent-insensitive MySQL collations can treat two distinct grams as equal
+        UserSearchGram.objects.bulk_create(
+            [UserSearchGram(user_id=user.pk, gram=gram) for user in users for gram in user_grams(user)],
+            batch_size=5000, ignore_conflicts=True,
+        )
+
+
+def rebuild_index(batch_size=2000):
+    """Rebuild every user's grams in primary-key batches; returns the number of users indexed."""
+    UserSearchGram.objects.all().delete()
+    queryset = User.objects.only('pk', *SEARCH_FIELDS).order_by('pk')
+    count, last_pk = 0, 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return count
+        index_users(batch, replace=False)
+        count += len(batch)
+        last_pk = batch[-1].pk
+
+
+
+# ==========================
+# QUERYING
+# ==========================
+
+def search_users(queryset, terms):
+    """
+    Restrict `queryset` to users matching every term in one of SEARCH_FIELDS, like
+    `icontains` would, without scanning the users table.
+
+    Candidates are the users holding all of a term's grams, found through the
+    (gram, user) index. `icontains` then runs on those rows only, dropping users whose
+    grams are scattered rather than contiguous. Terms shorter than three characters
+    can't be split into trigrams and match the start of a word instead.
+    """
+    for term in terms:
+        grams = term_grams(term)
+        candidates = (
+            UserSearchGram.objects.filter(gram__in=grams).values('user_id')
+            .annotate(matched=Count('gram')).filter(matched=len(grams)).values('user_id')
+        )
+        queryset = queryset.filter(pk__in=candidates)
+        if len(term) >= 3:
+            queryset = queryset.filter(reduce(or_, (Q(**{f'{name}__icontains': term}) for name in SEARCH_FIELDS)))
+    return queryset
+
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """`?search=` backed by `search_users()`; the view's `search_fields` only document the parameter."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_users(queryset, terms)
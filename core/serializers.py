@@ -1,8 +1,13 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 
-from core.models import User, EmployerProfile, ApplicantProfile
+from core.authentication import add_user_claims, denylist
+from core.models import User, AuthToken, EmployerProfile, ApplicantProfile
 
 
 
@@ -47,6 +52,32 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 
+# -------------------------
+# Bulk Provisioning Serializers
+# -------------------------
+class ProvisionedUserSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    username = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+
+
+
+class BulkProvisionSerializer(serializers.Serializer):
+    # Passwords are hashed inline within the request, which must finish well inside proxy
+    # timeouts; larger imports go through `manage.py provision_users`
+    MAX_USERS = 20
+
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, default='applicant')
+    users = ProvisionedUserSerializer(
+        many=True, allow_empty=False, max_length=MAX_USERS,
+        error_messages={'max_length': f"At most {MAX_USERS} users per request; use `manage.py provision_users` for imports."},
+    )
+
+
+
 # -------------------------
 # Employer Profile Serializer
 # -------------------------
@@ -77,14 +108,22 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
 class ApplicantProfileSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     resume = serializers.FileField(required=False, allow_null=True)
+    resume_download_url = serializers.SerializerMethodField()
 
     class Meta:
         model = ApplicantProfile
         fields = [
-            'id', 'user', 'resume', 'bio', 'created_at'
+            'id', 'user', 'resume', 'resume_download_url', 'bio', 'created_at'
         ]
         read_only_fields = ['created_at']
 
+    def get_resume_download_url(self, obj):
+        request = self.context.get('request')
+        if not obj.pk or not obj.resume:
+            return None
+        url = reverse('applicant-profiles-resume', kwargs={'pk': obj.pk})
+        return request.build_absolute_uri(url) if request else url
+
     def validate(self, attrs):
         # forbid any incoming created_at
         if 'created_at' in self.initial_data:
@@ -92,4 +131,46 @@ class ApplicantProfileSerializer(serializers.ModelSerializer):
                 'created_at': 'This field is read-only.'
             })
         return super().validate(attrs)
-                
\ No newline at end of file
+                
+
+
+
+# -------------------------
+# JWT Serializers
+# -------------------------
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair whose access token carries the claims `ClaimsJWTAuthentication` needs."""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+
+class DenylistTokenRefreshSerializer(TokenRefreshSerializer):
+    """Reject revoked refresh tokens and re-read the claims, so role changes reach new access tokens."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if denylist.is_revoked(refresh):
+            raise AuthenticationFailed("Token has been revoked.", code='token_revoked')
+        user = User.objects.filter(pk=refresh.payload.get(jwt_settings.USER_ID_CLAIM), is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], code='no_active_account')
+        return {'access': str(add_user_claims(refresh.access_token, user))}
+
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
+
+
+class AuthTokenSerializer(serializers.ModelSerializer):
+    auth_token = serializers.CharField(source='key', read_only=True)
+
+    class Meta:
+        model = AuthToken
+        fields = ['auth_token', 'created', 'expires_at']
+        read_only_fields = fields
+
@@ -0,0 +1,177 @@
+"""
+Session engine (SESSION_ENGINE = 'core.sessions') layered as per-process LRU -> shared
+cache -> database, with write-behind for routine session updates.
+"""
+import atexit
+import copy
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.db import connections, router
+from django.utils import timezone
+
+from core.lru import LRUCache
+from core.purging import delete_in_chunks
+
+
+
+class LocalSessions(LRUCache):
+    """
+    The per-process tier. Deleting a session (logout, cycling the key) leaves a marker for
+    that session in the shared cache for as long as a local copy of it can live, and a local
+    copy is only served while there is none. Checking for the small, almost always absent
+    marker is cheaper than fetching and decoding the session, and a logout only ends the
+    local copies of the session logged out.
+    """
+    REVOKED_KEY = 'core.sessions.revoked:{}'
+
+    def get_valid(self, key, shared_cache):
+        data = self.get(key)
+        if data is not None and shared_cache.get(self.REVOKED_KEY.format(key)) is not None:
+            self.delete(key)
+            return None
+        return data
+
+    def revoke(self, key, shared_cache):
+        self.delete(key)
+        if self.ttl > 0:
+            shared_cache.set(self.REVOKED_KEY.format(key), True, math.ceil(self.ttl) + 1)
+
+
+local_sessions = LocalSessions(maxsize=settings.SESSION_LOCAL_CACHE_SIZE, ttl=settings.SESSION_LOCAL_CACHE_TTL)
+
+
+def _auth_state(data):
+    return data.get(SESSION_KEY), data.get(HASH_SESSION_KEY)
+
+
+
+class WriteBehindBuffer:
+    """
+    Latest (data, expiry) per session key, written to the database in one upsert once
+    SESSION_WRITE_BEHIND_SECONDS have passed since the oldest pending write or
+    SESSION_WRITE_BEHIND_BATCH keys are pending. Repeated saves of a session in between
+    coalesce into a single row write.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.first_pending_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, session_key, session_data, expire_date):
+        with self._lock:
+            self.pending[session_key] = (session_data, expire_date)
+            if self.first_pending_at is None:
+                self.first_pending_at = time.monotonic()
+        if self.is_due():
+            self.flush()
+
+    def discard(self, session_key):
+        with self._lock:
+            self.pending.pop(session_key, None)
+
+    def is_due(self):
+        return bool(self.pending) and (
+            len(self.pending) >= settings.SESSION_WRITE_BEHIND_BATCH
+            or time.monotonic() - self.first_pending_at >= settings.SESSION_WRITE_BEHIND_SECONDS
+        )
+
+    def flush(self):
+        """Write every pending session; returns the number of rows written."""
+        with self._lock:
+            pending, self.pending, self.first_pending_at = self.pending, {}, None
+        if not pending:
+            return 0
+        # A session deleted since it was buffered (logout, another process) is gone from the
+        # shared cache; writing it back would resurrect it
+        store = SessionStore()
+        live = store._cache.get_many([store.cache_key_prefix + key for key in pending])
+        model = SessionStore.get_model_class()
+        rows = [
+            model(session_key=key, session_data=data, expire_date=expire_date)
+            for key, (data, expire_date) in pending.items()
+            if store.cache_key_prefix + key in live
+        ]
+        if rows:
+            using = router.db_for_write(model)
+            supports_target = connections[using].features.supports_update_conflicts_with_target
+            model.objects.using(using).bulk_create(
+                rows, update_conflicts=True, update_fields=['session_data', 'expire_date'],
+                unique_fields=['session_key'] if supports_target else None,
+            )
+        return len(rows)
+
+
+write_buffer = WriteBehindBuffer()
+atexit.register(write_buffer.flush)
+
+
+
+class SessionStore(CachedDBStore):
+    """
+    `cached_db` with a short-lived per-process LRU in front of the shared cache, and
+    write-behind for updates to existing sessions.
+
+    Creating, cycling and deleting sessions, and any change to the logged-in user, still
+    go straight to the database. With write-behind enabled, other updates are written to
+    both cache tiers at once and reach the database through `write_buffer`. Until a flush,
+    other processes read them from the shared cache, so write-behind needs a cache shared
+    by every worker (`core.caches.check_shared_caches`).
+    """
+    cache_key_prefix = 'core.sessions'
+
+    def load(self):
+        data = local_sessions.get_valid(self.cache_key, self._cache)
+        if data is None:
+            data = super().load()
+            if data:
+                local_sessions.set(self.cache_key, copy.deepcopy(data))
+        else:
+            data = copy.deepcopy(data)
+        self._loaded_auth = _auth_state(data)
+        return data
+
+    def save(self, must_create=False):
+        if must_create or self.session_key is None or settings.SESSION_WRITE_BEHIND_SECONDS <= 0:
+            self._save_through(must_create)
+            return
+        data = self._get_session()
+        if _auth_state(data) != getattr(self, '_loaded_auth', (None, None)):
+            self._save_through(must_create)
+            return
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        local_sessions.set(self.cache_key, copy.deepcopy(data))
+        write_buffer.add(self.session_key, self.encode(data), self.get_expiry_date())
+
+    def _save_through(self, must_create):
+        super().save(must_create)
+        if self.session_key is not None:
+            write_buffer.discard(self.session_key)
+            local_sessions.set(self.cache_key, copy.deepcopy(self._get_session()))
+            self._loaded_auth = _auth_state(self._get_session())
+
+    def delete(self, session_key=None):
+        session_key = session_key or self.session_key
+        if session_key is None:
+            return
+        write_buffer.discard(session_key)
+        super().delete(session_key)
+        # After the shared copy is gone, so other processes reload from it rather than re-cache it
+        local_sessions.revoke(self.cache_key_prefix + session_key, self._cache)
+
+    @classmethod
+    def clear_expired(cls, chunk_size=None, pause=0):
+        """
+        Delete expired sessions a chunk at a time through the `expire_date` index, so no
+        single statement locks large ranges of the table. Returns the number deleted.
+        """
+        expired = cls.get_model_class().objects.filter(expire_date__lt=timezone.now())
+        return delete_in_chunks(expired, chunk_size or settings.SESSION_PURGE_CHUNK_SIZE, pause)
@@ -1,7 +1,15 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
-from core.models import User, EmployerProfile, ApplicantProfile
+from core import response_cache
+from core.authentication import denylist, invalidate_token
+from core.bloom import email_filter
+from core.models import User, AuthToken, EmployerProfile, ApplicantProfile
+from core.provisioning import users_provisioned
+from core.search import SEARCH_FIELDS, index_users
+from core.sessions import write_buffer
 
 
 
@@ -12,3 +20,111 @@ def create_user_profile(sender, instance, created, **kwargs):
             EmployerProfile.objects.create(user=instance)
         elif instance.role == 'applicant':
             ApplicantProfile.objects.create(user=instance)
+
+
+
+@receiver(post_save, sender=User)
+def evict_cached_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # Password, role, activation and profile changes must not be served from a stale snapshot
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    for key in AuthToken.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+@receiver(post_delete, sender=AuthToken)
+def evict_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+
+# Fields carried as JWT claims, or whose change must end existing sessions
+JWT_SENSITIVE_FIELDS = ('email', 'role', 'is_staff', 'is_active')
+
+
+def _jwt_state(instance):
+    return {name: instance.__dict__[name] for name in JWT_SENSITIVE_FIELDS if name in instance.__dict__}
+
+
+@receiver(post_init, sender=User)
+def remember_jwt_state(sender, instance, **kwargs):
+    instance._jwt_state = _jwt_state(instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_jwts(sender, instance, created, **kwargs):
+    state = _jwt_state(instance)
+    # set_password() leaves the raw password in `_password` until save() finishes
+    changed = instance._password is not None or any(
+        state.get(name) != value for name, value in instance._jwt_state.items()
+    )
+    if settings.JWT_AUTH_ENABLED and not created and changed:
+        denylist.revoke_user(instance.pk)
+    instance._jwt_state = state
+
+
+
+@receiver(post_init, sender=User)
+def remember_email(sender, instance, **kwargs):
+    instance._initial_email = instance.__dict__.get('email')
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_email(sender, instance, created, **kwargs):
+    # Cached job responses show their employer's email; runs before `_initial_email` is reset
+    if not created and instance.email != instance._initial_email:
+        response_cache.invalidate([response_cache.instance_tag(User._meta.label_lower, instance.pk)])
+
+
+@receiver(post_save, sender=User)
+def publish_registered_email(sender, instance, created, **kwargs):
+    # Published once committed, so a filter rebuilt meanwhile either scans the row or replays it
+    if created or instance.email != instance._initial_email:
+        email_filter.publish([instance.email])
+    instance._initial_email = instance.email
+
+
+@receiver(users_provisioned)
+def publish_provisioned_emails(sender, users, **kwargs):
+    email_filter.publish([user.email for user in users])
+
+
+
+def _search_source(instance):
+    # Read raw attribute values so deferred fields are never loaded just for this check
+    return tuple(instance.__dict__.get(name) for name in SEARCH_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_search_source(sender, instance, **kwargs):
+    instance._search_source = _search_source(instance)
+
+
+@receiver(post_save, sender=User)
+def update_search_grams(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not set(SEARCH_FIELDS) & set(update_fields):
+        return
+    source = _search_source(instance)
+    if created or source != instance._search_source:
+        index_users([instance], replace=not created)
+        instance._search_source = source
+
+
+@receiver(users_provisioned)
+def index_provisioned_users(sender, users, **kwargs):
+    index_users(users, replace=False)
+
+
+
+@receiver(post_init)
+def record_loaded_instance(sender, instance, **kwargs):
+    # Tags the anonymous response being built, if any, with every row it reads
+    response_cache.record_instance(instance)
+
+
+
+@receiver(request_finished)
+def flush_session_writes(sender, **kwargs):
+    # Covers quiet periods, when no new session save arrives to trigger the flush
+    if write_buffer.is_due():
+        write_buffer.flush()
@@ -0,0 +1,93 @@
+import json
+import threading
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.test.client import AsyncRequestFactory
+from django.urls import path
+
+from core.asynchronous import offload, async_urlpatterns
+from core.models import User
+from core.views import CheckEmailView, check_email
+
+
+
+class AsyncCheckEmailTests(TestCase):
+
+    def setUp(self):
+        caches['throttle'].clear()
+        User.objects.create_user(email="test@example.com", password="pass123", role="applicant")
+
+    async def post(self, data):
+        request = AsyncRequestFactory().post('/api/core/check-email/', data, content_type='application/json')
+        response = await check_email(request)
+        return response.status_code, json.loads(response.content)
+
+
+    async def test_existing_email(self):
+        """✅ Should return true for existing email (case-insensitive)."""
+        self.assertEqual(await self.post({"email": "TEST@example.com"}), (200, {"exists": True}))
+
+
+    async def test_unknown_email(self):
+        self.assertEqual(await self.post({"email": "nobody@example.com"}), (200, {"exists": False}))
+
+
+    async def test_missing_email(self):
+        """❌ Should return 400 if email is not provided."""
+        self.assertEqual(await self.post({}), (400, {"detail": "Email is required."}))
+
+
+    async def test_throttled_like_sync_view(self):
+        """❌ The async view counts against the same 'auth' budget."""
+        throttle_rates = {'auth.ip': '2/min'}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': throttle_rates}):
+            for _ in range(2):
+                self.assertEqual((await self.post({"email": "a@example.com"}))[0], 200)
+            status_code, data = await self.post({"email": "a@example.com"})
+        self.assertEqual(status_code, 429)
+        self.assertIn('detail', data)
+
+
+
+class OffloadTests(TestCase):
+
+    async def test_runs_on_sync_pool(self):
+        """✅ Offloaded views, and the streams they return, run on the bounded pool."""
+        threads = []
+
+        def chunks():
+            for chunk in (b'a', b'b'):
+                threads.append(threading.current_thread().name)
+                yield chunk
+
+        def view(request):
+            threads.append(threading.current_thread().name)
+            return StreamingHttpResponse(chunks())
+
+        response = await offload(view)(AsyncRequestFactory().get('/'))
+        self.assertTrue(response.is_async)
+        self.assertEqual([chunk async for chunk in response], [b'a', b'b'])
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(all(name.startswith('sync-view') for name in threads), threads)
+
+
+    def test_async_urlpatterns_wraps_named_routes_only(self):
+        async def read(request):
+            return HttpResponse('async')
+
+        patterns = [
+            path('email/', CheckEmailView.as_view(), name='email'),
+            path('upload/', CheckEmailView.as_view(), name='upload'),
+            path('other/', CheckEmailView.as_view(), name='other'),
+        ]
+        routed = async_urlpatterns(patterns, {'email': read}, offloaded=('upload',))
+        self.assertEqual([pattern.name for pattern in routed], ['email', 'upload', 'other'])
+        self.assertTrue(iscoroutinefunction(routed[0].callback))
+        self.assertTrue(iscoroutinefunction(routed[1].callback))
+        self.assertIs(routed[2], patterns[2])
+        # DRF enforces CSRF itself for session-authenticated requests
+        self.assertTrue(all(getattr(pattern.callback, 'csrf_exempt', False) for pattern in routed))
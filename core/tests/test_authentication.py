@@ -0,0 +1,257 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from core.authentication import CachedTokenAuthentication, local_tokens, token_cache_key
+from core.caches import check_shared_caches
+from core.lru import LRUCache
+from core.models import User, AuthToken, RevokedAccessToken
+
+
+
+class LRUCacheTests(TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+
+    def test_zero_ttl_disables_caching(self):
+        lru = LRUCache(maxsize=2, ttl=0)
+        lru.set('a', 1)
+        self.assertIsNone(lru.get('a'))
+
+
+
+class StockTokenAuthentication(TokenAuthentication):
+    model = AuthToken
+
+
+
+@override_settings(AUTH_TOKEN_CACHE_TTL=300)
+class CachedTokenAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = User.objects.create_user(email='emp@test.com', password='pass1234!', role='employer')
+        self.token = AuthToken.objects.create(user=self.user)
+        self.request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.me = reverse('user-me')
+
+
+    def authenticate(self):
+        return CachedTokenAuthentication().authenticate(self.request)
+
+
+    def test_repeat_requests_skip_the_token_query(self):
+        """✅ Only the first request pays for the token/user join; the stock class pays every time."""
+        with self.assertNumQueries(1):
+            StockTokenAuthentication().authenticate(self.request)
+        # The token/user join, plus recording the first use
+        with self.assertNumQueries(2):
+            self.authenticate()
+
+        local_tokens.clear()  # Served from the shared tier
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+        self.assertEqual((user.pk, user.role, token.key), (self.user.pk, 'employer', self.token.key))
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=0)
+    def test_without_a_shared_cache_tokens_are_loaded_every_time(self):
+        """❌ A logout in another worker couldn't evict a per-process copy, so none is kept."""
+        # Per-process caches, as in these tests, leave the token cache off
+        check_shared_caches()
+        self.authenticate()
+        with self.assertNumQueries(1):
+            self.authenticate()
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+        with self.assertRaisesMessage(ImproperlyConfigured, 'token authentication cache'):
+            with override_settings(AUTH_TOKEN_CACHE_TTL=300):
+                check_shared_caches()
+
+
+    def test_snapshot_user_saves_without_touching_password(self):
+        """✅ The cached user is a persisted instance whose password is loaded only on demand."""
+        self.authenticate()
+        user, _ = self.authenticate()
+        self.assertIn('password', user.get_deferred_fields())
+        user.first_name = 'Ada'
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Ada')
+        self.assertTrue(self.user.check_password('pass1234!'))
+
+
+    def test_logout_revokes_cached_token(self):
+        """❌ A token removed through djoser's logout stops working immediately."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(self.client.get(self.me).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post('/api/auth/token/logout/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+        self.assertEqual(self.client.get(self.me).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_role_change_and_deactivation_are_seen_immediately(self):
+        self.authenticate()
+        self.user.role = 'applicant'
+        self.user.save()
+        self.assertEqual(self.authenticate()[0].role, 'applicant')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+    def test_password_change_evicts_snapshot(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = self.client.post('/api/auth/users/set_password/', {
+            'current_password': 'pass1234!', 'new_password': 'n3w-Passw0rd!',
+        })
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('n3w-Passw0rd!'))
+
+
+    def test_last_login_updates_keep_snapshot(self):
+        self.authenticate()
+        self.user.save(update_fields=['last_login'])
+        self.assertIsNotNone(cache.get(token_cache_key(self.token.key)))
+
+
+
+class AuthTokenLifecycleTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = User.objects.create_user(email='emp@test.com', password='pass1234!', role='employer')
+        self.token = AuthToken.objects.create(user=self.user)
+        self.me = reverse('user-me')
+
+    def get_me(self, key):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        return self.client.get(self.me)
+
+    def expire(self, token):
+        AuthToken.objects.filter(pk=token.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+
+    def test_tokens_expire_after_their_lifetime(self):
+        self.assertEqual(self.token.expires_at - self.token.created, settings.AUTH_TOKEN_LIFETIME)
+        self.assertEqual(self.get_me(self.token.key).status_code, status.HTTP_200_OK)
+        self.expire(self.token)
+        cache.clear()
+        local_tokens.clear()
+        response = self.get_me(self.token.key)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data['detail'], 'Token has expired.')
+
+
+    def test_login_replaces_an_expired_token(self):
+        self.expire(self.token)
+        response = self.client.post('/api/auth/token/login/', {'email': 'emp@test.com', 'password': 'pass1234!'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['auth_token'], self.token.key)
+        self.assertEqual(self.get_me(response.data['auth_token']).status_code, status.HTTP_200_OK)
+
+
+    def test_rotation_issues_a_new_key_and_revokes_the_old_one(self):
+        """🔄 The rotated-out key stops working immediately, even if it was cached."""
+        self.assertEqual(self.get_me(self.token.key).status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('token-rotate'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(response.data['auth_token'], self.token.key)
+        self.assertEqual(self.get_me(self.token.key).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.get_me(response.data['auth_token']).status_code, status.HTTP_200_OK)
+
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=300)
+    def test_last_use_is_recorded_coarsely(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        CachedTokenAuthentication().authenticate(request)
+        self.token.refresh_from_db()
+        first_use = self.token.last_used_at
+        self.assertIsNotNone(first_use)
+
+        with self.assertNumQueries(0):
+            CachedTokenAuthentication().authenticate(request)
+        # Once the granularity window has passed, the next request records the use again
+        local_tokens.clear()
+        cache_key = token_cache_key(self.token.key)
+        created, expires_at, _, values = cache.get(cache_key)
+        cache.set(cache_key, (created, expires_at, first_use - timedelta(hours=1), values))
+        cache.delete(f'{cache_key}:touched')
+        with self.assertNumQueries(1):
+            CachedTokenAuthentication().authenticate(request)
+        self.token.refresh_from_db()
+        self.assertGreater(self.token.last_used_at, first_use)
+
+
+    def test_purge_deletes_expired_tokens_and_denylist_entries_in_chunks(self):
+        for index in range(5):
+            user = User.objects.create_user(email=f'old{index}@test.com', password='p', role='applicant')
+            self.expire(AuthToken.objects.create(user=user))
+        RevokedAccessToken.objects.create(user=self.user, expires_at=timezone.now() - timedelta(minutes=1))
+        RevokedAccessToken.objects.create(user=self.user, expires_at=timezone.now() + timedelta(minutes=1))
+
+        out = StringIO()
+        call_command('purge_tokens', '--chunk-size', '2', stdout=out)
+        self.assertIn('Deleted 5 expired token(s) and 1 expired denylist entry.', out.getvalue())
+        self.assertEqual(list(AuthToken.objects.values_list('key', flat=True)), [self.token.key])
+        self.assertEqual(RevokedAccessToken.objects.count(), 1)
+
+
+    def test_legacy_tokens_are_imported_with_a_fresh_expiry(self):
+        """🔑 Keys issued by rest_framework.authtoken keep working after the switch."""
+        out = StringIO()
+        call_command('import_legacy_tokens', stdout=out)
+        self.assertIn('No authtoken_token table', out.getvalue())
+
+        legacy_user = User.objects.create_user(email='legacy@test.com', password='p', role='applicant')
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE authtoken_token (key varchar(40) PRIMARY KEY, user_id integer, created datetime)')
+            cursor.executemany('INSERT INTO authtoken_token VALUES (%s, %s, %s)', [
+                ('a' * 40, legacy_user.pk, '2020-01-01 00:00:00'),
+                ('b' * 40, self.user.pk, '2020-01-01 00:00:00'),
+            ])
+        out = StringIO()
+        call_command('import_legacy_tokens', stdout=out)
+        self.assertIn('Imported 1 of 2 legacy token(s)', out.getvalue())
+        self.assertNotIn('authtoken_token', connection.introspection.table_names())
+
+        token = AuthToken.objects.get(user=legacy_user)
+        self.assertEqual(token.key, 'a' * 40)
+        self.assertAlmostEqual(token.expires_at, timezone.now() + settings.AUTH_TOKEN_LIFETIME, delta=timedelta(minutes=1))
+        self.assertEqual(AuthToken.objects.get(user=self.user).key, self.token.key)
+        response = self.client.get(reverse('users-me'), HTTP_AUTHORIZATION=f'Token {"a" * 40}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # A key logged out after the import stays gone
+        token.delete()
+        call_command('import_legacy_tokens', stdout=StringIO())
+        self.assertFalse(AuthToken.objects.filter(user=legacy_user).exists())
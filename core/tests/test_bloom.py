@@ -0,0 +1,163 @@
+import threading
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.bloom import BloomFilter, EmailFilter, email_filter
+from core.caches import check_shared_caches
+from core.models import User
+from core.provisioning import provision_users
+
+
+
+class BloomFilterTests(APITestCase):
+
+    def test_added_items_are_always_found(self):
+        bloom = BloomFilter(1000, 0.01)
+        items = [f'user{index}@example.com' for index in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+
+    def test_false_positive_rate_stays_near_target(self):
+        bloom = BloomFilter(5000, 0.01)
+        for index in range(5000):
+            bloom.add(f'user{index}@example.com')
+        probes = [f'{uuid.uuid4().hex}@example.invalid' for _ in range(20000)]
+        observed = sum(1 for probe in probes if probe in bloom) / len(probes)
+        self.assertLess(observed, 0.02)
+        self.assertAlmostEqual(bloom.expected_error_rate, 0.01, delta=0.005)
+
+
+
+@override_settings(EMAIL_FILTER_ENABLED=True)
+class EmailFilterTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        email_filter.filter = None
+        self.url = reverse('auth-check-email')
+        self.user = User.objects.create_user(email='Taken@Example.com', password='pass', role='applicant')
+
+
+    def test_unknown_email_is_answered_without_a_query(self):
+        """⚡ A filter miss answers "available" without touching the database."""
+        email_filter.rebuild()
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {'email': 'free@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'exists': False})
+
+
+    def test_existing_email_is_found_case_insensitively(self):
+        response = self.client.post(self.url, {'email': 'taken@EXAMPLE.COM'})
+        self.assertEqual(response.data, {'exists': True})
+
+
+    def test_signup_is_seen_by_a_filter_built_earlier(self):
+        email_filter.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email='new@example.com', password='pass', role='employer')
+        response = self.client.post(self.url, {'email': 'NEW@example.com'})
+        self.assertEqual(response.data, {'exists': True})
+
+
+    def test_signup_in_another_process_is_replayed(self):
+        """🔁 Another worker's filter picks up published signups from the shared cache."""
+        other = EmailFilter()
+        other.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email='elsewhere@example.com', password='pass', role='applicant')
+        with self.assertNumQueries(0):
+            self.assertTrue(other.might_exist('elsewhere@example.com'))
+
+
+    def test_email_change_is_published(self):
+        email_filter.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.email = 'renamed@example.com'
+            self.user.save()
+        self.assertTrue(email_filter.might_exist('renamed@example.com'))
+
+
+    def test_provisioned_users_are_found(self):
+        email_filter.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            provision_users([{'email': 'bulk1@example.com', 'password': 'pass'}, {'email': 'Bulk2@example.com', 'password': 'pass'}], workers=1)
+        self.assertTrue(email_filter.might_exist('bulk1@example.com'))
+        self.assertTrue(email_filter.might_exist('bulk2@example.com'))
+
+
+    def test_cleared_cache_forces_a_rebuild(self):
+        email_filter.rebuild()
+        stale = email_filter.filter
+        cache.clear()
+        self.assertTrue(email_filter.might_exist('taken@example.com'))
+        self.assertIsNot(email_filter.filter, stale)
+
+
+    def test_publishing_waits_for_the_commit(self):
+        """❌ An uncommitted signup isn't published, so a rebuild can't skip it."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.create_user(email='pending@example.com', password='pass', role='applicant')
+        self.assertIsNone(cache.get(EmailFilter.SEQUENCE_KEY))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cache.get(EmailFilter.SEQUENCE_KEY), 1)
+
+
+    def test_entry_not_written_yet_is_waited_for(self):
+        """⏳ A position claimed by a concurrent publisher doesn't trigger a full rebuild."""
+        other = EmailFilter()
+        other.rebuild()
+        filter_ = other.filter
+        cache.set(EmailFilter.SEQUENCE_KEY, 2, None)
+        cache.set(EmailFilter.ENTRY_KEY.format(1), ['first@example.com'], None)
+        self.assertTrue(other.might_exist('first@example.com'))
+        self.assertIs(other.filter, filter_)
+        self.assertEqual(other.position, 1)
+
+        cache.set(EmailFilter.ENTRY_KEY.format(2), ['second@example.com'], None)
+        self.assertTrue(other.might_exist('second@example.com'))
+        self.assertIs(other.filter, filter_)
+
+
+    def test_evicted_entries_force_a_rebuild(self):
+        other = EmailFilter()
+        other.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email='evicted@example.com', password='pass', role='applicant')
+        cache.delete(EmailFilter.ENTRY_KEY.format(cache.get(EmailFilter.SEQUENCE_KEY)))
+        with mock.patch.object(EmailFilter, 'GAP_TIMEOUT', 0):
+            self.assertTrue(other.might_exist('evicted@example.com'))
+
+
+    def test_filter_is_preloaded_in_the_background(self):
+        with mock.patch.object(email_filter, 'rebuild') as rebuild:
+            email_filter.preload()
+            for thread in threading.enumerate():
+                if thread.name == 'email-filter-preload':
+                    thread.join()
+        rebuild.assert_called_once_with()
+
+
+    @override_settings(EMAIL_FILTER_ENABLED=False)
+    def test_without_a_shared_cache_every_check_queries_the_database(self):
+        """❌ Signups in another worker can't reach a per-process filter, so none is used."""
+        # Per-process caches, as in these tests, leave the filter off
+        check_shared_caches()
+        email_filter.rebuild()
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {'email': 'unknown@example.com'})
+        self.assertEqual(response.data, {'exists': False})
+        with override_settings(EMAIL_FILTER_ENABLED=True):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'email availability filter'):
+                check_shared_caches()
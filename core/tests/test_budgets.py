@@ -0,0 +1,80 @@
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from core.models import User, EmployerProfile, ApplicantProfile
+from core.urls import router
+from core.budgets import Budget, QueryBudgetMixin, fingerprint
+from core.bloom import email_filter
+
+
+
+class CoreQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """Query budgets for every core ViewSet, checked against growing datasets."""
+
+    budgets = {
+        'users-list': Budget(1),
+        'users-detail': Budget(1),
+        'employer-profiles-list': Budget(1),
+        'employer-profiles-detail': Budget(1),
+        'applicant-profiles-list': Budget(1),
+        'applicant-profiles-detail': Budget(1),
+        'auth-check-email': Budget(1),
+    }
+    DATASET_SIZES = (2, 10)
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email='admin@test.com', password='pass', role='employer')
+        self.client.force_authenticate(user=self.admin)
+
+    def seed(self, size):
+        while EmployerProfile.objects.count() < size:
+            index = User.objects.count()
+            User.objects.create_user(email=f'employer{index}@test.com', password='pass', role='employer')
+            User.objects.create_user(email=f'applicant{index}@test.com', password='pass', role='applicant')
+
+    def detail_object(self, basename):
+        model = {'users': User, 'employer-profiles': EmployerProfile, 'applicant-profiles': ApplicantProfile}[basename]
+        return model.objects.order_by('pk').first()
+
+
+    def test_every_registered_viewset_declares_budgets(self):
+        for _, _, basename in router.registry:
+            self.assertIn(f'{basename}-list', self.budgets)
+            self.assertIn(f'{basename}-detail', self.budgets)
+
+
+    def test_endpoints_stay_within_budget_at_any_dataset_size(self):
+        for size in self.DATASET_SIZES:
+            self.seed(size)
+            for _, _, basename in router.registry:
+                with self.subTest(size=size, endpoint=f'{basename}-list'):
+                    self.assertWithinBudget(f'{basename}-list', reverse(f'{basename}-list'))
+                with self.subTest(size=size, endpoint=f'{basename}-detail'):
+                    url = reverse(f'{basename}-detail', kwargs={'pk': self.detail_object(basename).pk})
+                    self.assertWithinBudget(f'{basename}-detail', url)
+
+
+    @override_settings(EMAIL_FILTER_ENABLED=True)
+    def test_check_email_stays_within_budget(self):
+        self.client.force_authenticate(user=None)
+        # Budgets describe steady state; building the email filter is a one-off per process
+        email_filter.rebuild()
+        self.assertWithinBudget('auth-check-email', reverse('auth-check-email'), method='post', data={'email': 'x@test.com'})
+
+
+    def test_over_budget_fails_with_query_report(self):
+        """🚨 Exceeding a budget fails and lists the offending queries."""
+        self.seed(3)
+        self.budgets = dict(self.budgets, **{'users-list': Budget(0)})
+        with self.assertRaises(AssertionError) as context:
+            self.assertWithinBudget('users-list', reverse('users-list'))
+        self.assertIn('users-list is over budget', str(context.exception))
+
+
+    def test_fingerprint_normalizes_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'bob' AND x IN (1, 2, 3)"),
+            fingerprint("SELECT * FROM t  WHERE id = 7 AND name = 'al''ice' AND x IN (4)"),
+        )
@@ -0,0 +1,253 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import skipUnless
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from core.db.pool import ConnectionPool, PoolTimeout, get_pool, pooled_wrapper_class
+
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+        self.usable = True
+
+    def close(self):
+        self.closed = True
+
+
+
+class atomic_block:
+    """transaction.atomic() for a wrapper that isn't registered in `connections`."""
+
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+
+    def __enter__(self):
+        self.wrapper.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+        self.wrapper.in_atomic_block = True
+
+    def __exit__(self, *exc_info):
+        self.wrapper.in_atomic_block = False
+        self.wrapper.closed_in_transaction = False
+        self.wrapper.needs_rollback = False
+
+
+
+def database_settings(alias, **values):
+    """Complete DATABASES entry for a wrapper built outside `connections`."""
+    return ConnectionHandler({'default': {'ENGINE': 'django.db.backends.dummy'}, alias: values}).settings[alias]
+
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def check(self, connection):
+        return connection.usable
+
+
+    def test_reuses_released_connections(self):
+        pool = ConnectionPool(max_size=2)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(pool.stats()['acquired'], 2)
+
+
+    def test_times_out_when_exhausted(self):
+        """❌ With every connection checked out, acquire() gives up after `timeout`."""
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeout), self.assertLogs('core.db.pool', 'WARNING'):
+            pool.acquire(FakeConnection)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+        self.assertEqual(len(pool), 1)
+
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=2)
+        held = pool.acquire(FakeConnection)
+        threading.Timer(0.05, pool.release, args=(held,)).start()
+        self.assertIs(pool.acquire(FakeConnection), held)
+        stats = pool.stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreaterEqual(stats['max_wait_seconds'], 0.04)
+
+
+    def test_expired_connections_are_replaced(self):
+        pool = ConnectionPool(max_size=1, max_lifetime=0.01)
+        old = pool.acquire(FakeConnection)
+        time.sleep(0.02)
+        pool.release(old)
+        self.assertTrue(old.closed)
+        self.assertIsNot(pool.acquire(FakeConnection), old)
+
+
+    def test_broken_idle_connection_fails_health_check(self):
+        pool = ConnectionPool(max_size=1, check_interval=0)
+        broken = pool.acquire(FakeConnection, self.check)
+        pool.release(broken)
+        broken.usable = False
+        fresh = pool.acquire(FakeConnection, self.check)
+        self.assertIsNot(fresh, broken)
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.stats()['discarded'], 1)
+
+
+    def test_recently_used_connection_skips_health_check(self):
+        pool = ConnectionPool(max_size=1, check_interval=60)
+        connection = pool.acquire(FakeConnection, self.check)
+        pool.release(connection)
+        connection.usable = False
+        self.assertIs(pool.acquire(FakeConnection, self.check), connection)
+
+
+    def test_failed_connect_frees_its_slot(self):
+        def refuse():
+            raise OSError("connection refused")
+
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        with self.assertRaises(OSError):
+            pool.acquire(refuse)
+        self.assertEqual(len(pool), 0)
+        self.assertIsInstance(pool.acquire(FakeConnection), FakeConnection)
+
+
+    def test_unreusable_connection_is_closed(self):
+        pool = ConnectionPool(max_size=1)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection, reusable=False)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+
+class PooledWrapperTestsMixin:
+    """Pooling through a real backend's DatabaseWrapper, shared by the stand-in and MySQL runs."""
+    pool_options = {'max_size': 2, 'timeout': 0.1}
+
+    def make_wrapper(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.wrappers = []
+        wrapper = self.make_wrapper()
+        with wrapper.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS pool_probe')
+            cursor.execute('CREATE TABLE pool_probe (id INTEGER PRIMARY KEY)')
+        wrapper.close()
+
+    def tearDown(self):
+        for wrapper in self.wrappers:
+            if wrapper.connection is not None:
+                wrapper.in_atomic_block = False
+                wrapper.close()
+        wrapper = self.make_wrapper()
+        with wrapper.cursor() as cursor:
+            cursor.execute('DROP TABLE pool_probe')
+        wrapper.close()
+        wrapper.pool.close()
+
+    def wrapper(self):
+        wrapper = self.make_wrapper()
+        self.wrappers.append(wrapper)
+        return wrapper
+
+    def count_rows(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM pool_probe')
+            return cursor.fetchone()[0]
+
+
+    def test_close_returns_connection_to_pool(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        self.assertIsNone(wrapper.connection)
+        other = self.wrapper()
+        other.ensure_connection()
+        self.assertIs(other.connection, raw)
+
+
+    def test_uncommitted_work_is_rolled_back_on_release(self):
+        wrapper = self.wrapper()
+        wrapper.set_autocommit(False)
+        with wrapper.cursor() as cursor:
+            cursor.execute('INSERT INTO pool_probe (id) VALUES (1)')
+        wrapper.close()
+        self.assertEqual(self.count_rows(self.wrapper()), 0)
+
+
+    def test_connection_closed_inside_atomic_block_is_discarded(self):
+        wrapper = self.wrapper()
+        with self.assertRaises(RuntimeError):
+            with atomic_block(wrapper):
+                raw = wrapper.connection
+                wrapper.close()
+                raise RuntimeError
+        other = self.wrapper()
+        other.ensure_connection()
+        self.assertIsNot(other.connection, raw)
+
+
+    def test_pool_is_bounded(self):
+        """❌ A third concurrent connection waits, then fails with PoolTimeout."""
+        for _ in range(2):
+            self.wrapper().ensure_connection()
+        with self.assertRaises(PoolTimeout), self.assertLogs('core.db.pool', 'WARNING'):
+            self.wrapper().ensure_connection()
+
+
+
+class SQLiteStandInPoolTests(PooledWrapperTestsMixin, SimpleTestCase):
+    """Runs everywhere: SQLite on a temporary file stands in for MySQL."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        self.settings_dict = database_settings(
+            'pool-standin', ENGINE='django.db.backends.sqlite3', NAME=self.path,
+            CONN_HEALTH_CHECKS=True, OPTIONS={'pool': self.pool_options},
+        )
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
+
+    def make_wrapper(self):
+        return pooled_wrapper_class(SQLiteDatabaseWrapper)(self.settings_dict, 'pool-standin')
+
+
+    def test_pool_settings_come_from_options(self):
+        pool = get_pool('pool-standin', self.settings_dict)
+        self.assertEqual((pool.max_size, pool.timeout), (2, 0.1))
+        self.assertNotIn('pool', self.make_wrapper().get_connection_params())
+
+
+
+@skipUnless(os.getenv('DB_POOL_TEST_HOST'), "set DB_POOL_TEST_HOST (and DB_POOL_TEST_NAME/USER/PASSWORD) to test against MySQL")
+class MySQLPoolTests(PooledWrapperTestsMixin, SimpleTestCase):
+    """The mysql_pool backend against a local MySQL."""
+
+    def setUp(self):
+        self.settings_dict = database_settings(
+            'pool-mysql', ENGINE='core.db.backends.mysql_pool',
+            HOST=os.getenv('DB_POOL_TEST_HOST'), PORT=os.getenv('DB_POOL_TEST_PORT', '3306'),
+            NAME=os.getenv('DB_POOL_TEST_NAME', 'test_jobboard'),
+            USER=os.getenv('DB_POOL_TEST_USER', 'root'), PASSWORD=os.getenv('DB_POOL_TEST_PASSWORD', ''),
+            CONN_HEALTH_CHECKS=True, OPTIONS={'pool': self.pool_options},
+        )
+        super().setUp()
+
+    def make_wrapper(self):
+        from core.db.backends.mysql_pool.base import DatabaseWrapper
+        return DatabaseWrapper(self.settings_dict, 'pool-mysql')
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from core.authentication import ClaimsJWTAuthentication, denylist
+from core.models import User, RevokedAccessToken
+from core.serializers import DenylistTokenRefreshSerializer
+from core.views import JWTRevokeView
+
+
+
+def token_expiry(token):
+    return datetime.fromtimestamp(token['exp'], timezone.utc)
+
+
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='emp@test.com', password='pass1234!', role='employer', first_name='Ada'
+        )
+        response = TokenObtainPairView.as_view()(
+            self.factory.post('/', {'email': 'emp@test.com', 'password': 'pass1234!'}, format='json')
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.access, self.refresh = response.data['access'], response.data['refresh']
+        denylist.refresh()
+
+
+    def authenticate(self, access=None):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access or self.access}')
+        return ClaimsJWTAuthentication().authenticate(request)
+
+
+    def test_user_is_built_from_claims_without_queries(self):
+        """✅ Role checks are answered from the token alone."""
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+            self.assertEqual((user.pk, user.role, user.is_staff, user.email), (self.user.pk, 'employer', False, 'emp@test.com'))
+        self.assertEqual(token['role'], 'employer')
+
+        # Anything not carried in the token is loaded on first access
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(user.first_name, 'Ada')
+        self.assertEqual(len(context.captured_queries), 1)
+
+
+    def test_revoked_tokens_are_rejected(self):
+        """❌ Revoking through the API denies both the access and the refresh token."""
+        request = self.factory.post(
+            '/', {'refresh': self.refresh}, format='json', HTTP_AUTHORIZATION=f'Bearer {self.access}'
+        )
+        self.assertEqual(JWTRevokeView.as_view()(request).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(RevokedAccessToken.objects.count(), 2)
+
+        with self.assertRaises(InvalidToken):
+            self.authenticate()
+        with self.assertRaises(AuthenticationFailed):
+            DenylistTokenRefreshSerializer(data={'refresh': self.refresh}).is_valid()
+
+
+    def test_denylist_is_shared_through_the_database(self):
+        """✅ Another process picks the revocation up on its next periodic refresh."""
+        _, token = self.authenticate()
+        RevokedAccessToken.objects.create(jti=token['jti'], user=self.user, expires_at=token_expiry(token))
+        self.authenticate()  # Not refreshed yet
+        denylist.refresh()
+        with self.assertRaises(InvalidToken):
+            self.authenticate()
+
+
+    @override_settings(JWT_AUTH_ENABLED=True)
+    def test_role_change_revokes_issued_tokens(self):
+        self.user.role = 'applicant'
+        self.user.save()
+        with self.assertRaises(InvalidToken):
+            self.authenticate()
+        with self.assertRaises(AuthenticationFailed):
+            DenylistTokenRefreshSerializer(data={'refresh': self.refresh}).is_valid()
+
+
+    @override_settings(JWT_AUTH_ENABLED=True)
+    def test_unrelated_updates_keep_tokens_valid(self):
+        self.user.first_name = 'Grace'
+        self.user.save()
+        self.assertEqual(self.authenticate()[0].pk, self.user.pk)
+
+
+    def test_refresh_reads_current_claims(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        serializer = DenylistTokenRefreshSerializer(data={'refresh': self.refresh})
+        self.assertTrue(serializer.is_valid())
+        self.assertTrue(self.authenticate(serializer.validated_data['access'])[0].is_staff)
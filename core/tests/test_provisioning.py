@@ -0,0 +1,119 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User, EmployerProfile, ApplicantProfile
+from core.provisioning import hash_passwords, provision_users, users_provisioned
+from core.serializers import BulkProvisionSerializer
+
+
+
+class ProvisionUsersTests(TestCase):
+
+    def rows(self, count, **extra):
+        return [dict({'email': f'student{index}@uni.edu', 'password': f'secret-{index}'}, **extra) for index in range(count)]
+
+
+    def test_users_and_profiles_are_bulk_created(self):
+        """✅ A fixed number of queries per batch, with a profile for every user."""
+        rows = self.rows(5) + [{'email': 'recruiter@uni.edu', 'password': 'x', 'role': 'employer'}]
+        # existing-email check + per batch: savepoint, users, ids, two profile inserts, search grams, release
+        with self.assertNumQueries(8):
+            report = provision_users(rows, batch_size=10, workers=1)
+
+        self.assertEqual((report.requested, report.created), (6, 6))
+        self.assertEqual(ApplicantProfile.objects.count(), 5)
+        self.assertEqual(EmployerProfile.objects.get().user.email, 'recruiter@uni.edu')
+        self.assertTrue(User.objects.get(email='student3@uni.edu').check_password('secret-3'))
+
+
+    def test_existing_and_repeated_emails_are_skipped(self):
+        User.objects.create_user(email='Student0@uni.edu', password='pass', role='applicant')
+        rows = self.rows(3) + [{'email': 'STUDENT1@uni.edu', 'password': 'x'}]
+        report = provision_users(rows, workers=1)
+        self.assertEqual(report.created, 2)
+        self.assertEqual(sorted(report.skipped), ['STUDENT1@uni.edu', 'student0@uni.edu'])
+
+
+    def test_each_batch_is_announced(self):
+        batches = []
+        handler = lambda sender, users, **kwargs: batches.append([user.pk for user in users])
+        users_provisioned.connect(handler)
+        self.addCleanup(users_provisioned.disconnect, handler)
+
+        provision_users(self.rows(5), batch_size=2, workers=1)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(sorted(sum(batches, [])), sorted(User.objects.values_list('pk', flat=True)))
+
+
+    def test_passwords_are_hashed_across_processes(self):
+        hashes = hash_passwords([f'secret-{index}' for index in range(8)], workers=2, chunksize=2)
+        user = User(email='x@uni.edu')
+        for index, hashed in enumerate(hashes):
+            user.password = hashed
+            self.assertTrue(user.check_password(f'secret-{index}'))
+
+
+    def test_command_reports_throughput(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write('email,password,first_name\na@uni.edu,pw,Ada\nb@uni.edu,pw,Bob\n')
+        self.addCleanup(os.remove, csv_file.name)
+
+        out = StringIO()
+        call_command('provision_users', csv_file.name, '--workers', '1', stdout=out)
+        self.assertIn('Created 2 of 2 user(s)', out.getvalue())
+        self.assertIn('users/s', out.getvalue())
+        self.assertEqual(User.objects.get(email='a@uni.edu').first_name, 'Ada')
+
+
+
+class BulkProvisionViewTests(APITestCase):
+
+    def setUp(self):
+        self.url = reverse('users-bulk')
+        self.admin = User.objects.create_user(email='admin@test.com', password='pass', role='employer', is_staff=True)
+
+
+    def test_admin_can_provision_users(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.url, {
+            'role': 'applicant',
+            'users': [{'email': 'new@uni.edu', 'password': 'secret'}, {'email': 'bad', 'password': 'x'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {
+            'users': [{'email': 'new@uni.edu', 'password': 'secret'}, {'email': 'admin@test.com', 'password': 'x'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['skipped'], ['admin@test.com'])
+        self.assertTrue(ApplicantProfile.objects.filter(user__email='new@uni.edu').exists())
+
+
+    def test_requests_are_capped_and_hashed_inline(self):
+        self.client.force_authenticate(user=self.admin)
+        users = [{'email': f'student{index}@uni.edu', 'password': 'secret'} for index in range(BulkProvisionSerializer.MAX_USERS + 1)]
+        response = self.client.post(self.url, {'users': users}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('provision_users', str(response.data['users']))
+
+        with mock.patch('core.provisioning.ProcessPoolExecutor') as pool:
+            response = self.client.post(self.url, {'users': users[:-1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], BulkProvisionSerializer.MAX_USERS)
+        pool.assert_not_called()
+
+
+    def test_non_admin_cannot_provision(self):
+        self.client.force_authenticate(user=User.objects.create_user(email='u@test.com', password='pass', role='applicant'))
+        response = self.client.post(self.url, {'users': [{'email': 'new@uni.edu', 'password': 'x'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
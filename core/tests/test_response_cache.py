@@ -0,0 +1,198 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, include
+
+from rest_framework.test import APIClient
+
+from core import response_cache
+from core.caches import check_shared_caches
+from core.asynchronous import async_urlpatterns
+from core.models import User, AuthToken
+from core.response_cache import TAG_KEY, get_cache, response_cache_stats
+from recruitment.models import Job, Category, Tag
+from recruitment.urls import router
+from recruitment.views.asynchronous import async_read_views
+
+
+# Routes as mounted under SERVER_MODE = 'asgi', for the async test
+urlpatterns = [
+    path('api/recruitment/', include(async_urlpatterns(router.urls, async_read_views))),
+]
+
+
+
+@override_settings(RESPONSE_CACHE_TTL=300)
+class AnonymousResponseCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(email='employer@example.com', password='pass', role='employer')
+        cls.category = Category.objects.create(name='Engineering')
+        cls.other_category = Category.objects.create(name='Design')
+        cls.tag = Tag.objects.create(name='python')
+        cls.job = cls.create_job('Backend Developer', cls.category)
+        cls.job.tags.set([cls.tag])
+        cls.other_job = cls.create_job('Designer', cls.other_category)
+
+    @classmethod
+    def create_job(cls, title, category):
+        return Job.objects.create(
+            employer=cls.employer, title=title, description='-', location='Remote',
+            job_type='full_time', experience_level='junior', category=category,
+        )
+
+    def setUp(self):
+        get_cache().clear()
+        response_cache.stats.reset()
+        self.client = APIClient()
+
+    def assertCached(self, url, **extra):
+        """The response for `url` is served without touching the database."""
+        with self.assertNumQueries(0):
+            response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertNotCached(self, url, **extra):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, **extra)
+        self.assertTrue(queries, f'{url} was served from the cache')
+        return response
+
+    def job_url(self, job):
+        return f'/api/recruitment/jobs/{job.pk}/'
+
+
+    def test_public_reads_are_cached(self):
+        """✅ Repeated anonymous reads of categories, tags and jobs skip the database."""
+        for url in ('/api/recruitment/categories/', '/api/recruitment/tags/', '/api/recruitment/jobs/', self.job_url(self.job)):
+            first = self.client.get(url)
+            self.assertEqual(self.assertCached(url).content, first.content)
+
+
+    def test_query_parameter_order_is_normalized(self):
+        self.client.get('/api/recruitment/jobs/?b=2&a=1')
+        self.assertCached('/api/recruitment/jobs/?a=1&b=2')
+        self.assertNotCached('/api/recruitment/jobs/?a=1')
+
+
+    def test_authenticated_and_private_requests_bypass_the_cache(self):
+        """❌ Credentials, and endpoints that need them, are never answered from the cache."""
+        self.client.get('/api/recruitment/categories/')
+        token = AuthToken.objects.create(user=self.employer)
+        self.assertNotCached('/api/recruitment/categories/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/recruitment/applications/').status_code, 401)
+        stats = response_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores']), (0, 1, 1))
+
+
+    def test_job_update_invalidates_only_its_entries(self):
+        """✅ Editing a job recomputes its detail and the list, not other jobs."""
+        for url in ('/api/recruitment/jobs/', self.job_url(self.job), self.job_url(self.other_job)):
+            self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Senior Backend Developer'
+            self.job.save()
+        self.assertEqual(self.assertNotCached(self.job_url(self.job)).json()['title'], 'Senior Backend Developer')
+        self.assertNotCached('/api/recruitment/jobs/')
+        self.assertCached(self.job_url(self.other_job))
+
+
+    def test_new_job_invalidates_job_lists(self):
+        self.client.get('/api/recruitment/jobs/')
+        self.client.get(self.job_url(self.job))
+        new_job = self.create_job('Data Engineer', self.category)
+        self.assertIn(new_job.pk, [job['id'] for job in self.assertNotCached('/api/recruitment/jobs/').json()])
+        self.assertCached(self.job_url(self.job))
+
+
+    def test_category_rename_invalidates_jobs_showing_it(self):
+        for url in ('/api/recruitment/categories/', self.job_url(self.job), self.job_url(self.other_job)):
+            self.client.get(url)
+        self.category.name = 'Software Engineering'
+        self.category.save()
+        self.assertNotCached('/api/recruitment/categories/')
+        self.assertEqual(self.assertNotCached(self.job_url(self.job)).json()['category']['name'], 'Software Engineering')
+        self.assertCached(self.job_url(self.other_job))
+
+
+    def test_tag_changes_invalidate_tagged_jobs(self):
+        self.client.get(self.job_url(self.job))
+        self.client.get(self.job_url(self.other_job))
+        self.other_job.tags.add(self.tag)
+        self.assertNotCached(self.job_url(self.other_job))
+        self.tag.name = 'python3'
+        self.tag.save()
+        self.assertEqual(self.assertNotCached(self.job_url(self.job)).json()['tags'][0]['name'], 'python3')
+
+
+    def test_employer_email_change_invalidates_their_jobs(self):
+        self.client.get(self.job_url(self.job))
+        self.employer.last_name = 'Smith'
+        self.employer.save()
+        self.assertCached(self.job_url(self.job))
+        self.employer.email = 'hiring@example.com'
+        self.employer.save()
+        self.assertEqual(self.assertNotCached(self.job_url(self.job)).json()['employer_email'], 'hiring@example.com')
+
+
+    def test_response_older_than_a_write_is_not_stored(self):
+        """❌ A response rendered before a concurrent write's invalidation isn't cached."""
+        get_cache().set(TAG_KEY.format(f'recruitment.job:{self.job.pk}'), 2 ** 40, None)
+        self.client.get(self.job_url(self.job))
+        self.assertNotCached(self.job_url(self.job))
+
+
+    @override_settings(RESPONSE_CACHE_MODELS=['recruitment.job', 'recruitment.category', 'recruitment.tag'])
+    def test_responses_reading_untracked_models_are_not_stored(self):
+        self.client.get(self.job_url(self.job))
+        self.assertNotCached(self.job_url(self.job))
+        self.client.get('/api/recruitment/categories/')
+        self.assertCached('/api/recruitment/categories/')
+
+
+    def test_stats_report_hit_ratio_and_memory(self):
+        self.client.get('/api/recruitment/categories/')
+        for _ in range(3):
+            self.client.get('/api/recruitment/categories/')
+        stats = response_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores']), (3, 1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.75)
+        self.assertEqual(stats['entries'], 1)
+        self.assertGreater(stats['memory_bytes'], stats['stored_bytes'] // 2)
+
+
+    @override_settings(ROOT_URLCONF=__name__)
+    async def test_async_views_are_cached(self):
+        url = self.job_url(self.job)
+        first = await self.async_client.get(url)
+        second = await self.async_client.get(url)
+        self.assertEqual(json.loads(second.content), json.loads(first.content))
+        stats = await sync_to_async(response_cache_stats)()
+        self.assertEqual((stats['hits'], stats['stores']), (1, 1))
+
+
+
+class ResponseCacheConfigurationTests(TestCase):
+
+    def test_cache_is_off_unless_its_backend_is_shared(self):
+        """❌ Invalidation tags in per-process memory would keep other workers serving stale responses."""
+        # Per-process caches, as in these tests, leave the response cache off
+        self.assertEqual(settings.RESPONSE_CACHE_TTL, 0)
+        check_shared_caches()
+        with override_settings(RESPONSE_CACHE_TTL=300):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'response cache'):
+                check_shared_caches()
+            shared = {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'responses': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'responses'},
+            }
+            with override_settings(CACHES=shared):
+                check_shared_caches()
@@ -0,0 +1,175 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+
+from core.caches import check_shared_caches
+from core.db import routers
+from core.db.routers import ReplicaRouter, ReplicaPinningMiddleware, RequestRouting, is_primary, monitor
+from core.models import User
+from recruitment.models import Job, Category, Application
+
+
+LAGS = {}
+PROBES = []
+
+
+def fake_lag(alias):
+    PROBES.append(alias)
+    return LAGS.get(alias, 0)
+
+
+def replicas(**overrides):
+    return override_settings(**{
+        'DATABASE_REPLICAS': ['replica1', 'replica2'],
+        'REPLICA_LAG_PROBE': 'core.tests.test_routers.fake_lag',
+        'REPLICA_MAX_LAG_SECONDS': 2,
+        'REPLICA_LAG_CHECK_INTERVAL': 60,
+        **overrides,
+    })
+
+
+
+@replicas()
+class ReplicaRouterTests(TestCase):
+
+    def setUp(self):
+        LAGS.clear()
+        PROBES.clear()
+        monitor.reset()
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        # The replica aliases are only names here; nothing connects to them
+        patcher = mock.patch('core.db.routers.is_primary', return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_in(self, request, model=Job):
+        token = routers._routing.set(RequestRouting(request))
+        try:
+            return self.router.db_for_read(model)
+        finally:
+            routers._routing.reset(token)
+
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Job), 'default')
+
+
+    def test_safe_reads_of_listed_models_use_a_replica(self):
+        """✅ Job/Category/Tag reads in a GET go to a replica; other models stay on the primary."""
+        request = self.factory.get('/')
+        self.assertIn(self.read_in(request), {'replica1', 'replica2'})
+        self.assertIn(self.read_in(request, Category), {'replica1', 'replica2'})
+        self.assertEqual(self.read_in(request, Application), 'default')
+        self.assertEqual(self.read_in(request, User), 'default')
+
+
+    def test_one_replica_per_request(self):
+        routing = RequestRouting(self.factory.get('/'))
+        self.assertEqual(len({routing.replica() for _ in range(20)}), 1)
+
+
+    def test_writes_and_unsafe_requests_use_primary(self):
+        self.assertEqual(self.read_in(self.factory.post('/')), 'default')
+        self.assertEqual(self.router.db_for_write(Job), 'default')
+
+
+    def test_lagging_replicas_are_excluded(self):
+        """❌ A replica over the lag limit, or with broken replication, gets no reads."""
+        LAGS.update(replica1=30, replica2=None)
+        self.assertEqual(self.read_in(self.factory.get('/')), 'default')
+        monitor.reset()
+        LAGS.update(replica2=1)
+        self.assertEqual({self.read_in(self.factory.get('/')) for _ in range(10)}, {'replica2'})
+
+
+    def test_lag_is_probed_once_per_interval(self):
+        for _ in range(5):
+            self.read_in(self.factory.get('/'))
+        self.assertEqual(sorted(PROBES), ['replica1', 'replica2'])
+        with replicas(REPLICA_LAG_CHECK_INTERVAL=0):
+            self.read_in(self.factory.get('/'))
+        self.assertEqual(len(PROBES), 4)
+
+
+    def test_pin_cookie_keeps_reads_on_primary(self):
+        request = self.factory.get('/', HTTP_COOKIE=f'{routers.PIN_COOKIE}=1')
+        self.assertEqual(self.read_in(request), 'default')
+
+
+    def test_pinned_user_reads_from_primary(self):
+        user = User.objects.create_user(email='pinned@example.com', password='x', role='employer')
+        request = self.factory.get('/')
+        request.user = user
+        cache.set(routers.PIN_KEY.format(user.pk), 1, 10)
+        self.assertEqual(self.read_in(request), 'default')
+
+
+    def test_alias_pointing_at_primary_is_not_a_replica(self):
+        """Replicas mirroring `default` in the test suite would miss data in open test transactions."""
+        self.assertTrue(is_primary('default'))
+        with mock.patch('core.db.routers.is_primary', side_effect=lambda alias: alias == 'replica1'):
+            self.assertEqual({self.read_in(self.factory.get('/')) for _ in range(10)}, {'replica2'})
+
+
+    def test_replicas_require_a_shared_pin_store(self):
+        """❌ Pins kept in per-process memory would send a worker's writes to other workers' replicas."""
+        with self.assertRaisesMessage(ImproperlyConfigured, 'Read-your-writes'):
+            check_shared_caches()
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}}
+        with override_settings(CACHES=shared):
+            check_shared_caches()
+        with override_settings(DATABASE_REPLICAS=[]):
+            check_shared_caches()
+
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica1', 'recruitment'))
+        self.assertIsNone(self.router.allow_migrate('default', 'recruitment'))
+
+
+
+@replicas(REPLICA_PIN_SECONDS=10)
+class ReplicaPinningMiddlewareTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(email='employer@example.com', password='x', role='employer')
+
+    def respond(self, request, status=201):
+        return ReplicaPinningMiddleware(lambda request: HttpResponse(status=status))(request)
+
+
+    def test_successful_write_pins_client_and_user(self):
+        """✅ After posting, the employer's next reads go to the primary."""
+        request = self.factory.post('/')
+        request.user = self.user
+        response = self.respond(request)
+        self.assertEqual(response.cookies[routers.PIN_COOKIE]['max-age'], 10)
+        self.assertTrue(cache.get(routers.PIN_KEY.format(self.user.pk)))
+
+
+    def test_failed_write_and_reads_do_not_pin(self):
+        request = self.factory.post('/')
+        request.user = self.user
+        self.assertNotIn(routers.PIN_COOKIE, self.respond(request, status=400).cookies)
+        self.assertNotIn(routers.PIN_COOKIE, self.respond(self.factory.get('/'), status=200).cookies)
+        self.assertIsNone(cache.get(routers.PIN_KEY.format(self.user.pk)))
+
+
+    def test_routing_is_scoped_to_the_request(self):
+        seen = []
+
+        def view(request):
+            seen.append(routers._routing.get())
+            return HttpResponse()
+
+        ReplicaPinningMiddleware(view)(self.factory.get('/'))
+        self.assertIsInstance(seen[0], RequestRouting)
+        self.assertIsNone(routers._routing.get())
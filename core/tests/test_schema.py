@@ -0,0 +1,131 @@
+import gzip
+import json
+import logging
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core import schema
+from core.asynchronous import async_urlpatterns
+from recruitment.urls import router
+from recruitment.views.asynchronous import async_read_views, offloaded_views
+
+
+class SchemaTestsMixin:
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        overrides = override_settings(SCHEMA_CACHE_DIR=self.directory, CODE_VERSION='test')
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.reset()
+        self.addCleanup(self.reset)
+        # Viewsets reading request.user in get_queryset() log a warning during generation
+        patcher = mock.patch.object(logging.getLogger('drf_yasg.inspectors.base'), 'disabled', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def reset(self):
+        schema.schema_version.cache_clear()
+        schema._documents.clear()
+
+
+
+class SchemaFileTests(SchemaTestsMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.generated = []
+        generate = schema.generate_schema
+
+        def counting(version=None):
+            self.generated.append(version)
+            return generate(version)
+
+        patcher = mock.patch('core.schema.generate_schema', side_effect=counting)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+    def test_schema_is_generated_once_and_reused(self):
+        """✅ The first request writes the file; later requests are served from it."""
+        for _ in range(3):
+            response = self.client.get('/swagger.json')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.generated), 1)
+        self.assertIn('/recruitment/jobs/', json.loads(response.content)['paths'])
+        self.assertTrue(schema.schema_path('json').exists())
+
+
+    def test_new_code_version_regenerates(self):
+        self.client.get('/swagger.json')
+        with override_settings(CODE_VERSION='next'):
+            schema.schema_version.cache_clear()
+            self.client.get('/swagger.json')
+        self.assertEqual(len(self.generated), 2)
+
+
+    def test_conditional_request_is_not_modified(self):
+        etag = self.client.get('/swagger.json')['ETag']
+        response = self.client.get('/swagger.json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/swagger.json', HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+
+    def test_gzip_clients_get_the_precompressed_copy(self):
+        response = self.client.get('/swagger.json', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('max-age=', response['Cache-Control'])
+        plain = self.client.get('/swagger.json')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+
+    def test_yaml_format(self):
+        response = self.client.get('/swagger.yaml')
+        self.assertEqual(response['Content-Type'], 'application/yaml')
+        self.assertIn(b'/recruitment/jobs/', response.content)
+
+
+    def test_unsafe_methods_are_rejected(self):
+        self.assertEqual(self.client.post('/swagger.json').status_code, 405)
+
+
+    def test_pages_load_the_cached_schema(self):
+        from drf_yasg.generators import OpenAPISchemaGenerator
+
+        with mock.patch.object(OpenAPISchemaGenerator, 'get_schema') as get_schema:
+            for url in ('/swagger/', '/redoc/', '/swagger/'):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Job Board API')
+        get_schema.assert_not_called()
+        self.assertEqual(self.generated, [])
+
+
+
+class GenerateSchemaCommandTests(SchemaTestsMixin, SimpleTestCase):
+
+    def test_writes_every_format_once(self):
+        call_command('generate_schema', stdout=mock.Mock())
+        for fmt in schema.FORMATS:
+            path = schema.schema_path(fmt)
+            self.assertTrue(path.exists())
+            self.assertTrue(path.with_name(path.name + '.gz').exists())
+        with mock.patch('core.schema.generate_schema') as generate:
+            call_command('generate_schema', stdout=mock.Mock())
+        generate.assert_not_called()
+
+
+    def test_async_routes_keep_their_viewsets(self):
+        """Schema generation under ASGI still sees the viewsets behind async-routed URLs."""
+        patterns = async_urlpatterns(router.urls, async_read_views, offloaded=offloaded_views)
+        routed = [pattern for pattern in patterns if pattern.name in {*async_read_views, *offloaded_views}]
+        self.assertTrue(routed)
+        for pattern in routed:
+            self.assertTrue(hasattr(pattern.callback, 'cls'))
@@ -0,0 +1,112 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from core.models import User, UserSearchGram
+from core.provisioning import provision_users
+from core.search import search_users, term_grams, user_grams
+
+
+
+class UserGramTests(TestCase):
+
+    def test_grams_cover_trigrams_and_word_prefixes(self):
+        grams = user_grams(User(email='Jo.Smith@example.com', first_name='Jo', last_name=''))
+        self.assertTrue({'jo.', 'o.s', 'smi', '^j', '^jo', '^s', '^sm', '^e'} <= grams)
+        self.assertEqual(term_grams('SMIT'), {'smi', 'mit'})
+        self.assertEqual(term_grams('Sm'), {'^sm'})
+
+
+    def test_grams_follow_saves_and_deletes(self):
+        user = User.objects.create_user(email='alice@example.com', password='pass', role='applicant')
+        self.assertIn('ali', set(user.search_grams.values_list('gram', flat=True)))
+
+        user.last_name = 'Zephyr'
+        user.save()
+        self.assertIn('zep', set(user.search_grams.values_list('gram', flat=True)))
+
+        user.email = 'bob@example.com'
+        user.save()
+        grams = set(user.search_grams.values_list('gram', flat=True))
+        self.assertNotIn('ali', grams)
+        self.assertIn('bob', grams)
+
+        user.delete()
+        self.assertFalse(UserSearchGram.objects.exists())
+
+
+    def test_unrelated_saves_leave_grams_alone(self):
+        user = User.objects.create_user(email='alice@example.com', password='pass', role='applicant')
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+
+
+class SearchUsersTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(email='alice.w@example.com', password='p', role='applicant', first_name='Alice', last_name='Wong')
+        self.bob = User.objects.create_user(email='bob@corp.test', password='p', role='employer', first_name='Bob', last_name='Alison')
+        self.scattered = User.objects.create_user(email='abcxbcd@example.com', password='p', role='applicant')
+
+    def search(self, *terms):
+        return set(search_users(User.objects.all(), terms))
+
+
+    def test_substring_matches_any_field_case_insensitively(self):
+        self.assertEqual(self.search('ALI'), {self.alice, self.bob})
+        self.assertEqual(self.search('corp.t'), {self.bob})
+
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('ali', 'wong'), {self.alice})
+
+
+    def test_short_terms_match_word_prefixes(self):
+        self.assertEqual(self.search('wo'), {self.alice})
+        self.assertEqual(self.search('b'), {self.bob})
+
+
+    def test_scattered_trigrams_are_not_a_match(self):
+        """🔍 Holding 'abc' and 'bcd' doesn't make a user match 'abcd'."""
+        self.assertEqual(self.search('abcd'), set())
+        self.assertEqual(self.search('bcd'), {self.scattered})
+
+
+    def test_provisioned_users_are_indexed(self):
+        provision_users([{'email': 'zed.quinn@example.com', 'password': 'p', 'first_name': 'Zed'}], workers=1)
+        self.assertEqual({user.email for user in self.search('quinn')}, {'zed.quinn@example.com'})
+
+
+    def test_rebuild_command_restores_the_index(self):
+        UserSearchGram.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_user_search_index', '--batch-size', '2', stdout=out)
+        self.assertIn('Indexed 3 user(s).', out.getvalue())
+        self.assertEqual(self.search('wong'), {self.alice})
+
+
+
+class UserSearchEndpointTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email='admin@test.com', password='pass', role='employer')
+        User.objects.create_user(email='carol@example.com', password='p', role='applicant', first_name='Carol')
+        User.objects.create_user(email='dave@example.com', password='p', role='applicant', first_name='Dave')
+
+
+    def test_api_search_uses_the_index(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('users-list') + '?search=aro')
+        self.assertEqual([user['email'] for user in response.data], ['carol@example.com'])
+
+
+    def test_admin_changelist_search_uses_the_index(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin:core_user_changelist'), {'q': '"dav"'})
+        self.assertContains(response, 'dave@example.com')
+        self.assertNotContains(response, 'carol@example.com')
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.caches import check_shared_caches
+from core.models import User
+from core.sessions import LocalSessions, SessionStore, local_sessions, write_buffer
+
+
+
+@override_settings(SESSION_WRITE_BEHIND_SECONDS=60, SESSION_WRITE_BEHIND_BATCH=100)
+class SessionStoreTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_sessions.clear()
+        write_buffer.pending.clear()
+        self.addCleanup(write_buffer.pending.clear)
+        self.session = SessionStore()
+        self.session['theme'] = 'dark'
+        self.session.create()
+
+    def stored(self, session_key):
+        return SessionStore().decode(Session.objects.get(session_key=session_key).session_data)
+
+
+    def test_new_sessions_are_written_through(self):
+        self.assertEqual(self.stored(self.session.session_key), {'theme': 'dark'})
+
+
+    def test_repeated_updates_coalesce_into_one_write(self):
+        """✍️ Updates are buffered and flushed as a single upsert with the latest data."""
+        for page in range(3):
+            session = SessionStore(self.session.session_key)
+            session['page'] = page
+            with self.assertNumQueries(0):
+                session.save()
+        self.assertEqual(self.stored(self.session.session_key), {'theme': 'dark'})
+        self.assertEqual(SessionStore(self.session.session_key)['page'], 2)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(write_buffer.flush(), 1)
+        self.assertEqual(self.stored(self.session.session_key), {'theme': 'dark', 'page': 2})
+
+
+    def test_reads_are_served_from_the_local_tier(self):
+        cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(self.session.session_key)['theme'], 'dark')
+
+
+    def test_cached_copies_are_not_shared_between_requests(self):
+        first = SessionStore(self.session.session_key)
+        first['theme'] = 'light'
+        self.assertEqual(SessionStore(self.session.session_key)['theme'], 'dark')
+
+
+    def test_login_changes_are_written_through(self):
+        user = User.objects.create_user(email='admin@test.com', password='pass', role='employer', is_staff=True)
+        self.client.force_login(user)
+        session_key = self.client.session.session_key
+        self.assertEqual(self.stored(session_key)['_auth_user_id'], str(user.pk))
+        self.assertFalse(write_buffer.pending)
+
+
+    def test_deleted_sessions_are_not_resurrected(self):
+        session = SessionStore(self.session.session_key)
+        session['page'] = 1
+        session.save()
+        SessionStore(self.session.session_key).delete()
+        self.assertEqual(write_buffer.flush(), 0)
+        self.assertFalse(Session.objects.filter(session_key=self.session.session_key).exists())
+
+
+    def test_sessions_deleted_by_another_process_are_dropped_locally(self):
+        """🚪 A logout handled by another worker ends the session here too, not after the local TTL."""
+        self.assertEqual(SessionStore(self.session.session_key)['theme'], 'dark')
+        other = SessionStore()
+        other['theme'] = 'light'
+        other.create()
+        self.assertEqual(SessionStore(other.session_key)['theme'], 'light')
+        # Another process deletes the row and the shared copy, then marks the session revoked
+        Session.objects.filter(session_key=self.session.session_key).delete()
+        cache.delete(SessionStore.cache_key_prefix + self.session.session_key)
+        LocalSessions(maxsize=10, ttl=5).revoke(SessionStore.cache_key_prefix + self.session.session_key, cache)
+        self.assertFalse(SessionStore(self.session.session_key).exists(self.session.session_key))
+        self.assertEqual(dict(SessionStore(self.session.session_key).items()), {})
+        # Other sessions keep their local copies
+        cache.delete(SessionStore.cache_key_prefix + other.session_key)
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(other.session_key)['theme'], 'light')
+
+
+    @override_settings(SESSION_WRITE_BEHIND_BATCH=2)
+    def test_a_full_batch_is_flushed(self):
+        other = SessionStore()
+        other.create()
+        for session_key in (self.session.session_key, other.session_key):
+            session = SessionStore(session_key)
+            session['page'] = 1
+            session.save()
+        self.assertFalse(write_buffer.pending)
+        self.assertEqual(self.stored(other.session_key), {'page': 1})
+
+
+    def test_due_writes_are_flushed_when_a_request_finishes(self):
+        session = SessionStore(self.session.session_key)
+        session['page'] = 1
+        session.save()
+        write_buffer.first_pending_at -= 120
+        self.client.post(reverse('auth-check-email'), {'email': 'x@test.com'})
+        self.assertEqual(self.stored(self.session.session_key)['page'], 1)
+
+
+
+class ClearExpiredTests(TestCase):
+
+    def test_expired_sessions_are_deleted_in_chunks(self):
+        past, future = timezone.now() - timedelta(days=1), timezone.now() + timedelta(days=1)
+        Session.objects.bulk_create(
+            [Session(session_key=f'expired{index:025d}', session_data='', expire_date=past) for index in range(5)]
+            + [Session(session_key='live' + '0' * 28, session_data='', expire_date=future)]
+        )
+        # Three chunks: two full ones of two keys and a final one of one
+        with self.assertNumQueries(6):
+            self.assertEqual(SessionStore.clear_expired(chunk_size=2), 5)
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live' + '0' * 28])
+
+
+    def test_purge_command_reports_deleted_sessions(self):
+        Session.objects.create(session_key='expired' + '0' * 25, session_data='', expire_date=timezone.now() - timedelta(days=1))
+        out = StringIO()
+        call_command('purge_sessions', '--chunk-size', '10', stdout=out)
+        self.assertIn('Deleted 1 expired session(s).', out.getvalue())
+
+
+
+class SharedCacheCheckTests(TestCase):
+
+    def test_cached_sessions_require_a_shared_cache(self):
+        # Per-process caches (as in these tests) keep sessions in the database only
+        self.assertEqual(settings.SESSION_ENGINE, 'django.contrib.sessions.backends.db')
+        check_shared_caches()
+        with override_settings(SESSION_ENGINE='core.sessions'):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'core.sessions'):
+                check_shared_caches()
+            shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}}
+            with override_settings(CACHES=shared):
+                check_shared_caches()
@@ -0,0 +1,118 @@
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import User
+from core.throttling import SlidingWindowThrottle, rejection_counts
+
+
+
+def rates(**values):
+    """Override DEFAULT_THROTTLE_RATES, e.g. rates(auth_ip='3/min')."""
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {name.replace('_', '.', 1): rate for name, rate in values.items()},
+    })
+
+
+
+class SlidingWindowThrottleTests(APITestCase):
+
+    def setUp(self):
+        caches['throttle'].clear()
+        self.url = reverse('auth-check-email')
+
+    def check(self, email='free@example.com', **extra):
+        return self.client.post(self.url, {'email': email}, **extra)
+
+
+    @rates(auth_ip='3/min')
+    def test_requests_over_the_ip_rate_are_rejected(self):
+        """🚦 The fourth check from one address within a minute gets a 429 with Retry-After."""
+        for _ in range(3):
+            self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+        response = self.check()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.check(REMOTE_ADDR='10.0.0.2').status_code, status.HTTP_200_OK)
+
+
+    @rates(auth_email='2/min')
+    def test_one_email_is_limited_across_addresses(self):
+        self.assertEqual(self.check('Target@example.com', REMOTE_ADDR='10.0.0.1').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.check('target@example.com', REMOTE_ADDR='10.0.0.2').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.check('target@example.com', REMOTE_ADDR='10.0.0.3').status_code, 429)
+        self.assertEqual(self.check('other@example.com', REMOTE_ADDR='10.0.0.3').status_code, status.HTTP_200_OK)
+
+
+    @rates(auth_ip='10/min')
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        with mock.patch.object(SlidingWindowThrottle, 'timer', mock.Mock(return_value=6000.0)):
+            for _ in range(10):
+                self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+            self.assertEqual(self.check().status_code, 429)
+        # Halfway through the next window half of the previous one still counts
+        with mock.patch.object(SlidingWindowThrottle, 'timer', mock.Mock(return_value=6090.0)):
+            for _ in range(5):
+                self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+            response = self.check()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '6')
+
+
+    @rates(auth_ip='12/min')
+    def test_endpoints_in_a_scope_share_a_weighted_budget(self):
+        """⚖️ Logins cost more than email checks against the same auth budget."""
+        User.objects.create_user(email='emp@test.com', password='pass1234!', role='employer')
+        login = reverse('login')
+        for _ in range(2):
+            response = self.client.post(login, {'email': 'emp@test.com', 'password': 'wrong'})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(login, {'email': 'emp@test.com', 'password': 'wrong'}).status_code, 429)
+        self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.check().status_code, 429)
+
+
+    @rates(auth_ip='1/min')
+    def test_only_scoped_methods_are_throttled(self):
+        admin = User.objects.create_superuser(email='admin@test.com', password='pass', role='employer')
+        self.client.force_authenticate(user=admin)
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('user-list')).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(reverse('users-list')).status_code, status.HTTP_200_OK)
+
+
+    @rates(auth_user='1/min')
+    def test_authenticated_users_are_limited_per_account(self):
+        user = User.objects.create_user(email='emp@test.com', password='pass1234!', role='employer')
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.check().status_code, 429)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.check().status_code, status.HTTP_200_OK)
+
+
+    @rates(auth_ip='1/min', auth_email='1/min')
+    def test_rejections_are_counted(self):
+        self.check()
+        self.check()
+        self.check('other@example.com')
+        self.assertEqual(rejection_counts(), {('auth', 'ip'): 2, ('auth', 'email'): 1})
+
+        # Per-process counters, as in these tests, are out of the command's reach
+        with self.assertRaisesMessage(CommandError, 'THROTTLE_CACHE_BACKEND'):
+            call_command('throttle_stats', stdout=StringIO())
+        out = StringIO()
+        with mock.patch('core.management.commands.throttle_stats.is_shared', return_value=True):
+            call_command('throttle_stats', '--reset', stdout=out)
+        self.assertIn('auth             ip     2', out.getvalue())
+        self.assertEqual(rejection_counts()[('auth', 'ip')], 0)
@@ -14,7 +14,9 @@ class CheckEmailViewTests(APITestCase):
     def setUp(self):
         self.url = reverse("auth-check-email")
         self.existing_email = "test@example.com"
-        User.objects.create_user(email=self.existing_email, password="pass123", role="applicant")
+        # Signups reach the email filter once committed
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email=self.existing_email, password="pass123", role="applicant")
 
 
     def test_email_exists(self):
@@ -520,3 +522,18 @@ class ApplicantProfileViewSetTests(APITestCase):
         self.profile.refresh_from_db()
         self.assertTrue(bool(self.profile.resume))
         self.assertTrue(self.profile.resume.name.endswith('.pdf'))
+
+
+    def test_owner_can_download_resume(self):
+        self.profile.resume = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 my resume', content_type='application/pdf')
+        self.profile.save()
+        url = reverse('applicant-profiles-resume', kwargs={'pk': self.profile.pk})
+
+        self.authenticate(self.applicant_user)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(res.streaming_content), b'%PDF-1.4 my resume')
+        res.close()
+
+        self.authenticate(self.other_applicant)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
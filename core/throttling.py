@@ -0,0 +1,162 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+REJECTED_KEY = 'throttle:rejected:{}:{}'
+
+
+def parse_rate(rate):
+    """'120/min' -> (120, 60)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def get_cache():
+    return caches[settings.THROTTLE_CACHE]
+
+
+def resolve_scope(request, view):
+    """
+    Return the (scope, cost) a request counts against, or None when it isn't throttled.
+
+    Our views declare `throttle_scope` / `throttle_cost`; third-party views such as djoser's
+    are mapped by URL name (optionally suffixed with ':<METHOD>') in THROTTLE_VIEW_SCOPES.
+    Endpoints sharing a scope share one budget, with each request consuming its cost.
+    """
+    scope = getattr(view, 'throttle_scope', None)
+    if scope:
+        return scope, getattr(view, 'throttle_cost', 1)
+    match = request.resolver_match
+    if match is None or not match.url_name:
+        return None
+    scopes = settings.THROTTLE_VIEW_SCOPES
+    return scopes.get(f'{match.url_name}:{request.method}') or scopes.get(match.url_name)
+
+
+def record_rejection(scope, kind):
+    key = REJECTED_KEY.format(scope, kind)
+    cache = get_cache()
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def rejection_counts():
+    """{(scope, kind): rejected requests} for every configured rate."""
+    names = [name.split('.', 1) for name in api_settings.DEFAULT_THROTTLE_RATES if '.' in name]
+    counts = get_cache().get_many([REJECTED_KEY.format(scope, kind) for scope, kind in names])
+    return {(scope, kind): counts.get(REJECTED_KEY.format(scope, kind), 0) for scope, kind in names}
+
+
+def reset_rejection_counts():
+    names = [name.split('.', 1) for name in api_settings.DEFAULT_THROTTLE_RATES if '.' in name]
+    get_cache().delete_many([REJECTED_KEY.format(scope, kind) for scope, kind in names])
+
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Sliding-window counter: two fixed-window counters per key, with the previous window's
+    count weighted by how much of it still overlaps the sliding window. That costs one
+    get_many() and one add()/incr() per check, unlike DRF's per-request timestamp lists.
+
+    The rate for a request is DEFAULT_THROTTLE_RATES['<scope>.<kind>']; a scope without a
+    rate for this kind of key isn't limited by it. Counts are approximate under concurrency,
+    which only lets a few requests past the limit at a window boundary.
+    """
+    kind = None
+    timer = time.time
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        resolved = resolve_scope(request, view)
+        if resolved is None:
+            return True
+        scope, cost = resolved
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}.{self.kind}')
+        if not rate:
+            return True
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+
+        limit, duration = parse_rate(rate)
+        position = self.timer() / duration
+        window = int(position)
+        elapsed = position - window
+        key = f'throttle:{scope}:{self.kind}:{ident}'
+        current_key, previous_key = f'{key}:{window}', f'{key}:{window - 1}'
+
+        cache = get_cache()
+        counts = cache.get_many([current_key, previous_key])
+        current, previous = counts.get(current_key, 0), counts.get(previous_key, 0)
+        if previous * (1 - elapsed) + current + cost > limit:
+            self.wait_seconds = self._wait(limit - cost, current, previous, elapsed) * duration
+            record_rejection(scope, self.kind)
+            return False
+
+        if not cache.add(current_key, cost, duration * 2):
+            try:
+                cache.incr(current_key, cost)
+            except ValueError:
+                cache.set(current_key, cost, duration * 2)
+        return True
+
+    @staticmethod
+    def _wait(allowance, current, previous, elapsed):
+        # Fraction of a window until previous * (1 - t) + current drops to `allowance`
+        if allowance < 0:
+            return 1 - elapsed
+        if current <= allowance:
+            return max(1 - (allowance - current) / previous - elapsed, 0)
+        # Only possible once this window's count becomes the previous one
+        return 1 - elapsed + (1 - allowance / current)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+
+class IPThrottle(SlidingWindowThrottle):
+    kind = 'ip'
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    """Keyed by the submitted email, so one account can't be targeted from many addresses."""
+    kind = 'email'
+
+    def get_ident_key(self, request):
+        data = request.data
+        email = data.get('email') if hasattr(data, 'get') else None
+        if not email or not isinstance(email, str):
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+
+class UserThrottle(SlidingWindowThrottle):
+    kind = 'user'
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
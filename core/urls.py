@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter
 
-from core.views import UserViewSet, CheckEmailView, EmployerProfileViewSet, ApplicantProfileViewSet
+from core.asynchronous import async_urlpatterns
+from core.views import (
+    UserViewSet, CheckEmailView, EmployerProfileViewSet, ApplicantProfileViewSet, JWTRevokeView, TokenRotateView,
+    check_email,
+)
 
 
 
@@ -16,3 +21,16 @@ router.register(r'applicant-profiles', ApplicantProfileViewSet, basename='applic
 urlpatterns = router.urls + [
     path('check-email/', CheckEmailView.as_view(), name='auth-check-email'),
 ]
+
+if settings.SERVER_MODE == 'asgi':
+    urlpatterns = async_urlpatterns(urlpatterns, {'auth-check-email': check_email}, methods=('POST',))
+
+# Mounted under /api/auth/ next to djoser's token login and logout
+token_urlpatterns = [
+    path('token/rotate/', TokenRotateView.as_view(), name='token-rotate'),
+]
+
+# Mounted under /api/auth/ next to djoser's JWT endpoints when JWT_AUTH_ENABLED is set
+jwt_urlpatterns = [
+    path('jwt/revoke/', JWTRevokeView.as_view(), name='jwt-revoke'),
+]
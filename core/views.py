@@ -1,30 +1,101 @@
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from asgiref.sync import sync_to_async
+from django.db.models.functions import Lower
 
 from core.models import User, EmployerProfile, ApplicantProfile
-from core.serializers import UserSerializer, EmployerProfileSerializer, ApplicantProfileSerializer
+from core.serializers import (
+    UserSerializer, EmployerProfileSerializer, ApplicantProfileSerializer, TokenRevokeSerializer,
+    BulkProvisionSerializer, AuthTokenSerializer,
+)
+from core.asynchronous import AsyncEndpoint
+from core.authentication import CachedTokenAuthentication, ClaimsJWTAuthentication, denylist, token_user_id
+from core.bloom import email_filter
 from core.permissions import IsAdminOrSelf  
+from core.downloads import serve_file
+from core.provisioning import provision_users
+from core.search import TrigramSearchFilter
+from core.mixins import SerializerQueryPlanMixin
 
 
 
 class CheckEmailView(APIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'auth'
+    throttle_cost = 1
 
     def post(self, request):
         email = request.data.get("email")
         if not email:
             return Response({"detail": "Email is required."}, status=400)
 
-        exists = User.objects.filter(email__iexact=email).exists()
+        # A Bloom filter miss is definitive, so most "available" answers skip the database
+        if not email_filter.might_exist(email):
+            return Response({"exists": False})
+        exists = User.objects.annotate(email_lower=Lower('email')).filter(email_lower=email.lower()).exists()
         return Response({"exists": exists})
 
 
 
-class UserViewSet(viewsets.ModelViewSet):
+async def check_email(request):
+    """`CheckEmailView.post` over the async ORM, served under SERVER_MODE = 'asgi'."""
+    endpoint = AsyncEndpoint(CheckEmailView, request)
+    error = await endpoint.start()
+    if error is not None:
+        return error
+    email = endpoint.request.data.get("email")
+    if not email:
+        return endpoint.respond({"detail": "Email is required."}, status=400)
+
+    if not await sync_to_async(email_filter.might_exist)(email):
+        return endpoint.respond({"exists": False})
+    exists = await User.objects.annotate(email_lower=Lower('email')).filter(email_lower=email.lower()).aexists()
+    return endpoint.respond({"exists": exists})
+
+
+
+class JWTRevokeView(APIView):
+    """Revoke the access token used for this request and, if given, the matching refresh token."""
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = TokenRevokeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        refresh = serializer.validated_data.get('refresh')
+        if refresh:
+            try:
+                refresh = RefreshToken(refresh)
+            except TokenError as error:
+                raise ValidationError({'refresh': str(error)})
+            if token_user_id(refresh) != request.user.pk:
+                raise ValidationError({'refresh': "Token belongs to another user."})
+            denylist.revoke_token(refresh, request.user.pk)
+        denylist.revoke_token(request.auth, request.user.pk)
+        return Response(status=204)
+
+
+
+class TokenRotateView(APIView):
+    """Swap the token used for this request for a new one with a fresh lifetime."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'auth'
+    throttle_cost = 5
+
+    def post(self, request):
+        token = request.auth.rotate()
+        return Response(AuthTokenSerializer(token).data, status=201)
+
+
+
+class UserViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """
     Viewset for admin/staff to manage users, and for users to access their profile.
     Djoser handles login/register — this is for internal dashboard or admin.
@@ -32,7 +103,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('-created_at')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsAdminOrSelf]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [TrigramSearchFilter]
     search_fields = ['email', 'first_name', 'last_name']
 
     def get_permissions(self):
@@ -46,6 +117,15 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Permission denied."}, status=403)
         return super().update(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser])
+    def bulk(self, request):
+        """Provision a small batch of users; returns counts, skipped emails and throughput."""
+        serializer = BulkProvisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Hash inline: a process pool forked from a threaded web worker would inherit its connections
+        report = provision_users(serializer.validated_data['users'], role=serializer.validated_data['role'], workers=1)
+        return Response(report.as_dict(), status=201)
+
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
         """Get current user profile (optional; Djoser already provides /auth/users/me/)"""
@@ -54,7 +134,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 
-class EmployerProfileViewSet(viewsets.ModelViewSet):
+class EmployerProfileViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet to manage Employer profiles.
     - Employers can view/update their own profile.
@@ -81,7 +161,7 @@ class EmployerProfileViewSet(viewsets.ModelViewSet):
 
 
 
-class ApplicantProfileViewSet(viewsets.ModelViewSet):
+class ApplicantProfileViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing applicant profiles.
     - Applicants can manage their own profile.
@@ -105,3 +185,9 @@ class ApplicantProfileViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_staff and serializer.instance.user != self.request.user:
             raise PermissionDenied("You do not have permission to update this profile.")
         serializer.save()
+
+    @action(detail=True, methods=['get'])
+    def resume(self, request, pk=None):
+        """Download the profile resume through the same scoping as retrieve."""
+        profile = self.get_object()
+        return serve_file(request, profile.resume)
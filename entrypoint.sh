@@ -9,4 +9,19 @@ echo "✅ Database is up!"
 
 python manage.py migrate
 python manage.py collectstatic --noinput
-python manage.py runserver 0.0.0.0:8000
+python manage.py generate_schema
+
+# SERVER_MODE: asgi (uvicorn), wsgi (gunicorn) or the development server by default
+case "${SERVER_MODE:-runserver}" in
+  asgi)
+    exec uvicorn config.asgi:application --host 0.0.0.0 --port 8000 \
+      --workers "${WEB_CONCURRENCY:-4}" --no-access-log
+    ;;
+  wsgi)
+    exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 \
+      --workers "${WEB_CONCURRENCY:-4}" --threads "${GUNICORN_THREADS:-4}"
+    ;;
+  *)
+    exec python manage.py runserver 0.0.0.0:8000
+    ;;
+esac
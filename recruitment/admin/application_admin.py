@@ -1,7 +1,11 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
 from django.utils.html import format_html
 
 from recruitment.models import Application, InterviewSchedule, ApplicantNote
+from core.downloads import serve_file
 
 
 
@@ -58,13 +62,30 @@ class ApplicationAdmin(admin.ModelAdmin):
 
     def resume_download_link(self, obj):
         if obj.resume:
-            return format_html("<a href='{}' target='_blank' download>📄 Download Resume</a>", obj.resume.url)
+            url = reverse('admin:recruitment_application_resume', args=[obj.pk])
+            return format_html("<a href='{}' target='_blank' download>📄 Download Resume</a>", url)
         return "—"
     resume_download_link.short_description = "Resume"
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('job', 'applicant')
 
+    def get_urls(self):
+        custom_urls = [
+            path(
+                '<int:object_id>/resume/',
+                self.admin_site.admin_view(self.resume_view),
+                name='recruitment_application_resume',
+            ),
+        ]
+        return custom_urls + super().get_urls()
+
+    def resume_view(self, request, object_id):
+        application = get_object_or_404(self.get_queryset(request), pk=object_id)
+        if not self.has_view_permission(request, application):
+            raise PermissionDenied
+        return serve_file(request, application.resume, filename=application.get_resume_filename())
+
 
 
 @admin.register(InterviewSchedule)
@@ -75,6 +96,7 @@ class InterviewScheduleAdmin(admin.ModelAdmin):
         'job_title',
         'scheduled_by',
         'date',
+        'duration_minutes',
         'meeting_link_display',
     )
     list_filter = (
@@ -122,7 +144,10 @@ class InterviewScheduleAdmin(admin.ModelAdmin):
             app.applicant.username,
             app.job.title,
             app.status,
-            format_html("<a href='{}' download>📄 Resume</a>", app.resume.url) if app.resume else "—"
+            format_html(
+                "<a href='{}' download>📄 Resume</a>",
+                reverse('admin:recruitment_application_resume', args=[app.pk]),
+            ) if app.resume else "—"
         )
     application_summary.short_description = "Application Info"
     application_summary.allow_tags = True
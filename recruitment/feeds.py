@@ -0,0 +1,231 @@
+import hashlib
+import secrets
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from recruitment.models import InterviewSchedule
+from core.models import User
+
+
+
+FEED_SALT = 'recruitment.interview-feed'
+FEED_CACHE_PREFIX = 'interview-feed'
+ICS_DATETIME = '%Y%m%dT%H%M%SZ'
+
+
+def feed_token(user):
+    """
+    Signed, URL-safe token that identifies `user` to calendar clients, which can't send auth
+    headers. It carries the user's feed nonce, so `rotate_feed_token()` revokes it.
+    """
+    return signing.dumps([user.pk, user.feed_nonce], salt=FEED_SALT, compress=True)
+
+
+def parse_feed_token(token):
+    """(user id, feed nonce) signed into `token`, or None if it was tampered with."""
+    try:
+        user_id, nonce = signing.loads(token, salt=FEED_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return user_id, nonce
+
+
+def rotate_feed_token(user):
+    """Give `user` a new feed nonce, revoking their existing feed URLs, and return the new token."""
+    user.feed_nonce = secrets.token_urlsafe(16)
+    user.save(update_fields=['feed_nonce', 'updated_at'])
+    return feed_token(user)
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold content lines at 75 octets as RFC 5545 requires, without splitting UTF-8 sequences."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, current, size = [], '', 0
+    for char in line:
+        length = len(char.encode())
+        if size + length > (75 if not parts else 74):
+            parts.append(current)
+            current, size = '', 0
+        current += char
+        size += length
+    parts.append(current)
+    return '\r\n '.join(parts)
+
+
+def render_event(interview, stamp=None):
+    application = interview.application
+    applicant = application.applicant
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:interview-{interview.pk}@job-board',
+        f'DTSTAMP:{(stamp or timezone.now()).astimezone(dt_timezone.utc).strftime(ICS_DATETIME)}',
+        f'DTSTART:{interview.date.astimezone(dt_timezone.utc).strftime(ICS_DATETIME)}',
+        f'DTEND:{interview.ends_at.astimezone(dt_timezone.utc).strftime(ICS_DATETIME)}',
+        f'SUMMARY:{_escape(f"Interview: {application.job.title} with {applicant.get_full_name() or applicant.username}")}',
+        f'LOCATION:{_escape(interview.location)}',
+    ]
+    if interview.meeting_link:
+        lines.append(f'URL:{interview.meeting_link}')
+    if interview.notes:
+        lines.append(f'DESCRIPTION:{_escape(interview.notes)}')
+    lines.append('END:VEVENT')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def participant_ids(interview):
+    """Users whose feed shows `interview`: the interviewer, the job's employer and the applicant."""
+    return {interview.scheduled_by_id, interview.application.applicant_id, interview.application.job.employer_id}
+
+
+def _window_start():
+    return timezone.now() - timedelta(days=settings.INTERVIEW_FEED_PAST_DAYS)
+
+
+def _feed_queryset():
+    return InterviewSchedule.objects.filter(date__gte=_window_start()).select_related(
+        'application__job', 'application__applicant'
+    )
+
+
+def _version_key(user_id):
+    return f'{FEED_CACHE_PREFIX}:version:{user_id}'
+
+
+def _index_key(user_id, version):
+    return f'{FEED_CACHE_PREFIX}:{user_id}:{version}'
+
+
+def _event_key(pk):
+    return f'{FEED_CACHE_PREFIX}:event:{pk}'
+
+
+def _feed_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        # Start from the clock, so an evicted counter never returns to an earlier version
+        cache.add(_version_key(user_id), time.time_ns(), None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def _bump_versions(user_ids):
+    for user_id in user_ids:
+        try:
+            cache.incr(_version_key(user_id))
+        except ValueError:
+            cache.add(_version_key(user_id), time.time_ns(), None)
+
+
+def _feed(nonce, events):
+    digest = hashlib.md5(usedforsecurity=False)
+    for pk in sorted(events):
+        digest.update(events[pk][1].encode())
+    return {'nonce': nonce, 'events': events, 'etag': f'"{digest.hexdigest()}"'}
+
+
+def build_feed(user_id, version=None):
+    """
+    Render every recent interview involving `user_id`, with the nonce tokens must carry;
+    inactive or deleted users get no nonce, so none of their tokens match. With a `version`
+    the feed is cached: its events under their own keys, shared by every participant, and
+    the user's interview ids and nonce under that version.
+    """
+    stamp = timezone.now()
+    nonce = User.objects.filter(pk=user_id, is_active=True).values_list('feed_nonce', flat=True).first()
+    interviews = _feed_queryset().filter(
+        Q(scheduled_by_id=user_id) | Q(application__applicant_id=user_id) | Q(application__job__employer_id=user_id)
+    ) if nonce is not None else ()
+    events = {interview.pk: (interview.date.isoformat(), render_event(interview, stamp)) for interview in interviews}
+    if version is not None:
+        for pk, event in events.items():
+            # Never replace an event re-rendered by update_feeds() after this read
+            cache.add(_event_key(pk), event, settings.INTERVIEW_FEED_TTL)
+        cache.set(_index_key(user_id, version), (nonce, sorted(events)), settings.INTERVIEW_FEED_TTL)
+    return _feed(nonce, events)
+
+
+def get_feed(user_id):
+    """
+    The user's feed, from the cache when INTERVIEW_FEED_TTL allows. A feed whose version
+    moved, or one of whose events was evicted, is rebuilt.
+    """
+    if not settings.INTERVIEW_FEED_TTL:
+        return build_feed(user_id)
+    version = _feed_version(user_id)
+    index = cache.get(_index_key(user_id, version))
+    if index is None:
+        return build_feed(user_id, version)
+    nonce, pks = index
+    keys = {_event_key(pk): pk for pk in pks}
+    cached = cache.get_many(keys)
+    if len(cached) < len(keys):
+        return build_feed(user_id, version)
+    return _feed(nonce, {keys[key]: event for key, event in cached.items()})
+
+
+def discard_feed(user_id):
+    """Drop the cached feed, e.g. once the user's nonce or activation changed."""
+    if settings.INTERVIEW_FEED_TTL:
+        _bump_versions([user_id])
+
+
+def render_feed(feed):
+    events = sorted(feed['events'].values())
+    return (
+        'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Job Board//Interviews//EN\r\n'
+        'CALSCALE:GREGORIAN\r\nX-WR-CALNAME:Interviews\r\n'
+        + ''.join(text for _, text in events)
+        + 'END:VCALENDAR\r\n'
+    )
+
+
+def update_feeds(interview_pks, extra_user_ids=()):
+    """
+    Bring the cached feeds up to date with changes to `interview_pks`.
+
+    Each changed interview is re-rendered once into its shared event entry, so feeds that
+    already list it pick the change up without a rebuild. Participants whose cached feed
+    doesn't list it yet, and `extra_user_ids` (users who may have stopped being
+    participants, such as a previous interviewer or the participants of a deleted
+    interview), get a new feed version instead and are rebuilt on their next request; a
+    feed built from reads older than the change is stored under the old version and never
+    served. Nothing is read back and written over, so concurrent updates can't lose each
+    other's changes.
+    """
+    if not settings.INTERVIEW_FEED_TTL:
+        return
+    interview_pks = set(interview_pks)
+    events, participants = {}, {}
+    stamp = timezone.now()
+    for interview in _feed_queryset().filter(pk__in=interview_pks):
+        events[_event_key(interview.pk)] = (interview.date.isoformat(), render_event(interview, stamp))
+        participants[interview.pk] = participant_ids(interview)
+    if events:
+        cache.set_many(events, settings.INTERVIEW_FEED_TTL)
+    cache.delete_many([_event_key(pk) for pk in interview_pks - set(participants)])
+
+    stale = set(extra_user_ids)
+    user_ids = set().union(*participants.values())
+    versions = {user_id: _feed_version(user_id) for user_id in user_ids}
+    indexes = cache.get_many([_index_key(user_id, version) for user_id, version in versions.items()])
+    for pk, users in participants.items():
+        for user_id in users:
+            index = indexes.get(_index_key(user_id, versions[user_id]))
+            if index is None or pk not in index[1]:
+                stale.add(user_id)
+    _bump_versions(stale)
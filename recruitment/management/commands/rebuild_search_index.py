@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from recruitment.models import Application
+from recruitment.search import rebuild_index
+
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employer-scoped resume and cover-letter search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employer', type=int, help="Only reindex applications to this employer's jobs.")
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.all()
+        if options['employer']:
+            queryset = queryset.filter(job__employer_id=options['employer'])
+        count = rebuild_index(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} application(s)."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from recruitment.reminders import ReminderScheduler
+
+
+
+class Command(BaseCommand):
+    help = "Send interview reminders at the configured offsets; runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Send the reminders that are due now and exit.")
+        parser.add_argument('--batch-size', type=int, default=100, help="Reminders delivered per sender call.")
+        parser.add_argument('--sync-interval', type=float, default=30, help="Seconds between change-log checks.")
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(batch_size=options['batch_size'])
+        if options['once']:
+            scheduler.load()
+            sent = scheduler.tick()
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} reminder(s); {len(scheduler)} queued."))
+            return
+
+        scheduler.load()
+        self.stdout.write(f"Loaded {len(scheduler)} reminder(s); waiting for due reminders.")
+        try:
+            scheduler.run(sync_interval=options['sync_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
@@ -1,2 +1,4 @@
 from .job import *
 from .application import *
+from .search import *
+from .reminder import *
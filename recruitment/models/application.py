@@ -1,5 +1,10 @@
+import os
+from datetime import timedelta
+
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.conf import settings
+from django.utils.text import slugify
 
 from .job import Job
 
@@ -31,24 +36,52 @@ class Application(models.Model):
     def __str__(self):
         return f'{self.applicant} → {self.job.title}'
 
+    def get_resume_filename(self):
+        """Download name for the resume, derived from the applicant rather than the upload name."""
+        applicant = self.applicant
+        name = slugify(applicant.get_full_name() or applicant.username or applicant.email.split('@')[0])
+        extension = os.path.splitext(self.resume.name)[1].lower()
+        return f'{name or "applicant"}-{self.pk}-resume{extension}'
+
 
 
 class InterviewSchedule(models.Model):
+    DEFAULT_DURATION_MINUTES = 60
+    MAX_DURATION_MINUTES = 8 * 60
+
     application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='interview')
     scheduled_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='interviews_scheduled')
     date = models.DateTimeField()
+    duration_minutes = models.PositiveSmallIntegerField(
+        default=DEFAULT_DURATION_MINUTES, validators=[MinValueValidator(5), MaxValueValidator(MAX_DURATION_MINUTES)]
+    )
+    ends_at = models.DateTimeField(editable=False)
     location = models.CharField(max_length=255)
     meeting_link = models.URLField(blank=True, null=True)
     notes = models.TextField(blank=True)
 
     class Meta:
         ordering = ['date']
+        indexes = [
+            models.Index(fields=['scheduled_by', 'date'], name='recruit_interview_sched_idx'),
+        ]
         verbose_name = 'Interview Schedule'
         verbose_name_plural = 'Interview Schedules'
 
     def __str__(self):
         return f'Interview for {self.application.applicant} on {self.date.strftime("%Y-%m-%d %H:%M")}'
 
+    def save(self, *args, **kwargs):
+        self.ends_at = self.compute_end(self.date, self.duration_minutes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'date', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'ends_at'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def compute_end(start, duration_minutes):
+        return start + timedelta(minutes=duration_minutes)
+
 
 
 class ApplicantNote(models.Model):
@@ -0,0 +1,39 @@
+from django.db import models
+
+from .application import InterviewSchedule
+
+
+
+class InterviewChange(models.Model):
+    """
+    Append-only log of interview creations, reschedules and deletions. The reminder
+    scheduler reads it by increasing id to keep its in-memory queue in sync without
+    rescanning the interview table. `interview_id` is a plain column so deletions are
+    still recorded after the interview row is gone.
+    """
+    interview_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Interview Change'
+        verbose_name_plural = 'Interview Changes'
+
+    def __str__(self):
+        return f'Change #{self.pk} to interview #{self.interview_id}'
+
+
+
+class InterviewReminder(models.Model):
+    """A reminder that was delivered; `scheduled_for` lets a rescheduled interview be reminded again."""
+    interview = models.ForeignKey(InterviewSchedule, on_delete=models.CASCADE, related_name='reminders')
+    offset_minutes = models.PositiveIntegerField()
+    scheduled_for = models.DateTimeField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('interview', 'offset_minutes', 'scheduled_for')
+        verbose_name = 'Interview Reminder'
+        verbose_name_plural = 'Interview Reminders'
+
+    def __str__(self):
+        return f'{self.offset_minutes} min reminder for interview #{self.interview_id}'
@@ -0,0 +1,28 @@
+from django.db import models
+from django.conf import settings
+
+from .application import Application
+
+
+
+class ApplicationSearchTerm(models.Model):
+    """
+    One posting of the employer-scoped inverted index over resumes and cover letters.
+    `employer` is denormalized from `application.job.employer` so every lookup is
+    confined to a single employer's partition of the index.
+    """
+    employer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('application', 'term')
+        indexes = [
+            models.Index(fields=['employer', 'term'], name='recruit_search_emp_term_idx'),
+        ]
+        verbose_name = 'Application Search Term'
+        verbose_name_plural = 'Application Search Terms'
+
+    def __str__(self):
+        return f'{self.term} → application #{self.application_id}'
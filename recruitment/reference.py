@@ -0,0 +1,208 @@
+"""
+Process-wide snapshot of the reference tables, Category and Tag.
+
+Both are tiny and almost never written, so each process keeps every row as a named
+tuple indexed by id and by its unique key (slug for categories, name for tags). A
+version counter in the shared cache is bumped whenever either table changes; a process
+compares it at most every REFERENCE_DATA_CHECK_INTERVAL seconds (and on every write
+validation) and reloads both tables when it moved. Writes the counter can't announce (a
+per-process cache, `loaddata`, raw SQL) are picked up when a snapshot reaches
+REFERENCE_DATA_MAX_AGE, or sooner when a write validates an id the snapshot lacks; until
+then a relation to such a row renders only its id.
+"""
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import Http404
+
+from rest_framework.response import Response
+
+from core import response_cache
+from recruitment.models import Category, Tag
+
+
+
+VERSION_KEY = 'reference-data:version'
+
+
+
+class CategoryRow(NamedTuple):
+    id: int
+    name: str
+    slug: str
+
+
+
+class TagRow(NamedTuple):
+    id: int
+    name: str
+
+
+
+class ReferenceTable:
+    """One table's rows in primary key order, indexed by id and by a unique column."""
+
+    def __init__(self, model, row_class, key):
+        self.model = model
+        self.label = model._meta.label_lower
+        self.row_class = row_class
+        self.key = key
+        self.rows = ()
+        self.by_id = {}
+        self.by_key = {}
+
+    def load(self, using):
+        fields = self.row_class._fields
+        rows = self.model._base_manager.using(using).order_by('pk').values_list(*fields)
+        self.rows = tuple(self.row_class._make(row) for row in rows)
+        self.by_id = {row.id: row for row in self.rows}
+        self.by_key = {getattr(row, self.key): row for row in self.rows}
+        return self
+
+    def get(self, pk):
+        """The row with primary key `pk`, or None; recorded for the anonymous response cache."""
+        row = self.by_id.get(pk)
+        if row is not None:
+            response_cache.record(self.label, row.id)
+        return row
+
+    def instance(self, row):
+        """A model instance for `row`, as if loaded from the database, for assigning to relations."""
+        return self.model.from_db(DEFAULT_DB_ALIAS, self.row_class._fields, row)
+
+
+
+class ReferenceSnapshot:
+
+    def __init__(self, version, provisional):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        # Loaded inside a transaction, so it may hold rows that are later rolled back
+        self.provisional = provisional
+        # Always the primary: a lagging replica would pin old rows to the new version
+        self.categories = ReferenceTable(Category, CategoryRow, 'slug').load(DEFAULT_DB_ALIAS)
+        self.tags = ReferenceTable(Tag, TagRow, 'name').load(DEFAULT_DB_ALIAS)
+
+
+
+class ReferenceStore:
+
+    def __init__(self):
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self, fresh=False):
+        """
+        The current snapshot. Unless `fresh`, the shared version is compared at most every
+        REFERENCE_DATA_CHECK_INTERVAL seconds, so a write in another process is seen
+        within that interval; any snapshot is reloaded after REFERENCE_DATA_MAX_AGE.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.provisional and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            snapshot = None
+        now = time.monotonic()
+        if snapshot is not None and now - snapshot.loaded_at >= settings.REFERENCE_DATA_MAX_AGE:
+            snapshot = None
+        if snapshot is not None and (fresh or now - self._checked_at >= settings.REFERENCE_DATA_CHECK_INTERVAL):
+            self._checked_at = now
+            if shared_version() != snapshot.version:
+                snapshot = None
+        if snapshot is None:
+            with self._lock:
+                # Read before the rows, so a write committed during the load triggers another
+                version = shared_version()
+                snapshot = ReferenceSnapshot(version, connections[DEFAULT_DB_ALIAS].in_atomic_block)
+                self._snapshot, self._checked_at = snapshot, time.monotonic()
+        return snapshot
+
+    def invalidate(self):
+        """
+        Drop this process's snapshot now and bump the shared version once the write commits;
+        other processes reloading before then would still read the old rows.
+        """
+        self._snapshot = None
+        transaction.on_commit(bump_version)
+
+    def lookup(self, table, pk):
+        """
+        The row of `table` ('categories' or 'tags') with primary key `pk` in a freshly checked
+        snapshot. A miss costs one query: when the row does exist, it was written somewhere
+        the shared version didn't reach, so the snapshot is reloaded.
+        """
+        rows = getattr(self.snapshot(fresh=True), table)
+        row = rows.get(pk)
+        if row is None and rows.model._base_manager.using(DEFAULT_DB_ALIAS).filter(pk=pk).exists():
+            self.clear()
+            rows = getattr(self.snapshot(), table)
+            row = rows.get(pk)
+        return row
+
+    def clear(self):
+        self._snapshot = None
+
+
+reference_data = ReferenceStore()
+
+
+def shared_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock rather than 0, so an evicted counter never returns to a value
+        # some process still holds
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+
+
+
+class ReferenceDataViewMixin:
+    """
+    Takes one reference snapshot per request, in `initial()` (a worker thread for the async
+    views), and hands it to serializers as `context['reference_data']`.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.reference_data = reference_data.snapshot()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if hasattr(self, 'reference_data'):
+            context['reference_data'] = self.reference_data
+        return context
+
+
+
+class ReferenceTableViewSetMixin(ReferenceDataViewMixin):
+    """`list` and `retrieve` for a read-only viewset over one reference table, without queries."""
+    reference_table = None
+
+    def get_reference_table(self):
+        return getattr(self.reference_data, self.reference_table)
+
+    def list(self, request, *args, **kwargs):
+        return Response([row._asdict() for row in self.get_reference_table().rows])
+
+    def retrieve(self, request, *args, **kwargs):
+        table = self.get_reference_table()
+        try:
+            pk = table.model._meta.pk.to_python(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValidationError:
+            raise Http404
+        row = table.get(pk)
+        if row is None:
+            raise Http404
+        return Response(row._asdict())
@@ -0,0 +1,197 @@
+import heapq
+import itertools
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from recruitment.models import InterviewChange, InterviewReminder, InterviewSchedule
+
+
+
+def record_changes(interview_ids):
+    InterviewChange.objects.bulk_create([InterviewChange(interview_id=pk) for pk in interview_ids])
+
+
+def prune_changes(older_than=timedelta(days=1)):
+    return InterviewChange.objects.filter(created_at__lt=timezone.now() - older_than).delete()[0]
+
+
+def get_sender():
+    return import_string(settings.INTERVIEW_REMINDER_SENDER)()
+
+
+class EmailReminderSender:
+    """Deliver a batch of reminders over a single mail connection (SMTP, or the file backend locally)."""
+
+    def send(self, reminders):
+        messages = []
+        for interview, offset in reminders:
+            application = interview.application
+            lines = [
+                f"Reminder: your interview for {application.job.title} starts at "
+                f"{timezone.localtime(interview.date):%Y-%m-%d %H:%M} ({interview.duration_minutes} minutes).",
+                f"Location: {interview.location}",
+            ]
+            if interview.meeting_link:
+                lines.append(f"Meeting link: {interview.meeting_link}")
+            recipients = [email for email in (application.applicant.email, interview.scheduled_by.email) if email]
+            messages.append(EmailMessage(
+                subject=f"Interview reminder: {application.job.title}",
+                body='\n'.join(lines),
+                to=recipients,
+            ))
+        return get_connection().send_messages(messages) or 0
+
+
+
+class ReminderScheduler:
+    """
+    In-memory min-heap of upcoming reminders, keyed by the time they are due.
+
+    The heap is loaded once; afterwards only recent rows of the `InterviewChange` log are
+    read, so a tick costs one indexed query regardless of how many reminders are queued.
+    Rescheduled and deleted interviews are handled with lazy deletion: each interview has a
+    current version, and heap entries carrying an older version are discarded when popped.
+    Sent reminders are recorded in `InterviewReminder`, which makes restarts safe.
+    """
+
+    grace = timedelta(minutes=5)
+    lookback = timedelta(minutes=5)
+
+    def __init__(self, offsets=None, sender=None, batch_size=100):
+        self.offsets = sorted(set(offsets or settings.INTERVIEW_REMINDER_OFFSETS), reverse=True)
+        self.sender = sender or get_sender()
+        self.batch_size = batch_size
+        self.heap = []
+        self.versions = {}
+        self.synced_at = None
+        self.seen_changes = set()
+        self._version_counter = itertools.count(1)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def load(self, now=None):
+        """Queue reminders for every upcoming interview."""
+        now = now or timezone.now()
+        self.heap, self.versions = [], {}
+        # Note the log position first so changes racing with the scan are replayed by sync()
+        self._read_changes()
+        rows = InterviewSchedule.objects.filter(date__gt=now).values_list('pk', 'date').iterator(chunk_size=2000)
+        for pk, date in rows:
+            self._schedule(pk, date, now, heapify=False)
+        heapq.heapify(self.heap)
+
+    def _read_changes(self):
+        # Ids are allocated before commit, so a transaction can commit a lower id after a higher
+        # one was read; re-reading a short window and skipping seen ids closes that gap
+        now = timezone.now()
+        since = (self.synced_at or now) - self.lookback
+        rows = list(InterviewChange.objects.filter(created_at__gte=since).values_list('pk', 'interview_id'))
+        fresh = {interview_id for pk, interview_id in rows if pk not in self.seen_changes}
+        self.seen_changes = {pk for pk, _ in rows}
+        self.synced_at = now
+        return fresh
+
+    def sync(self, now=None):
+        """Apply interview changes logged since the last sync; returns how many interviews changed."""
+        now = now or timezone.now()
+        changed = self._read_changes()
+        if not changed:
+            return 0
+        dates = dict(InterviewSchedule.objects.filter(pk__in=changed).values_list('pk', 'date'))
+        for pk in changed:
+            if pk in dates and dates[pk] > now:
+                self._schedule(pk, dates[pk], now)
+            else:
+                self.versions.pop(pk, None)
+        self._compact()
+        return len(changed)
+
+    def _schedule(self, pk, date, now, heapify=True):
+        version = next(self._version_counter)
+        self.versions[pk] = version
+        for offset in self.offsets:
+            due = date - timedelta(minutes=offset)
+            # Reminders missed by more than the grace period (e.g. while the scheduler was down) are skipped
+            if due < now - self.grace:
+                continue
+            entry = (due, pk, offset, version, date)
+            if heapify:
+                heapq.heappush(self.heap, entry)
+            else:
+                self.heap.append(entry)
+
+    def _compact(self):
+        # Stale entries are normally dropped when popped; rebuild once they dominate the heap
+        live = sum(1 for entry in self.heap if self.versions.get(entry[1]) == entry[3])
+        if len(self.heap) > 1000 and live < len(self.heap) // 2:
+            self.heap = [entry for entry in self.heap if self.versions.get(entry[1]) == entry[3]]
+            heapq.heapify(self.heap)
+
+    def next_due(self):
+        while self.heap and self.versions.get(self.heap[0][1]) != self.heap[0][3]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now=None):
+        """Remove and return the (pk, offset, date) of every live reminder due at `now`."""
+        now = now or timezone.now()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, pk, offset, version, date = heapq.heappop(self.heap)
+            if self.versions.get(pk) == version:
+                due.append((pk, offset, date))
+        return due
+
+    def dispatch(self, due):
+        """Send `due` reminders in batches; returns the number of reminders delivered."""
+        sent = 0
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            pks = {pk for pk, _, _ in batch}
+            interviews = InterviewSchedule.objects.select_related(
+                'application__job', 'application__applicant', 'scheduled_by'
+            ).in_bulk(pks)
+            delivered = set(
+                InterviewReminder.objects.filter(interview_id__in=pks).values_list(
+                    'interview_id', 'offset_minutes', 'scheduled_for'
+                )
+            )
+            pending = [
+                (interviews[pk], offset) for pk, offset, date in batch
+                if pk in interviews and interviews[pk].date == date and (pk, offset, date) not in delivered
+            ]
+            if not pending:
+                continue
+            self.sender.send(pending)
+            InterviewReminder.objects.bulk_create([
+                InterviewReminder(interview=interview, offset_minutes=offset, scheduled_for=interview.date)
+                for interview, offset in pending
+            ], ignore_conflicts=True)
+            sent += len(pending)
+        return sent
+
+    def tick(self, now=None):
+        self.sync(now)
+        return self.dispatch(self.pop_due(now))
+
+    def run(self, sync_interval=30, stop=None):
+        """Sleep until the next reminder is due or the change log should be checked again."""
+        if self.synced_at is None:
+            self.load()
+        pruned_at = None
+        while not (stop and stop()):
+            self.tick()
+            if pruned_at is None or time.monotonic() - pruned_at > 3600:
+                prune_changes()
+                pruned_at = time.monotonic()
+            next_due = self.next_due()
+            delay = sync_interval
+            if next_due is not None:
+                delay = min(delay, max((next_due - timezone.now()).total_seconds(), 0))
+            time.sleep(delay)
@@ -0,0 +1,94 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from recruitment.models import InterviewSchedule
+
+
+
+# Interviews are stored with their end time, and durations are capped, so every interview
+# overlapping [start, end) begins in [start - MAX_DURATION, end). That keeps each lookup a
+# bounded range scan on the (scheduled_by, date) index: O(log n + k) per interviewer.
+MAX_DURATION = timedelta(minutes=InterviewSchedule.MAX_DURATION_MINUTES)
+
+
+def overlapping_interviews(interviewer_ids, start, end):
+    """Interviews of any of `interviewer_ids` that overlap the half-open window [start, end)."""
+    return InterviewSchedule.objects.filter(
+        scheduled_by_id__in=interviewer_ids,
+        date__gte=start - MAX_DURATION,
+        date__lt=end,
+        ends_at__gt=start,
+    )
+
+
+def find_conflicts(interviewer_id, start, end, exclude_pk=None):
+    queryset = overlapping_interviews([interviewer_id], start, end)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset
+
+
+def busy_intervals(interviewer_ids, start, end):
+    """Return {interviewer_id: [(start, end), ...]} sorted and merged, from a single query."""
+    rows = overlapping_interviews(interviewer_ids, start, end).order_by('date').values_list(
+        'scheduled_by_id', 'date', 'ends_at'
+    )
+    busy = defaultdict(list)
+    for interviewer_id, busy_start, busy_end in rows:
+        intervals = busy[interviewer_id]
+        if intervals and busy_start <= intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], max(intervals[-1][1], busy_end))
+        else:
+            intervals.append((busy_start, busy_end))
+    return busy
+
+
+def free_slots(busy, start, end, duration):
+    """Gaps of at least `duration` between sorted, merged `busy` intervals inside [start, end)."""
+    slots = []
+    cursor = start
+    for busy_start, busy_end in busy:
+        if busy_start - cursor >= duration:
+            slots.append((cursor, min(busy_start, end)))
+        cursor = max(cursor, busy_end)
+        if cursor >= end:
+            break
+    if end - cursor >= duration:
+        slots.append((cursor, end))
+    return slots
+
+
+def merge_windows(windows):
+    """Sort and coalesce overlapping (start, end) windows."""
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def candidate_slots(windows, busy, duration):
+    """Yield back-to-back (start, end) slots of `duration` inside `windows`, skipping `busy` time."""
+    for window_start, window_end in merge_windows(windows):
+        for gap_start, gap_end in free_slots(busy, window_start, window_end, duration):
+            slot_start = gap_start
+            while slot_start + duration <= gap_end:
+                yield slot_start, slot_start + duration
+                slot_start += duration
+
+
+def assign_slots(candidates, windows, busy, duration):
+    """
+    Greedily give each candidate, in order, the earliest free slot of one calendar.
+
+    `windows` are the available (start, end) windows and `busy` the calendar's merged busy
+    intervals. Slots come from a lazy generator, so the pass stops as soon as every
+    candidate is placed. Any candidate fits any slot, so earliest-first also places the
+    maximum number of them. Returns a list of (candidate, start, end).
+    """
+    return [
+        (candidate, start, end)
+        for candidate, (start, end) in zip(candidates, candidate_slots(windows, busy, duration))
+    ]
@@ -0,0 +1,156 @@
+import io
+import re
+import zipfile
+import zlib
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from recruitment.models import Application, ApplicationSearchTerm
+
+
+
+# ==========================
+# TOKENIZATION
+# ==========================
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+MAX_TERM_LENGTH = 64
+MAX_TERM_WEIGHT = 10
+COVER_LETTER_BOOST = 2
+MAX_RESUME_BYTES = 5 * 1024 * 1024
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'have', 'i', 'in',
+    'is', 'it', 'me', 'my', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+    'we', 'will', 'with', 'you', 'your',
+})
+
+
+def tokenize(text):
+    """Lowercase `text` and split it into index terms, keeping tokens like `c++`, `c#` and `node.js`."""
+    terms = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        token = token.rstrip('.')[:MAX_TERM_LENGTH]
+        if token and token not in STOP_WORDS:
+            terms.append(token)
+    return terms
+
+
+
+# ==========================
+# RESUME TEXT EXTRACTION
+# ==========================
+
+PDF_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.DOTALL)
+PDF_TEXT_RE = re.compile(rb'\((.*?)(?<!\\)\)')
+XML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _pdf_text(data):
+    chunks = []
+    for stream in PDF_STREAM_RE.findall(data):
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        chunks.extend(PDF_TEXT_RE.findall(stream))
+    if not chunks:
+        chunks = PDF_TEXT_RE.findall(data)
+    return b' '.join(chunks).decode('latin-1')
+
+
+def _docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        xml = archive.read('word/document.xml').decode('utf-8', 'ignore')
+    return XML_TAG_RE.sub(' ', xml)
+
+
+def extract_resume_text(resume):
+    """
+    Best-effort plain-text extraction from an uploaded resume (PDF, DOCX or text).
+    Only the first MAX_RESUME_BYTES are read so indexing cost stays bounded.
+    """
+    if not resume:
+        return ''
+    try:
+        resume.open('rb')
+        try:
+            data = resume.read(MAX_RESUME_BYTES)
+        finally:
+            resume.close()
+    except (OSError, ValueError):
+        return ''
+
+    try:
+        if data.startswith(b'%PDF'):
+            return _pdf_text(data)
+        if data.startswith(b'PK'):
+            return _docx_text(data)
+    except (KeyError, zipfile.BadZipFile, UnicodeDecodeError):
+        return ''
+    return data.decode('utf-8', 'ignore')
+
+
+
+# ==========================
+# INDEXING
+# ==========================
+
+def build_terms(application):
+    """Return a {term: weight} mapping for one application's resume and cover letter."""
+    weights = Counter(tokenize(extract_resume_text(application.resume)))
+    for term, count in Counter(tokenize(application.cover_letter)).items():
+        weights[term] += count * COVER_LETTER_BOOST
+    return {term: min(weight, MAX_TERM_WEIGHT) for term, weight in weights.items()}
+
+
+def index_application(application):
+    """(Re)build the postings for a single application inside the owning employer's partition."""
+    employer_id = application.job.employer_id
+    terms = build_terms(application)
+    with transaction.atomic():
+        ApplicationSearchTerm.objects.filter(application=application).delete()
+        ApplicationSearchTerm.objects.bulk_create([
+            ApplicationSearchTerm(
+                employer_id=employer_id,
+                application=application,
+                term=term,
+                weight=weight,
+            )
+            for term, weight in terms.items()
+        ])
+    return len(terms)
+
+
+def rebuild_index(queryset=None):
+    """Reindex every application in `queryset` (all applications by default)."""
+    queryset = queryset if queryset is not None else Application.objects.all()
+    count = 0
+    for application in queryset.select_related('job').iterator(chunk_size=500):
+        index_application(application)
+        count += 1
+    return count
+
+
+
+# ==========================
+# QUERYING
+# ==========================
+
+def search_applications(queryset, employer, query):
+    """
+    Restrict `queryset` to applications of `employer` matching any term of `query`,
+    ranked by number of matched terms, then by accumulated term weight.
+    """
+    terms = sorted(set(tokenize(query)))
+    if not terms:
+        return queryset.none()
+    return queryset.filter(
+        search_terms__employer=employer,
+        search_terms__term__in=terms,
+    ).annotate(
+        search_matches=Count('search_terms'),
+        search_score=Sum('search_terms__weight'),
+    ).order_by('-search_matches', '-search_score', '-created_at')
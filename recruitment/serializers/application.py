@@ -1,12 +1,23 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
 from rest_framework import serializers
 
 from recruitment.models import Application, Job, InterviewSchedule, ApplicantNote
+from recruitment.feeds import update_feeds
+from recruitment.reminders import record_changes
+from recruitment.scheduling import assign_slots, busy_intervals, find_conflicts
+from core.models import User
 
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
     applicant = serializers.HiddenField(default=serializers.CurrentUserDefault())
     resume = serializers.FileField(use_url=True)
+    resume_download_url = serializers.SerializerMethodField()
     job_title = serializers.CharField(source='job.title', read_only=True)
     job_id = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all(), source='job')
 
@@ -18,12 +29,22 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'job_title',
             'applicant',
             'resume',
+            'resume_download_url',
             'cover_letter',
             'status',
             'created_at',
             'updated_at',
         ]
         read_only_fields = ['status', 'created_at', 'updated_at', 'applicant']
+        # Duplicates are reported by validate() and enforced by the unique index in create()
+        validators = []
+
+    def get_resume_download_url(self, obj):
+        request = self.context.get('request')
+        if not obj.pk or not obj.resume:
+            return None
+        url = reverse('application-resume', kwargs={'pk': obj.pk})
+        return request.build_absolute_uri(url) if request else url
 
     def validate(self, data):
         job = data.get('job')
@@ -32,6 +53,17 @@ class ApplicationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You have already applied for this job.")
         return data
 
+    def create(self, validated_data):
+        # Concurrent submissions can both pass validate(); the unique index settles the race
+        application = Application(**validated_data)
+        try:
+            with transaction.atomic():
+                application.save()
+        except IntegrityError:
+            application.resume.delete(save=False)
+            raise serializers.ValidationError("You have already applied for this job.")
+        return application
+
 
 
 class InterviewScheduleSerializer(serializers.ModelSerializer):
@@ -48,17 +80,174 @@ class InterviewScheduleSerializer(serializers.ModelSerializer):
             'job_title',
             'scheduled_by',
             'date',
+            'duration_minutes',
+            'ends_at',
             'location',
             'meeting_link',
             'notes',
         ]
-        read_only_fields = ['scheduled_by', 'applicant_username', 'job_title']
+        read_only_fields = ['scheduled_by', 'applicant_username', 'job_title', 'ends_at']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is not None:
+            # Only applications to the requesting employer's own jobs can be scheduled
+            fields['application'].queryset = Application.objects.filter(job__employer=request.user)
+        return fields
 
     def validate_application(self, value):
         if self.instance is None and InterviewSchedule.objects.filter(application=value).exists():
             raise serializers.ValidationError("This application already has an interview scheduled.")
         return value
 
+    def create(self, validated_data):
+        with transaction.atomic():
+            self._check_conflicts(validated_data)
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            self._check_conflicts(validated_data, instance)
+            return super().update(instance, validated_data)
+
+    def _check_conflicts(self, validated_data, instance=None):
+        interviewer = validated_data.get('scheduled_by') or instance.scheduled_by
+        start = validated_data.get('date') or instance.date
+        duration = validated_data.get('duration_minutes') or (
+            instance.duration_minutes if instance else InterviewSchedule.DEFAULT_DURATION_MINUTES
+        )
+        # Lock the interviewer row so concurrent bookings for the same person are serialized
+        list(User.objects.select_for_update().filter(pk=interviewer.pk).values_list('pk', flat=True))
+        conflict = find_conflicts(
+            interviewer.pk, start, InterviewSchedule.compute_end(start, duration),
+            exclude_pk=instance.pk if instance else None,
+        ).order_by('date').first()
+        if conflict:
+            raise serializers.ValidationError({
+                'date': f"The interviewer is already booked from {conflict.date:%Y-%m-%d %H:%M} "
+                        f"to {conflict.ends_at:%H:%M}."
+            })
+
+
+
+class AvailabilityWindowSerializer(serializers.Serializer):
+    MAX_WINDOW_DAYS = 31
+
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': "Must be later than 'start'."})
+        if attrs['end'] - attrs['start'] > timedelta(days=self.MAX_WINDOW_DAYS):
+            raise serializers.ValidationError(
+                {'end': f"A window may span at most {self.MAX_WINDOW_DAYS} days."}
+            )
+        return attrs
+
+
+
+class BatchInterviewScheduleSerializer(serializers.Serializer):
+    """
+    Schedule many shortlisted applications at once on the requesting employer's calendar.
+    Applications are placed in the given order into the earliest free slot of the
+    availability windows. Either every application gets a slot or nothing is written.
+    """
+    MAX_APPLICATIONS = 200
+
+    applications = serializers.ListField(
+        child=serializers.IntegerField(), min_length=1, max_length=MAX_APPLICATIONS
+    )
+    availability = AvailabilityWindowSerializer(many=True, allow_empty=False)
+    duration_minutes = serializers.IntegerField(
+        default=InterviewSchedule.DEFAULT_DURATION_MINUTES, min_value=5,
+        max_value=InterviewSchedule.MAX_DURATION_MINUTES,
+    )
+    location = serializers.CharField(max_length=255)
+    meeting_link = serializers.URLField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        application_ids = list(dict.fromkeys(attrs['applications']))
+
+        # One query for all applications instead of an exists() per row
+        found = Application.objects.filter(
+            pk__in=application_ids, job__employer=user, interview__isnull=True
+        ).in_bulk()
+        missing = [pk for pk in application_ids if pk not in found]
+        if missing:
+            raise serializers.ValidationError(
+                {'applications': f"Unknown, foreign or already scheduled applications: {missing}"}
+            )
+        attrs['applications'] = [found[pk] for pk in application_ids]
+        attrs['availability'] = [(window['start'], window['end']) for window in attrs['availability']]
+        return attrs
+
+    def create(self, validated_data):
+        interviewer = self.context['request'].user
+        applications = validated_data['applications']
+        windows = validated_data['availability']
+        duration = timedelta(minutes=validated_data['duration_minutes'])
+
+        with transaction.atomic():
+            # Same lock as single bookings, so batches and single bookings can't double-book
+            list(User.objects.select_for_update().filter(pk=interviewer.pk).values_list('pk', flat=True))
+            busy = busy_intervals(
+                [interviewer.pk], min(start for start, _ in windows), max(end for _, end in windows)
+            ).get(interviewer.pk, [])
+            assignments = assign_slots(applications, windows, busy, duration)
+            if len(assignments) < len(applications):
+                raise serializers.ValidationError(
+                    f"Only {len(assignments)} of {len(applications)} applications fit into the available windows."
+                )
+
+            interviews = [
+                InterviewSchedule(
+                    application=application,
+                    scheduled_by=interviewer,
+                    date=start,
+                    duration_minutes=validated_data['duration_minutes'],
+                    ends_at=end,  # bulk_create() bypasses save(), so set it here
+                    location=validated_data['location'],
+                    meeting_link=validated_data.get('meeting_link'),
+                    notes=validated_data['notes'],
+                )
+                for application, start, end in assignments
+            ]
+            try:
+                InterviewSchedule.objects.bulk_create(interviews)
+            except IntegrityError:
+                raise serializers.ValidationError(
+                    {'applications': "Some applications were scheduled by another request."}
+                )
+            Application.objects.filter(pk__in=[application.pk for application in applications]).update(
+                status='interview', updated_at=timezone.now()
+            )
+
+            # Some backends (MySQL) don't return primary keys from bulk_create()
+            interviews = list(
+                InterviewSchedule.objects.filter(application__in=applications)
+                .select_related('application__applicant', 'application__job')
+            )
+            # bulk_create() sends no post_save: log the changes for the reminder scheduler
+            # and patch the cached calendar feeds here
+            pks = [interview.pk for interview in interviews]
+            record_changes(pks)
+            transaction.on_commit(lambda: update_feeds(pks))
+        return interviews
+
+
+
+class InterviewCalendarSerializer(serializers.ModelSerializer):
+    """Compact, read-only representation for calendar views."""
+
+    class Meta:
+        model = InterviewSchedule
+        fields = ['id', 'date', 'location', 'meeting_link']
+        read_only_fields = fields
+
 
 
 class ApplicantNoteSerializer(serializers.ModelSerializer):
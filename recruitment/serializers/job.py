@@ -1,6 +1,8 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
 from recruitment.models import Category, Tag, CompanyProfile, Job
+from recruitment.reference import reference_data
 from core.models import User
 
 
@@ -20,6 +22,58 @@ class TagSerializer(serializers.ModelSerializer):
 
 
 
+class ReferenceRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    A Category or Tag relation served from the reference snapshot: rendered like
+    CategorySerializer/TagSerializer from the foreign key alone, and validated against the
+    snapshot, so neither reads the reference table. `queryset` is only introspected.
+    """
+    model = None
+    table = None
+
+    def __init__(self, **kwargs):
+        if not kwargs.get('read_only'):
+            kwargs['queryset'] = self.model._default_manager.all()
+        super().__init__(**kwargs)
+
+    def get_table(self):
+        return getattr(self.context.get('reference_data') or reference_data.snapshot(), self.table)
+
+    def to_representation(self, value):
+        row = self.get_table().get(value.pk)
+        if row is None:
+            # Added by another process since this snapshot was checked. The async views
+            # serialize in the event loop, so rather than query, render just the id until
+            # the next snapshot has the row
+            return {'id': value.pk}
+        return row._asdict()
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.model._meta.pk.to_python(data)
+        except DjangoValidationError:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        row = reference_data.lookup(self.table, pk)
+        if row is None:
+            self.fail('does_not_exist', pk_value=data)
+        return self.get_table().instance(row)
+
+
+
+class CategoryField(ReferenceRelatedField):
+    model = Category
+    table = 'categories'
+
+
+
+class TagField(ReferenceRelatedField):
+    model = Tag
+    table = 'tags'
+
+
+
 class CompanyProfileSerializer(serializers.ModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
     logo_url = serializers.SerializerMethodField()
@@ -43,8 +97,8 @@ class CompanyProfileSerializer(serializers.ModelSerializer):
 
 class JobListSerializer(serializers.ModelSerializer):
     employer_email = serializers.EmailField(source='employer.email', read_only=True)
-    category = CategorySerializer(read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
+    category = CategoryField(read_only=True)
+    tags = TagField(many=True, read_only=True)
 
     class Meta:
         model = Job
@@ -58,14 +112,10 @@ class JobListSerializer(serializers.ModelSerializer):
 
 class JobDetailSerializer(serializers.ModelSerializer):
     employer_email = serializers.EmailField(source='employer.email', read_only=True)
-    category = CategorySerializer(read_only=True)
-    category_id = serializers.PrimaryKeyRelatedField(
-        queryset=Category.objects.all(), source='category', write_only=True, required=False
-    )
-    tags = TagSerializer(many=True, read_only=True)
-    tag_ids = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(), many=True, source='tags', write_only=True, required=False
-    )
+    category = CategoryField(read_only=True)
+    category_id = CategoryField(source='category', write_only=True, required=False)
+    tags = TagField(many=True, read_only=True)
+    tag_ids = TagField(many=True, source='tags', write_only=True, required=False)
 
     class Meta:
         model = Job
@@ -0,0 +1,118 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from core import response_cache
+from recruitment.models import Application, InterviewSchedule, Job, Category, Tag
+from recruitment.feeds import discard_feed, update_feeds
+from recruitment.reference import reference_data
+from recruitment.reminders import record_changes
+from recruitment.search import index_application
+from core.models import User
+
+
+
+def _search_source(instance):
+    # Read raw attribute values so deferred fields are never loaded just for this check
+    resume = instance.__dict__.get('resume')
+    return (str(resume) if resume is not None else None, instance.__dict__.get('cover_letter'))
+
+
+@receiver(post_init, sender=Application)
+def remember_search_source(sender, instance, **kwargs):
+    instance._search_source = _search_source(instance)
+
+
+@receiver(post_save, sender=Application)
+def update_search_index(sender, instance, created, update_fields=None, **kwargs):
+    # Status changes and other edits that don't touch the indexed text skip reindexing
+    if update_fields is not None and not {'resume', 'cover_letter'} & set(update_fields):
+        return
+    source = _search_source(instance)
+    if created or source != instance._search_source:
+        index_application(instance)
+        instance._search_source = source
+
+
+
+@receiver(post_init, sender=InterviewSchedule)
+def remember_interviewer(sender, instance, **kwargs):
+    instance._feed_interviewer = instance.__dict__.get('scheduled_by_id')
+    instance._reminder_date = instance.__dict__.get('date')
+
+
+@receiver(post_save, sender=InterviewSchedule)
+def log_interview_change(sender, instance, created, **kwargs):
+    # Only the date affects when reminders fire; their content is read at delivery time
+    if created or instance.date != instance._reminder_date:
+        record_changes([instance.pk])
+        instance._reminder_date = instance.date
+
+
+@receiver(post_save, sender=InterviewSchedule)
+def update_interview_feeds(sender, instance, **kwargs):
+    previous = {instance._feed_interviewer} - {None, instance.scheduled_by_id}
+    instance._feed_interviewer = instance.scheduled_by_id
+    pk = instance.pk
+    transaction.on_commit(lambda: update_feeds([pk], previous))
+
+
+@receiver(pre_delete, sender=InterviewSchedule)
+def remember_feed_participants(sender, instance, **kwargs):
+    participants = Application.objects.filter(pk=instance.application_id).values_list(
+        'applicant_id', 'job__employer_id'
+    ).first() or ()
+    instance._feed_participants = {instance.scheduled_by_id, *participants}
+
+
+@receiver(post_delete, sender=InterviewSchedule)
+def remove_from_interview_feeds(sender, instance, **kwargs):
+    pk, participants = instance.pk, getattr(instance, '_feed_participants', {instance.scheduled_by_id})
+    record_changes([pk])
+    transaction.on_commit(lambda: update_feeds([pk], participants))
+
+
+
+def _feed_access(instance):
+    return instance.__dict__.get('feed_nonce'), instance.__dict__.get('is_active')
+
+
+@receiver(post_init, sender=User)
+def remember_feed_access(sender, instance, **kwargs):
+    instance._feed_access = _feed_access(instance)
+
+
+@receiver(post_save, sender=User)
+def discard_revoked_feed(sender, instance, created, **kwargs):
+    # The cached feed holds the nonce tokens must match, or none for inactive users
+    access = _feed_access(instance)
+    if not created and access != instance._feed_access:
+        pk = instance.pk
+        transaction.on_commit(lambda: discard_feed(pk))
+    instance._feed_access = access
+
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    response_cache.invalidate_instance(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def invalidate_reference_data(sender, **kwargs):
+    reference_data.invalidate()
+
+
+@receiver(m2m_changed, sender=Job.tags.through)
+def invalidate_cached_job_tags(sender, instance, action, reverse, **kwargs):
+    # Jobs that showed a tag loaded it, so the tag's own entry covers them from either side
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        response_cache.invalidate_instance(instance)
@@ -0,0 +1,111 @@
+import json
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import path, include, resolve, reverse
+
+from rest_framework.test import APIClient
+
+from recruitment.models import *
+from recruitment.urls import router
+from recruitment.views.asynchronous import async_read_views, offloaded_views
+from core.asynchronous import async_urlpatterns
+from core.models import User, AuthToken
+
+
+
+# Routes as mounted under SERVER_MODE = 'asgi'; the tests swap them in with ROOT_URLCONF
+urlpatterns = [
+    path('api/recruitment/', include(async_urlpatterns(router.urls, async_read_views, offloaded=offloaded_views))),
+]
+
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncReadViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(email='employer@example.com', password='pass', role='employer')
+        cls.category = Category.objects.create(name='Engineering')
+        cls.tags = [Tag.objects.create(name=name) for name in ('python', 'django')]
+        cls.job = Job.objects.create(
+            employer=cls.employer, title='Backend Developer', description='Django job', location='Remote',
+            job_type='full_time', experience_level='junior', category=cls.category,
+        )
+        cls.job.tags.set(cls.tags)
+        Job.objects.create(
+            employer=cls.employer, title='Closed role', description='-', location='Remote',
+            job_type='full_time', experience_level='junior', is_active=False,
+        )
+
+    async def sync_json(self, url):
+        """The same endpoint through the regular sync view."""
+        with override_settings(ROOT_URLCONF='config.urls'):
+            response = await sync_to_async(APIClient().get)(url)
+        return response.status_code, response.json()
+
+    async def async_json(self, url):
+        response = await self.async_client.get(url)
+        return response.status_code, json.loads(response.content)
+
+
+    async def test_job_list_matches_sync_view(self):
+        """✅ The async job list returns exactly what the sync view does, without inactive jobs."""
+        url = '/api/recruitment/jobs/'
+        status_code, data = await self.async_json(url)
+        self.assertEqual(status_code, 200)
+        self.assertEqual((status_code, data), await self.sync_json(url))
+        self.assertEqual([job['id'] for job in data], [self.job.pk])
+        self.assertEqual([tag['name'] for tag in data[0]['tags']], ['python', 'django'])
+
+
+    async def test_job_detail_matches_sync_view(self):
+        url = f'/api/recruitment/jobs/{self.job.pk}/'
+        status_code, data = await self.async_json(url)
+        self.assertEqual(status_code, 200)
+        self.assertEqual((status_code, data), await self.sync_json(url))
+
+
+    async def test_missing_or_malformed_job_is_404(self):
+        """❌ Unknown, inactive and non-numeric ids are all plain 404s."""
+        inactive = await Job.objects.filter(is_active=False).afirst()
+        for pk in (999999, inactive.pk, 'abc'):
+            status_code, data = await self.async_json(f'/api/recruitment/jobs/{pk}/')
+            self.assertEqual(status_code, 404)
+            self.assertIn('detail', data)
+
+
+    async def test_category_and_tag_views_match_sync_views(self):
+        for url in (
+            '/api/recruitment/categories/', f'/api/recruitment/categories/{self.category.pk}/',
+            '/api/recruitment/tags/', f'/api/recruitment/tags/{self.tags[0].pk}/',
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(await self.async_json(url), await self.sync_json(url))
+
+
+    async def test_writes_fall_back_to_sync_view(self):
+        """✅ POST on an async-routed URL is handled by the viewset as before."""
+        token = await AuthToken.objects.acreate(user=self.employer)
+        response = await self.async_client.post(
+            '/api/recruitment/jobs/',
+            {'title': 'Data Engineer', 'description': 'ETL', 'location': 'Berlin',
+             'job_type': 'full_time', 'experience_level': 'mid'},
+            content_type='application/json', headers={'Authorization': f'Token {token.key}'},
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(await Job.objects.filter(title='Data Engineer', employer=self.employer).aexists())
+
+
+    async def test_anonymous_write_is_rejected(self):
+        response = await self.async_client.post('/api/recruitment/jobs/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+    def test_routes_keep_their_names(self):
+        self.assertTrue(iscoroutinefunction(resolve('/api/recruitment/jobs/').func))
+        self.assertTrue(iscoroutinefunction(resolve('/api/recruitment/applications/').func))
+        self.assertFalse(iscoroutinefunction(resolve('/api/recruitment/interviews/').func))
+        self.assertEqual(reverse('job-detail', args=[self.job.pk]), f'/api/recruitment/jobs/{self.job.pk}/')
+        self.assertEqual(reverse('application-resume', args=[1]), '/api/recruitment/applications/1/resume/')
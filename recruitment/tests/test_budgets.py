@@ -0,0 +1,99 @@
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from recruitment.models import *
+from recruitment.reference import reference_data
+from recruitment.urls import router
+from core.models import User
+from core.budgets import Budget, QueryBudgetMixin
+
+
+
+class RecruitmentQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """Query budgets for every recruitment ViewSet, checked against growing datasets."""
+
+    budgets = {
+        'category-list': Budget(0),
+        'category-detail': Budget(0),
+        'tag-list': Budget(0),
+        'tag-detail': Budget(0),
+        'company-profile-list': Budget(1),
+        'company-profile-detail': Budget(1),
+        'job-list': Budget(2),
+        'job-detail': Budget(2),
+        'application-list': Budget(1),
+        'application-detail': Budget(1),
+        'interview-list': Budget(1),
+        'interview-detail': Budget(1),
+        'note-list': Budget(1),
+        'note-detail': Budget(1),
+    }
+    DATASET_SIZES = (2, 10)
+
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', email='e@test.com', password='pass', role='employer')
+        self.company = CompanyProfile.objects.create(user=self.employer, company_name='Acme', location='Berlin')
+        self.category = Category.objects.create(name='Engineering')
+        self.tags = [Tag.objects.create(name=name) for name in ('python', 'django', 'aws')]
+        self.client.force_authenticate(user=self.employer)
+
+    def seed(self, size):
+        """Grow every table the endpoints read to `size` rows."""
+        while Job.objects.count() < size:
+            index = Job.objects.count()
+            Category.objects.get_or_create(name=f'Category {index}')
+            Tag.objects.get_or_create(name=f'tag-{index}')
+            job = Job.objects.create(
+                employer=self.employer, title=f'Job {index}', description='Seeded',
+                location='Remote', job_type='full_time', experience_level='mid', category=self.category,
+            )
+            job.tags.set(self.tags)
+            applicant = User.objects.create_user(
+                username=f'applicant{index}', email=f'a{index}@test.com', password='pass', role='applicant'
+            )
+            application = Application.objects.create(
+                job=job, applicant=applicant,
+                resume=SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf"),
+            )
+            InterviewSchedule.objects.create(
+                application=application, scheduled_by=self.employer,
+                date=timezone.now() + timezone.timedelta(days=index + 1), location='Zoom',
+            )
+            ApplicantNote.objects.create(application=application, author=self.employer, note='Seeded')
+        # Reference data is reloaded once per process after a write, not per request
+        reference_data.snapshot()
+
+    def list_params(self):
+        today = timezone.now().date()
+        return {'interview': {'from': today.isoformat(), 'to': (today + timezone.timedelta(days=365)).isoformat()}}
+
+    def detail_object(self, basename):
+        model = {
+            'category': Category, 'tag': Tag, 'company-profile': CompanyProfile, 'job': Job,
+            'application': Application, 'interview': InterviewSchedule, 'note': ApplicantNote,
+        }[basename]
+        return model.objects.order_by('pk').first()
+
+
+    def test_every_registered_viewset_declares_budgets(self):
+        """📏 New ViewSets must declare list and detail budgets."""
+        for _, _, basename in router.registry:
+            self.assertIn(f'{basename}-list', self.budgets)
+            self.assertIn(f'{basename}-detail', self.budgets)
+
+
+    def test_endpoints_stay_within_budget_at_any_dataset_size(self):
+        """⚡ Query counts hold as the dataset grows, which catches N+1 regressions."""
+        for size in self.DATASET_SIZES:
+            self.seed(size)
+            for _, _, basename in router.registry:
+                with self.subTest(size=size, endpoint=f'{basename}-list'):
+                    self.assertWithinBudget(
+                        f'{basename}-list', reverse(f'{basename}-list'), data=self.list_params().get(basename)
+                    )
+                with self.subTest(size=size, endpoint=f'{basename}-detail'):
+                    url = reverse(f'{basename}-detail', kwargs={'pk': self.detail_object(basename).pk})
+                    self.assertWithinBudget(f'{basename}-detail', url)
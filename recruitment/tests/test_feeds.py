@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from recruitment.models import *
+from recruitment import feeds
+from recruitment.feeds import FEED_SALT, feed_token, get_feed, rotate_feed_token
+from core.caches import check_shared_caches
+from core.models import User
+
+
+
+@override_settings(INTERVIEW_FEED_TTL=3600)
+class InterviewFeedTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='employer', email='emp@test.com', password='pass', role='employer'
+        )
+        self.applicant = User.objects.create_user(
+            username='applicant', email='app@test.com', password='pass', role='applicant'
+        )
+        self.job = Job.objects.create(
+            employer=self.employer, title='Backend Dev', description='Build APIs',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        self.application = Application.objects.create(
+            job=self.job, applicant=self.applicant,
+            resume=SimpleUploadedFile("resume.pdf", b"%PDF-1.4 test pdf", content_type="application/pdf"),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.interview = InterviewSchedule.objects.create(
+                application=self.application, scheduled_by=self.employer,
+                date=timezone.now() + timedelta(days=2), location='Zoom, room 1',
+            )
+        self.url = reverse('interview-feed', kwargs={'token': feed_token(self.employer)})
+
+
+    def test_feed_url_is_signed_for_current_user(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(reverse('interview-feed-url'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['url'].endswith(self.url))
+
+
+    def test_feed_lists_interviews_for_every_participant(self):
+        for user in (self.employer, self.applicant):
+            response = self.client.get(reverse('interview-feed', kwargs={'token': feed_token(user)}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+            body = response.content.decode()
+            self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+            self.assertIn(f'UID:interview-{self.interview.pk}@job-board', body)
+            self.assertIn('LOCATION:Zoom\\, room 1', body)
+
+        outsider = User.objects.create_user(username='outsider', email='out@test.com', password='pass')
+        response = self.client.get(reverse('interview-feed', kwargs={'token': feed_token(outsider)}))
+        self.assertNotIn('BEGIN:VEVENT', response.content.decode())
+
+
+    def test_rotating_the_feed_url_revokes_earlier_ones(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=self.employer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('interview-feed-url'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        new_url = response.data['url'].removeprefix('http://testserver')
+        self.assertIn(f'UID:interview-{self.interview.pk}@job-board', self.client.get(new_url).content.decode())
+
+
+    def test_feeds_of_inactive_users_are_not_found(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employer.is_active = False
+            self.employer.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_tampered_token_is_not_found(self):
+        for token in ('not-a-token', signing.dumps(self.employer.pk, salt=FEED_SALT, compress=True)):
+            response = self.client.get(reverse('interview-feed', kwargs={'token': token}))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_revalidation_is_answered_from_cache(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+    def test_changes_patch_cached_feed_without_rebuilding(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.interview.location = 'Office'
+            self.interview.save()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('LOCATION:Office', response.content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.interview.delete()
+        self.assertNotIn('BEGIN:VEVENT', self.client.get(self.url).content.decode())
+
+
+    def test_batch_scheduled_interviews_reach_cached_feed(self):
+        self.client.get(self.url)
+        other = Application.objects.create(
+            job=self.job, resume='resumes/other.pdf',
+            applicant=User.objects.create_user(username='other', email='other@test.com', password='pass'),
+        )
+        start = self.interview.ends_at
+        self.client.force_authenticate(user=self.employer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('interview-batch'), {
+                'applications': [other.pk],
+                'availability': [{'start': start.isoformat(), 'end': (start + timedelta(hours=1)).isoformat()}],
+                'location': 'Zoom',
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(f"UID:interview-{response.data[0]['id']}@job-board", self.client.get(self.url).content.decode())
+
+
+    def test_feeds_built_before_a_new_interview_are_not_served(self):
+        """A feed rendered from reads older than a change is stored under a superseded version."""
+        other = Application.objects.create(
+            job=self.job, resume='resumes/other.pdf',
+            applicant=User.objects.create_user(username='other', email='other@test.com', password='pass'),
+        )
+        # A rebuild starts, the interview is committed, then the rebuild stores what it read
+        version = feeds._feed_version(self.employer.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            interview = InterviewSchedule.objects.create(
+                application=other, scheduled_by=self.employer, date=self.interview.ends_at, location='Zoom',
+            )
+        cache.set(feeds._index_key(self.employer.pk, version), (self.employer.feed_nonce, [self.interview.pk]))
+        self.assertEqual(set(get_feed(self.employer.pk)['events']), {self.interview.pk, interview.pk})
+
+
+
+class InterviewFeedConfigurationTests(APITestCase):
+
+    def test_feeds_are_rendered_per_poll_without_a_shared_cache(self):
+        """❌ Revoking a feed URL couldn't reach other workers' copies, so none are kept."""
+        # Per-process caches, as in these tests, leave the feed cache off
+        check_shared_caches()
+        employer = User.objects.create_user(username='employer', email='emp@test.com', password='pass', role='employer')
+        url = reverse('interview-feed', kwargs={'token': feed_token(employer)})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        User.objects.filter(pk=employer.pk).update(feed_nonce='rotated elsewhere')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        with override_settings(INTERVIEW_FEED_TTL=3600):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'interview calendar feed'):
+                check_shared_caches()
@@ -0,0 +1,173 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+
+from rest_framework.test import APITestCase
+
+from core.asynchronous import async_urlpatterns
+from recruitment.models import Job, Category, Tag
+from recruitment.reference import VERSION_KEY, bump_version, reference_data, shared_version
+from recruitment.urls import router
+from recruitment.views.asynchronous import async_read_views
+from core.models import User
+
+
+REFERENCE_TABLES = ('"recruitment_category"', '"recruitment_tag"')
+
+# Routes as mounted under SERVER_MODE = 'asgi', for the async test
+urlpatterns = [
+    path('api/recruitment/', include(async_urlpatterns(router.urls, async_read_views))),
+]
+
+
+def reads_reference_table(sql):
+    # Which tags a job has is job data; reading it through the join is expected
+    return any(table in sql for table in REFERENCE_TABLES) and '"recruitment_job_tags"' not in sql
+
+
+@override_settings(RESPONSE_CACHE_TTL=0)
+class ReferenceDataTests(APITestCase):
+
+    def setUp(self):
+        cache.delete(VERSION_KEY)
+        reference_data.clear()
+        self.employer = User.objects.create_user(email='employer@example.com', password='pass', role='employer')
+        self.category = Category.objects.create(name='Engineering')
+        self.tags = [Tag.objects.create(name=name) for name in ('python', 'django')]
+        self.job = Job.objects.create(
+            employer=self.employer, title='Backend Developer', description='-', location='Remote',
+            job_type='full_time', experience_level='junior', category=self.category,
+        )
+        self.job.tags.set(self.tags)
+        reference_data.snapshot()
+
+    def request(self, method, url, data=None):
+        """Response and the SQL of every query that read a reference table."""
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        return response, [query['sql'] for query in queries if reads_reference_table(query['sql'])]
+
+
+    def test_snapshot_indexes_rows_by_id_and_key(self):
+        snapshot = reference_data.snapshot()
+        self.assertEqual(snapshot.categories.by_key['engineering'], (self.category.pk, 'Engineering', 'engineering'))
+        self.assertEqual(snapshot.tags.get(self.tags[1].pk).name, 'django')
+        self.assertEqual([row.name for row in snapshot.tags.rows], ['python', 'django'])
+
+
+    def test_category_and_tag_endpoints_skip_the_database(self):
+        """⚡ Reference lists and details are answered from memory."""
+        for url in (
+            '/api/recruitment/categories/', f'/api/recruitment/categories/{self.category.pk}/',
+            '/api/recruitment/tags/', f'/api/recruitment/tags/{self.tags[0].pk}/',
+        ):
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.get('/api/recruitment/categories/').json(),
+            [{'id': self.category.pk, 'name': 'Engineering', 'slug': 'engineering'}],
+        )
+        self.assertEqual(self.client.get('/api/recruitment/tags/0/').status_code, 404)
+        self.assertEqual(self.client.get('/api/recruitment/tags/abc/').status_code, 404)
+
+
+    def test_jobs_render_categories_and_tags_from_the_snapshot(self):
+        for url in ('/api/recruitment/jobs/', f'/api/recruitment/jobs/{self.job.pk}/'):
+            response, reference_queries = self.request('get', url)
+            self.assertEqual(reference_queries, [])
+            data = response.json()
+            data = data[0] if isinstance(data, list) else data
+            self.assertEqual(data['category'], {'id': self.category.pk, 'name': 'Engineering', 'slug': 'engineering'})
+            self.assertEqual(data['tags'], [{'id': tag.pk, 'name': tag.name} for tag in self.tags])
+
+
+    def test_job_writes_validate_references_without_queries(self):
+        self.client.force_authenticate(user=self.employer)
+        response, reference_queries = self.request('post', '/api/recruitment/jobs/', {
+            'title': 'Data Engineer', 'description': 'ETL', 'location': 'Berlin', 'job_type': 'full_time',
+            'experience_level': 'mid', 'category_id': self.category.pk, 'tag_ids': [tag.pk for tag in self.tags],
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(reference_queries, [])
+        job = Job.objects.get(title='Data Engineer')
+        self.assertEqual(job.category, self.category)
+        self.assertEqual(set(job.tags.all()), set(self.tags))
+
+
+    def test_unknown_references_are_rejected(self):
+        """❌ Ids missing from the snapshot fail validation like a missing row would."""
+        self.client.force_authenticate(user=self.employer)
+        url = f'/api/recruitment/jobs/{self.job.pk}/'
+        response = self.client.patch(url, {'category_id': 999, 'tag_ids': [self.tags[0].pk, 999]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('does not exist', str(response.json()['category_id']))
+        self.assertIn('tag_ids', response.json())
+        response = self.client.patch(url, {'category_id': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_writes_reload_this_process_and_bump_the_version_on_commit(self):
+        version = shared_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            design = Category.objects.create(name='Design')
+            self.assertIn(design.pk, reference_data.snapshot().categories.by_id)
+            self.assertEqual(shared_version(), version)
+        self.assertEqual(shared_version(), version + 1)
+
+
+    @override_settings(REFERENCE_DATA_CHECK_INTERVAL=60)
+    def test_other_processes_writes_are_seen_after_the_check_interval(self):
+        # A rename by another process: the rows change and the shared version moves
+        Category.objects.filter(pk=self.category.pk).update(name='Software')
+        bump_version()
+        self.assertEqual(reference_data.snapshot().categories.get(self.category.pk).name, 'Engineering')
+        self.assertEqual(reference_data.snapshot(fresh=True).categories.get(self.category.pk).name, 'Software')
+
+
+    def test_ids_added_without_a_version_bump_are_found_in_the_database(self):
+        """✅ A tag loaded by another process whose cache this one doesn't share still validates."""
+        rust, = Tag.objects.bulk_create([Tag(name='rust')])
+        self.client.force_authenticate(user=self.employer)
+        url = f'/api/recruitment/jobs/{self.job.pk}/'
+        response = self.client.patch(url, {'tag_ids': [rust.pk]}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn(rust.pk, reference_data.snapshot().tags.by_id)
+        with self.assertNumQueries(1):
+            self.assertIsNone(reference_data.lookup('tags', 999))
+
+
+    def test_rows_missing_from_the_snapshot_render_their_id_without_queries(self):
+        ops, = Category.objects.bulk_create([Category(name='Operations', slug='operations')])
+        Job.objects.filter(pk=self.job.pk).update(category=ops)
+        response, reference_queries = self.request('get', f'/api/recruitment/jobs/{self.job.pk}/')
+        self.assertEqual(reference_queries, [])
+        self.assertEqual(response.json()['category'], {'id': ops.pk})
+
+
+    @override_settings(ROOT_URLCONF=__name__)
+    async def test_async_views_render_rows_missing_from_the_snapshot(self):
+        """The async views serialize in the event loop, where the ORM can't be used."""
+        ops, = await Category.objects.abulk_create([Category(name='Operations', slug='operations')])
+        await Job.objects.filter(pk=self.job.pk).aupdate(category=ops)
+        response = await self.async_client.get('/api/recruitment/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['category'], {'id': ops.pk})
+
+
+    def test_snapshots_are_reloaded_after_the_maximum_age(self):
+        Category.objects.filter(pk=self.category.pk).update(name='Software')
+        self.assertEqual(reference_data.snapshot().categories.get(self.category.pk).name, 'Engineering')
+        with override_settings(REFERENCE_DATA_MAX_AGE=0):
+            self.assertEqual(reference_data.snapshot().categories.get(self.category.pk).name, 'Software')
+
+
+    def test_snapshot_loaded_in_a_transaction_is_reloaded_after_it(self):
+        snapshot = reference_data.snapshot()
+        self.assertIs(reference_data.snapshot(), snapshot)
+        with mock.patch.object(connections['default'], 'in_atomic_block', False):
+            self.assertIsNot(reference_data.snapshot(), snapshot)
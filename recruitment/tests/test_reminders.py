@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from recruitment.models import *
+from recruitment.reminders import EmailReminderSender, ReminderScheduler
+from core.models import User
+
+
+
+class RecordingSender:
+
+    def __init__(self):
+        self.batches = []
+
+    def send(self, reminders):
+        self.batches.append([(interview.pk, offset) for interview, offset in reminders])
+
+
+
+class ReminderSchedulerTests(TestCase):
+
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer', email='emp@test.com', password='pass', role='employer'
+        )
+        self.applicant = User.objects.create_user(
+            username='applicant', email='app@test.com', password='pass', role='applicant'
+        )
+        self.job = Job.objects.create(
+            employer=self.employer, title='Backend Dev', description='Build APIs',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        self.application = Application.objects.create(
+            job=self.job, applicant=self.applicant,
+            resume=SimpleUploadedFile("resume.pdf", b"%PDF-1.4 test pdf", content_type="application/pdf"),
+        )
+        self.now = timezone.now()
+        self.interview = InterviewSchedule.objects.create(
+            application=self.application, scheduled_by=self.employer,
+            date=self.now + timedelta(hours=2), location='Zoom',
+        )
+        self.sender = RecordingSender()
+
+
+    def scheduler(self):
+        scheduler = ReminderScheduler(offsets=[60, 24 * 60], sender=self.sender)
+        scheduler.load(self.now)
+        return scheduler
+
+
+    def test_due_reminders_are_sent_once(self):
+        scheduler = self.scheduler()
+        # The day-before reminder was already missed when the interview was booked
+        self.assertEqual(len(scheduler), 1)
+        self.assertEqual(scheduler.tick(self.now), 0)
+
+        due = self.now + timedelta(hours=1)
+        self.assertEqual(scheduler.tick(due), 1)
+        self.assertEqual(self.sender.batches, [[(self.interview.pk, 60)]])
+        self.assertEqual(scheduler.tick(due), 0)
+
+        # A restarted scheduler consults the delivery log instead of sending again
+        restarted = ReminderScheduler(offsets=[60], sender=self.sender)
+        restarted.load(due)
+        self.assertEqual(restarted.tick(due), 0)
+        self.assertEqual(InterviewReminder.objects.count(), 1)
+
+
+    def test_rescheduled_interview_moves_its_reminders(self):
+        scheduler = self.scheduler()
+        self.interview.date = self.now + timedelta(days=2)
+        self.interview.save()
+
+        self.assertEqual(scheduler.sync(self.now), 1)
+        self.assertEqual(scheduler.tick(self.now + timedelta(hours=1)), 0)
+        self.assertEqual(scheduler.tick(self.now + timedelta(days=1)), 1)
+        self.assertEqual(scheduler.tick(self.now + timedelta(days=2) - timedelta(minutes=60)), 1)
+        self.assertEqual(self.sender.batches, [[(self.interview.pk, 24 * 60)], [(self.interview.pk, 60)]])
+
+
+    def test_deleted_interview_is_dropped_lazily(self):
+        scheduler = self.scheduler()
+        self.interview.delete()
+        scheduler.sync(self.now)
+        self.assertIsNone(scheduler.next_due())
+        self.assertEqual(scheduler.tick(self.now + timedelta(hours=1)), 0)
+
+
+    def test_non_date_edits_are_not_logged(self):
+        InterviewChange.objects.all().delete()
+        self.interview.location = 'Office'
+        self.interview.save()
+        self.assertFalse(InterviewChange.objects.exists())
+
+
+    def test_reminders_are_delivered_in_batches(self):
+        applicants = [
+            User.objects.create_user(username=f'a{index}', email=f'a{index}@test.com', password='pass')
+            for index in range(5)
+        ]
+        for index, applicant in enumerate(applicants):
+            InterviewSchedule.objects.create(
+                application=Application.objects.create(job=self.job, applicant=applicant, resume='resumes/x.pdf'),
+                scheduled_by=self.employer, date=self.now + timedelta(hours=2, minutes=index * 10), location='Zoom',
+            )
+        scheduler = ReminderScheduler(offsets=[60], sender=self.sender, batch_size=4)
+        scheduler.load(self.now)
+        self.assertEqual(scheduler.tick(self.now + timedelta(hours=2)), 6)
+        self.assertEqual([len(batch) for batch in self.sender.batches], [4, 2])
+
+
+    def test_email_sender_writes_one_message_per_reminder(self):
+        EmailReminderSender().send([(self.interview, 60)])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['app@test.com', 'emp@test.com'])
+        self.assertIn('Backend Dev', mail.outbox[0].subject)
+
+
+    @override_settings(INTERVIEW_REMINDER_OFFSETS=[121])
+    def test_command_sends_due_reminders_once(self):
+        out = StringIO()
+        call_command('send_interview_reminders', '--once', stdout=out)
+        self.assertIn('Sent 1 reminder(s)', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from recruitment.models import *
+from recruitment.scheduling import assign_slots, free_slots, merge_windows
+from core.models import User
+
+
+
+def at(hour, minute=0):
+    return datetime(2030, 1, 7, hour, minute, tzinfo=dt_timezone.utc)
+
+
+
+class SlotAssignmentTests(TestCase):
+
+    def test_free_slots_are_gaps_between_busy_intervals(self):
+        busy = [(at(10), at(11)), (at(13), at(14))]
+        self.assertEqual(
+            free_slots(busy, at(9), at(15), timedelta(hours=1)),
+            [(at(9), at(10)), (at(11), at(13)), (at(14), at(15))],
+        )
+
+
+    def test_merge_windows_coalesces_overlaps(self):
+        self.assertEqual(
+            merge_windows([(at(12), at(14)), (at(9), at(11)), (at(10), at(12))]),
+            [(at(9), at(14))],
+        )
+
+
+    def test_assign_slots_fills_earliest_free_slots_in_order(self):
+        windows = [(at(13), at(15)), (at(9), at(11))]
+        busy = [(at(9), at(10))]
+        assignments = assign_slots(['a', 'b', 'c', 'd'], windows, busy, timedelta(hours=1))
+        self.assertEqual(assignments, [
+            ('a', at(10), at(11)),
+            ('b', at(13), at(14)),
+            ('c', at(14), at(15)),
+        ])
+
+
+
+class BatchInterviewSchedulingTests(APITestCase):
+
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer', email='emp@test.com', password='pass', role='employer'
+        )
+        self.colleague = User.objects.create_user(
+            username='colleague', email='colleague@test.com', password='pass', role='employer'
+        )
+        self.job = Job.objects.create(
+            employer=self.employer, title='Backend Dev', description='Build APIs',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        self.applications = [
+            Application.objects.create(
+                job=self.job,
+                applicant=User.objects.create_user(
+                    username=f'applicant{index}', email=f'applicant{index}@test.com', password='pass', role='applicant'
+                ),
+                resume=SimpleUploadedFile("resume.pdf", b"%PDF-1.4 test pdf", content_type="application/pdf"),
+            )
+            for index in range(5)
+        ]
+        self.day = (timezone.now() + timedelta(days=7)).replace(hour=9, minute=0, second=0, microsecond=0)
+        self.url = reverse('interview-batch')
+        self.client.force_authenticate(user=self.employer)
+
+
+    def payload(self, **overrides):
+        data = {
+            'applications': [application.pk for application in self.applications],
+            'availability': [
+                {'start': self.day.isoformat(), 'end': (self.day + timedelta(hours=4)).isoformat()},
+                {'start': (self.day + timedelta(hours=5)).isoformat(), 'end': (self.day + timedelta(hours=7)).isoformat()},
+            ],
+            'duration_minutes': 60,
+            'location': 'Zoom',
+        }
+        data.update(overrides)
+        return data
+
+
+    def test_batch_assigns_earliest_slots_around_existing_bookings(self):
+        other_job = Job.objects.create(
+            employer=self.employer, title='Other', description='x',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        InterviewSchedule.objects.create(
+            application=Application.objects.create(job=other_job, applicant=self.colleague, resume='resumes/x.pdf'),
+            scheduled_by=self.employer, date=self.day, location='Office',
+        )
+
+        response = self.client.post(self.url, self.payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 5)
+
+        hour = timedelta(hours=1)
+        scheduled = InterviewSchedule.objects.filter(application__in=self.applications)
+        self.assertEqual(
+            sorted(scheduled.values_list('scheduled_by', 'date')),
+            sorted([
+                (self.employer.pk, self.day + hour),
+                (self.employer.pk, self.day + 2 * hour),
+                (self.employer.pk, self.day + 3 * hour),
+                (self.employer.pk, self.day + 5 * hour),
+                (self.employer.pk, self.day + 6 * hour),
+            ]),
+        )
+        self.assertTrue(all(interview.ends_at == interview.date + hour for interview in scheduled))
+        self.assertEqual(
+            set(Application.objects.filter(pk__in=[a.pk for a in self.applications]).values_list('status', flat=True)),
+            {'interview'},
+        )
+
+
+    def test_batch_query_count_does_not_grow_with_applications(self):
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, self.payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+    def test_batch_is_all_or_nothing_when_slots_run_out(self):
+        availability = [{'start': self.day.isoformat(), 'end': (self.day + timedelta(hours=2)).isoformat()}]
+        response = self.client.post(self.url, self.payload(availability=availability), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(InterviewSchedule.objects.exists())
+        self.assertFalse(Application.objects.filter(status='interview').exists())
+
+
+    def test_batch_rejects_foreign_or_already_scheduled_applications(self):
+        outsider = User.objects.create_user(username='outsider', email='out@test.com', password='pass', role='employer')
+        self.client.force_authenticate(user=outsider)
+        response = self.client.post(self.url, self.payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('applications', response.data)
+
+
+    def test_batch_books_only_the_requesting_employers_calendar(self):
+        """🚫 Another employer's bookings neither block slots nor receive any."""
+        colleague_job = Job.objects.create(
+            employer=self.colleague, title='Other', description='x',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        InterviewSchedule.objects.create(
+            application=Application.objects.create(job=colleague_job, applicant=self.employer, resume='resumes/x.pdf'),
+            scheduled_by=self.colleague, date=self.day, location='Office',
+        )
+        response = self.client.post(self.url, self.payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        scheduled = InterviewSchedule.objects.filter(application__in=self.applications)
+        self.assertEqual(set(scheduled.values_list('scheduled_by', flat=True)), {self.employer.pk})
+        self.assertEqual(min(scheduled.values_list('date', flat=True)), self.day)
+
+
+    def test_applicant_cannot_batch_schedule(self):
+        self.client.force_authenticate(user=self.applications[0].applicant)
+        response = self.client.post(self.url, self.payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
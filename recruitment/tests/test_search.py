@@ -0,0 +1,117 @@
+import zlib
+
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from recruitment.models import *
+from recruitment.search import tokenize, extract_resume_text, search_applications
+from core.models import User
+
+
+
+def make_pdf(text):
+    stream = zlib.compress(f'BT /F1 12 Tf ({text}) Tj ET'.encode('latin-1'))
+    return b'%PDF-1.4\n1 0 obj\n<< /Filter /FlateDecode >>\nstream\n' + stream + b'\nendstream\nendobj\n%%EOF\n'
+
+
+
+class TokenizerTests(TestCase):
+
+    def test_tokenize_lowercases_and_drops_stop_words(self):
+        self.assertEqual(tokenize("The Django and REST expert"), ['django', 'rest', 'expert'])
+
+
+    def test_tokenize_keeps_language_tokens(self):
+        self.assertEqual(tokenize("C++, C# and Node.js."), ['c++', 'c#', 'node.js'])
+
+
+    def test_extract_text_from_compressed_pdf(self):
+        resume = SimpleUploadedFile("cv.pdf", make_pdf("Kubernetes Terraform"), content_type="application/pdf")
+        self.assertIn("Kubernetes Terraform", extract_resume_text(resume))
+
+
+
+class ApplicationSearchTests(APITestCase):
+
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', email='e@test.com', password='pass', role='employer')
+        self.other_employer = User.objects.create_user(username='other', email='o@test.com', password='pass', role='employer')
+        self.alice = User.objects.create_user(username='alice', email='alice@test.com', password='pass', role='applicant')
+        self.bob = User.objects.create_user(username='bob', email='bob@test.com', password='pass', role='applicant')
+
+        self.job = Job.objects.create(
+            employer=self.employer, title='Platform Engineer', description='Infra',
+            location='Remote', job_type='full_time', experience_level='senior'
+        )
+        self.other_job = Job.objects.create(
+            employer=self.other_employer, title='SRE', description='Infra',
+            location='Remote', job_type='full_time', experience_level='senior'
+        )
+
+        self.alice_app = Application.objects.create(
+            job=self.job, applicant=self.alice,
+            resume=SimpleUploadedFile("alice.pdf", make_pdf("Python Kubernetes Terraform"), content_type="application/pdf"),
+            cover_letter="I run Kubernetes clusters in production."
+        )
+        self.bob_app = Application.objects.create(
+            job=self.job, applicant=self.bob,
+            resume=SimpleUploadedFile("bob.txt", b"Python Django developer", content_type="text/plain"),
+            cover_letter="Backend developer."
+        )
+        self.foreign_app = Application.objects.create(
+            job=self.other_job, applicant=self.alice,
+            resume=SimpleUploadedFile("alice2.pdf", make_pdf("Kubernetes"), content_type="application/pdf"),
+            cover_letter="Kubernetes again."
+        )
+
+        self.url = reverse('application-list')
+
+
+    def test_index_is_built_on_create_inside_employer_partition(self):
+        """✅ Postings are written on create and carry the job owner's id."""
+        terms = ApplicationSearchTerm.objects.filter(application=self.alice_app)
+        self.assertTrue(terms.filter(term='kubernetes', employer=self.employer).exists())
+        self.assertFalse(ApplicationSearchTerm.objects.filter(application=self.foreign_app, employer=self.employer).exists())
+
+
+    def test_employer_search_is_ranked(self):
+        """✅ Applications matching more terms come first."""
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url, {'q': 'python kubernetes'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([app['id'] for app in response.data], [self.alice_app.id, self.bob_app.id])
+
+
+    def test_search_never_leaks_other_employers_applications(self):
+        """🔒 Matching applications to another employer's jobs are not returned."""
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url, {'q': 'kubernetes'})
+        self.assertEqual([app['id'] for app in response.data], [self.alice_app.id])
+
+
+    def test_cover_letter_update_reindexes_application(self):
+        """🔁 Editing the cover letter updates the postings incrementally."""
+        self.bob_app.cover_letter = "Happy to learn Rust."
+        self.bob_app.save()
+        results = search_applications(Application.objects.all(), self.employer, 'rust')
+        self.assertEqual(list(results), [self.bob_app])
+        self.assertFalse(search_applications(Application.objects.all(), self.employer, 'backend').exists())
+
+
+    def test_status_change_does_not_reindex(self):
+        """⚡ Saving without touching indexed text leaves the postings alone."""
+        ApplicationSearchTerm.objects.filter(application=self.bob_app).update(weight=7)
+        application = Application.objects.get(pk=self.bob_app.pk)
+        application.status = 'reviewed'
+        application.save()
+        self.assertFalse(ApplicationSearchTerm.objects.filter(application=self.bob_app).exclude(weight=7).exists())
+
+
+    def test_blank_query_returns_nothing(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url, {'q': 'the and'})
+        self.assertEqual(response.data, [])
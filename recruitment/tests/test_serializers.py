@@ -77,6 +77,23 @@ class ApplicationSerializerTests(TestCase):
         self.assertIn('non_field_errors', serializer.errors)
 
 
+    def test_concurrent_duplicate_is_rejected_by_unique_index(self):
+        """🏁 If two submissions both pass validation, the losing insert becomes a validation error."""
+        data = {
+            'job_id': self.job.id,
+            'resume': SimpleUploadedFile("resume.pdf", b"%PDF-1.4 first", content_type="application/pdf"),
+        }
+        serializer = ApplicationSerializer(data=data, context={'request': self.get_request()})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        # The competing request commits between validation and insert
+        Application.objects.create(job=self.job, applicant=self.user, resume=self.resume_file)
+
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.assertEqual(Application.objects.filter(job=self.job, applicant=self.user).count(), 1)
+
+
     def test_applicant_is_hidden_field(self):
         """🔒 Applicant should be auto-set from the request context."""
         data = {
@@ -1,7 +1,16 @@
+import io
+import zipfile
+from types import SimpleNamespace
+from unittest import mock
 from datetime import date
 from decimal import Decimal
 
-from django.urls import reverse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import re_path, reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 
@@ -10,7 +19,16 @@ from rest_framework.test import APITestCase
 
 from recruitment.models import *
 from recruitment.serializers import *
+from recruitment.views import ApplicationViewSet
+from core.downloads import serve_media
 from core.models import User  
+from core.mixins import build_query_plan
+
+
+# The development media route, which config.urls only mounts with DEBUG
+urlpatterns = [
+    re_path(r'^media/(?P<path>.*)$', serve_media),
+]
 
 
 
@@ -180,13 +198,60 @@ class InterviewScheduleViewSetTests(APITestCase):
         self.url = reverse('interview-list')
 
 
+    def window(self, days=7):
+        today = timezone.now().date()
+        return {'from': today.isoformat(), 'to': (today + timezone.timedelta(days=days)).isoformat()}
+
+
     def test_authenticated_user_can_list_interviews(self):
         self.client.force_authenticate(user=self.employer)
-        response = self.client.get(self.url)
+        response = self.client.get(self.url, self.window())
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) >= 1
 
 
+    def test_list_requires_date_window(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'from' in response.data
+
+
+    def test_list_rejects_oversized_or_inverted_window(self):
+        self.client.force_authenticate(user=self.employer)
+        assert self.client.get(self.url, self.window(days=400)).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.client.get(self.url, {'from': '2030-01-02', 'to': '2030-01-01'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.client.get(self.url, {'from': 'soon', 'to': '2030-01-01'}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+    def test_list_only_returns_interviews_inside_window(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url, self.window(days=1))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+
+    def test_interviews_are_scoped_to_job_owner_and_applicant(self):
+        outsider = User.objects.create_user(username='outsider', email='out@test.com', password='pass', role='employer')
+        other_applicant = User.objects.create_user(username='other', email='other@test.com', password='pass', role='applicant')
+
+        self.client.force_authenticate(user=self.applicant)
+        assert len(self.client.get(self.url, self.window()).data) == 1
+
+        for user in (outsider, other_applicant):
+            self.client.force_authenticate(user=user)
+            assert self.client.get(self.url, self.window()).data == []
+            detail_url = reverse('interview-detail', kwargs={'pk': self.interview.pk})
+            assert self.client.get(detail_url).status_code == status.HTTP_404_NOT_FOUND
+
+
+    def test_calendar_mode_returns_compact_rows(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url, dict(self.window(), mode='calendar'))
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data[0]) == {'id', 'date', 'location', 'meeting_link'}
+
+
     def test_authenticated_user_can_retrieve_interview(self):
         self.client.force_authenticate(user=self.employer)
         detail_url = reverse('interview-detail', kwargs={'pk': self.interview.pk})
@@ -224,6 +289,58 @@ class InterviewScheduleViewSetTests(APITestCase):
         assert response.status_code == status.HTTP_201_CREATED
 
 
+    def test_overlapping_interview_for_same_interviewer_is_rejected(self):
+        self.client.force_authenticate(user=self.employer)
+        other = Application.objects.create(job=self.job, applicant=User.objects.create_user(
+            username='second', email='second@test.com', password='pass', role='applicant'
+        ), resume=self.resume)
+        data = {
+            'application': other.id,
+            'date': (self.interview.date + timezone.timedelta(minutes=30)).isoformat(),
+            'location': 'Zoom',
+        }
+        response = self.client.post(self.url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'date' in response.data
+
+        # Back-to-back interviews don't overlap
+        data['date'] = self.interview.ends_at.isoformat()
+        response = self.client.post(self.url, data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['ends_at'] is not None
+
+        # Moving the second interview onto the first one is a conflict too
+        detail_url = reverse('interview-detail', kwargs={'pk': response.data['id']})
+        moved = self.client.patch(detail_url, {'date': self.interview.date.isoformat()}, format='json')
+        assert moved.status_code == status.HTTP_400_BAD_REQUEST
+
+
+    def test_rescheduling_does_not_conflict_with_itself(self):
+        self.client.force_authenticate(user=self.employer)
+        detail_url = reverse('interview-detail', kwargs={'pk': self.interview.pk})
+        new_date = self.interview.date + timezone.timedelta(minutes=15)
+        response = self.client.patch(detail_url, {'date': new_date.isoformat(), 'duration_minutes': 90}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        self.interview.refresh_from_db()
+        assert self.interview.ends_at == new_date + timezone.timedelta(minutes=90)
+
+
+    def test_free_slots_skip_booked_interviews(self):
+        self.client.force_authenticate(user=self.employer)
+        start = self.interview.date - timezone.timedelta(hours=2)
+        end = self.interview.date + timezone.timedelta(hours=3)
+        url = reverse('interview-free-slots')
+        response = self.client.get(url, {'from': start.isoformat(), 'to': end.isoformat(), 'duration': 60})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['slots'] == [
+            {'start': start, 'end': self.interview.date},
+            {'start': self.interview.ends_at, 'end': end},
+        ]
+
+        response = self.client.get(url, {'from': start.isoformat(), 'to': end.isoformat(), 'duration': 0})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
     def test_applicant_cannot_schedule_interview(self):
         self.client.force_authenticate(user=self.applicant)
         data = {
@@ -238,6 +355,33 @@ class InterviewScheduleViewSetTests(APITestCase):
         assert response.status_code in [status.HTTP_403_FORBIDDEN, status.HTTP_400_BAD_REQUEST]
 
 
+    def test_interviews_cannot_be_created_on_foreign_applications(self):
+        outsider = User.objects.create_user(username='outsider', email='out@test.com', password='pass', role='employer')
+        foreign = Application.objects.create(job=self.job, applicant=User.objects.create_user(
+            username='second', email='second@test.com', password='pass', role='applicant'
+        ), resume=self.resume)
+        data = {'application': foreign.id, 'date': (timezone.now() + timezone.timedelta(days=5)).isoformat(), 'location': 'Zoom'}
+
+        self.client.force_authenticate(user=outsider)
+        response = self.client.post(self.url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'application' in response.data
+
+        self.client.force_authenticate(user=foreign.applicant)
+        response = self.client.post(self.url, data, format='json')
+        assert response.status_code in [status.HTTP_403_FORBIDDEN, status.HTTP_400_BAD_REQUEST]
+        assert not InterviewSchedule.objects.filter(application=foreign).exists()
+
+
+    def test_employer_listing_uses_the_scheduler_index(self):
+        self.client.force_authenticate(user=self.employer)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, self.window())
+        interview_queries = [query['sql'] for query in queries if 'FROM "recruitment_interviewschedule"' in query['sql']]
+        assert '"recruitment_interviewschedule"."scheduled_by_id" =' in interview_queries[0]
+        assert '"recruitment_job"."employer_id" =' not in interview_queries[0]
+
+
     def test_anonymous_user_cannot_access(self):
         response = self.client.get(self.url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -650,3 +794,319 @@ class JobViewSetTests(APITestCase):
         self.client.force_authenticate(user=self.applicant)
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+
+class ResumeDownloadTests(APITestCase):
+
+    CONTENT = b"%PDF-1.4\n0123456789abcdef\n%%EOF\n"
+
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', email='e@test.com', password='pass', role='employer')
+        self.other_employer = User.objects.create_user(username='other', email='o@test.com', password='pass', role='employer')
+        self.applicant = User.objects.create_user(
+            username='applicant', email='a@test.com', password='pass', role='applicant',
+            first_name='Ada', last_name='Lovelace'
+        )
+        self.job = Job.objects.create(
+            employer=self.employer, title='Backend Developer', description='Django job',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        self.application = Application.objects.create(
+            job=self.job, applicant=self.applicant,
+            resume=SimpleUploadedFile("upload.pdf", self.CONTENT, content_type="application/pdf"),
+        )
+        self.url = reverse('application-resume', kwargs={'pk': self.application.pk})
+
+    def download(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+
+    def test_employer_downloads_resume_named_after_applicant(self):
+        """✅ The job owner gets the file as an attachment named after the applicant."""
+        self.client.force_authenticate(user=self.employer)
+        response, body = self.download()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(body, self.CONTENT)
+        self.assertIn('ada-lovelace', response['Content-Disposition'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+
+
+    def test_other_employer_cannot_download(self):
+        """🔒 Employers can't fetch resumes for jobs they don't own."""
+        self.client.force_authenticate(user=self.other_employer)
+        response, _ = self.download()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_anonymous_cannot_download(self):
+        response, _ = self.download()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_range_request_returns_partial_content(self):
+        """📦 A single byte range is served as 206 with the exact slice."""
+        self.client.force_authenticate(user=self.applicant)
+        response, body = self.download(HTTP_RANGE='bytes=9-14')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(body, self.CONTENT[9:15])
+        self.assertEqual(response['Content-Range'], f'bytes 9-14/{len(self.CONTENT)}')
+        self.assertEqual(response['Content-Length'], '6')
+
+
+    def test_suffix_range_and_unsatisfiable_range(self):
+        self.client.force_authenticate(user=self.applicant)
+        response, body = self.download(HTTP_RANGE='bytes=-6')
+        self.assertEqual(body, self.CONTENT[-6:])
+        response, _ = self.download(HTTP_RANGE='bytes=999-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+
+    def test_if_none_match_returns_304(self):
+        """⚡ Revalidation with a matching ETag skips the body."""
+        self.client.force_authenticate(user=self.applicant)
+        response, _ = self.download()
+        response, body = self.download(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(body, b'')
+
+
+    def test_x_accel_redirect_handoff(self):
+        """🚀 In nginx mode the body is delegated to the web server."""
+        self.client.force_authenticate(user=self.employer)
+        with self.settings(PROTECTED_MEDIA_SERVER='x-accel-redirect', PROTECTED_MEDIA_INTERNAL_URL='/protected/'):
+            response, body = self.download()
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/' + self.application.resume.name)
+        self.assertEqual(body, b'')
+
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_development_media_route_never_serves_resumes(self):
+        """🔒 Paths that normalize into resumes/ are refused like the plain one."""
+        name = self.application.resume.name
+        for url in (
+            f'/media/{name}', f'/media//{name}', f'/media/./{name}',
+            f'/media/a/../{name}', f'/media/resumes/../{name}', '/media/../config/settings.py',
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, url)
+        logo = SimpleUploadedFile('logo.png', b'png', content_type='image/png')
+        company = CompanyProfile.objects.create(user=self.employer, company_name='Acme', location='Remote', logo=logo)
+        self.addCleanup(company.logo.delete, save=False)
+        response = self.client.get(f'/media/./{company.logo.name}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'png')
+
+
+    def test_serializer_exposes_download_url(self):
+        self.client.force_authenticate(user=self.applicant)
+        response = self.client.get(reverse('application-detail', kwargs={'pk': self.application.pk}))
+        self.assertTrue(response.data['resume_download_url'].endswith(self.url))
+
+
+
+class JobResumesZipTests(APITestCase):
+
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', email='e@test.com', password='pass', role='employer')
+        self.other_employer = User.objects.create_user(username='other', email='o@test.com', password='pass', role='employer')
+        self.job = Job.objects.create(
+            employer=self.employer, title='Data Engineer', description='Pipelines',
+            location='Remote', job_type='full_time', experience_level='mid'
+        )
+        self.applications = []
+        for index in range(3):
+            applicant = User.objects.create_user(
+                username=f'applicant{index}', email=f'a{index}@test.com', password='pass', role='applicant'
+            )
+            self.applications.append(Application.objects.create(
+                job=self.job, applicant=applicant,
+                resume=SimpleUploadedFile(f"cv{index}.pdf", f"%PDF-1.4 resume {index}".encode(), content_type="application/pdf"),
+            ))
+        self.url = reverse('job-resumes-zip', kwargs={'pk': self.job.pk})
+
+
+    def test_owner_gets_streamed_archive_named_after_applicants(self):
+        """📦 The archive is streamed and holds one resume per applicant."""
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('data-engineer-resumes.zip', response['Content-Disposition'])
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        names = archive.namelist()
+        self.assertEqual(names, [app.get_resume_filename() for app in self.applications])
+        self.assertTrue(names[0].startswith('applicant0-'))
+        self.assertEqual(archive.read(names[2]), b"%PDF-1.4 resume 2")
+        self.assertIsNone(archive.testzip())
+
+
+    def test_other_employer_cannot_export(self):
+        """🔒 Only the job owner may export its resumes."""
+        self.client.force_authenticate(user=self.other_employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_applicant_cannot_export(self):
+        self.client.force_authenticate(user=self.applications[0].applicant)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+
+class IdempotentApplicationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(username='employer', email='e@test.com', password='pass', role='employer')
+        self.applicant = User.objects.create_user(username='applicant', email='a@test.com', password='pass', role='applicant')
+        self.job = Job.objects.create(
+            employer=self.employer, title='Mobile Dev', description='Flutter',
+            location='Remote', job_type='full_time', experience_level='junior'
+        )
+        self.url = reverse('application-list')
+        self.client.force_authenticate(user=self.applicant)
+
+    def submit(self, key, cover_letter='Retry me', **headers):
+        data = {
+            'job_id': self.job.id,
+            'resume': SimpleUploadedFile("resume.pdf", b"%PDF-1.4 mobile resume", content_type="application/pdf"),
+            'cover_letter': cover_letter,
+        }
+        return self.client.post(self.url, data, format='multipart', HTTP_IDEMPOTENCY_KEY=key, **headers)
+
+
+    def test_retry_is_replayed_without_touching_the_database(self):
+        """🔁 A retried POST returns the original response from the store."""
+        first = self.submit('key-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0), \
+                mock.patch('rest_framework.parsers.MultiPartParser.parse') as parse:
+            second = self.submit('key-1')
+        parse.assert_not_called()
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Application.objects.filter(job=self.job).count(), 1)
+
+
+    def test_key_reused_for_different_request_is_rejected(self):
+        """🚫 The same key with a different payload is a client error."""
+        self.submit('key-2')
+        response = self.submit('key-2', cover_letter='A much longer and therefore different cover letter')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+    def test_same_length_payload_with_a_different_digest_is_rejected(self):
+        """🚫 Bodies of equal length are told apart by the digest the client sends."""
+        self.submit('key-5', cover_letter='Retry me', HTTP_CONTENT_DIGEST='sha-256=:bWU=:')
+        response = self.submit('key-5', cover_letter='Retry us', HTTP_CONTENT_DIGEST='sha-256=:dXM=:')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+    @override_settings(IDEMPOTENCY_PENDING_TTL=45)
+    def test_in_flight_claim_expires_quickly(self):
+        """⏳ Only the finished response is kept for the full TTL; a pending claim is short-lived."""
+        with mock.patch('core.idempotency.cache.add', wraps=cache.add) as add, \
+                mock.patch('core.idempotency.cache.set', wraps=cache.set) as set_:
+            self.submit('key-6')
+        cache_key = ApplicationViewSet(basename='application').get_idempotency_cache_key(
+            SimpleNamespace(user=self.applicant), 'key-6'
+        )
+        self.assertIn(45, [call.args[2] for call in add.call_args_list if call.args[0] == cache_key])
+        self.assertIn(
+            settings.IDEMPOTENCY_KEY_TTL, [call.args[2] for call in set_.call_args_list if call.args[0] == cache_key]
+        )
+
+
+    def test_in_flight_key_returns_conflict(self):
+        """⏳ A retry that races the original request gets 409 instead of a second insert."""
+        self.submit('key-3')
+        cache_key = ApplicationViewSet(basename='application').get_idempotency_cache_key(
+            SimpleNamespace(user=self.applicant), 'key-3'
+        )
+        cache.set(cache_key, dict(cache.get(cache_key), state='pending'))
+
+        response = self.submit('key-3')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Application.objects.filter(job=self.job).count(), 1)
+
+
+    def test_failed_request_releases_key(self):
+        """♻️ Validation failures don't pin the key, so a corrected retry goes through."""
+        self.client.force_authenticate(user=self.employer)
+        self.assertEqual(self.submit('key-4').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.applicant)
+        self.assertEqual(self.submit('key-4').status_code, status.HTTP_201_CREATED)
+
+
+
+class SerializerQueryPlanTests(APITestCase):
+    """Related data read by serializers is joined up front, so list queries don't grow with rows."""
+
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', email='e@test.com', password='pass', role='employer')
+        self.job = Job.objects.create(
+            employer=self.employer, title='QA Engineer', description='Testing',
+            location='Remote', job_type='full_time', experience_level='mid'
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def add_applications(self, count):
+        for _ in range(count):
+            index = Application.objects.count()
+            applicant = User.objects.create_user(
+                username=f'applicant{index}', email=f'a{index}@test.com', password='pass', role='applicant'
+            )
+            application = Application.objects.create(
+                job=self.job, applicant=applicant,
+                resume=SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf"),
+            )
+            InterviewSchedule.objects.create(
+                application=application, scheduled_by=self.employer,
+                date=timezone.now() + timezone.timedelta(days=index + 1), location='Zoom'
+            )
+            ApplicantNote.objects.create(application=application, author=self.employer, note='Strong')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+
+    def test_interview_list_query_count_is_constant(self):
+        today = timezone.now().date()
+        url = reverse('interview-list') + f'?from={today}&to={today + timezone.timedelta(days=30)}'
+        self.add_applications(1)
+        small = self.count_queries(url)
+        self.add_applications(5)
+        self.assertEqual(self.count_queries(url), small)
+
+
+    def test_note_list_query_count_is_constant(self):
+        self.add_applications(1)
+        small = self.count_queries(reverse('note-list'))
+        self.add_applications(5)
+        self.assertEqual(self.count_queries(reverse('note-list')), small)
+
+
+    def test_plan_selects_dotted_sources_and_prefetches_nested_many(self):
+        plan = build_query_plan(InterviewScheduleSerializer(context={}), InterviewSchedule)
+        self.assertEqual(plan.select_related, {'application', 'application__applicant', 'application__job'})
+        self.assertIn('application__applicant__username', plan.only)
+        self.assertTrue(plan.complete)
+
+        plan = build_query_plan(JobListSerializer(context={}), Job)
+        # Categories come from the reference snapshot, so only the foreign key is loaded
+        self.assertEqual(plan.select_related, {'employer'})
+        self.assertIn('category', plan.only)
+        self.assertEqual(plan.prefetch_related, {'tags'})
+        self.assertNotIn('description', plan.only)
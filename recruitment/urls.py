@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
@@ -9,7 +10,10 @@ from recruitment.views import (
     ApplicationViewSet,
     InterviewScheduleViewSet,
     ApplicantNoteViewSet,
+    interview_feed,
 )
+from recruitment.views.asynchronous import async_read_views, offloaded_views
+from core.asynchronous import async_urlpatterns
 
 
 
@@ -24,6 +28,11 @@ router.register(r'notes', ApplicantNoteViewSet, basename='note')
 
 
 
+router_urls = router.urls
+if settings.SERVER_MODE == 'asgi':
+    router_urls = async_urlpatterns(router_urls, async_read_views, offloaded=offloaded_views)
+
 urlpatterns = [
-    path('', include(router.urls)),
+    path('interviews/feed/<str:token>.ics', interview_feed, name='interview-feed'),
+    path('', include(router_urls)),
 ]
@@ -1,2 +1,3 @@
 from .job import *
 from .application import *
+from .feed import *
@@ -1,19 +1,41 @@
-from rest_framework import viewsets, permissions
-from rest_framework.exceptions import PermissionDenied
+from datetime import datetime, time, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 
 from recruitment.models import Application, InterviewSchedule, ApplicantNote
-from recruitment.serializers import ApplicationSerializer, InterviewScheduleSerializer, ApplicantNoteSerializer
+from recruitment.serializers import (
+    ApplicationSerializer, InterviewScheduleSerializer, InterviewCalendarSerializer,
+    BatchInterviewScheduleSerializer, ApplicantNoteSerializer,
+)
+from recruitment.feeds import feed_token, rotate_feed_token
+from recruitment.search import search_applications
+from recruitment.scheduling import busy_intervals, free_slots
+from core.downloads import serve_file
+from core.idempotency import IdempotentCreateMixin
+from core.mixins import SerializerQueryPlanMixin
 
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(SerializerQueryPlanMixin, IdempotentCreateMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'employer':
-            return Application.objects.filter(job__employer=user).select_related('job', 'applicant')
+            queryset = Application.objects.filter(job__employer=user).select_related('job', 'applicant')
+            query = self.request.query_params.get('q')
+            if query and self.action == 'list':
+                # Ranked full-text search, served from the employer's partition of the index
+                queryset = search_applications(queryset, user, query)
+            return queryset
         return Application.objects.filter(applicant=user).select_related('job')
 
     def perform_create(self, serializer):
@@ -21,16 +43,149 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only applicants can submit applications.")
         serializer.save(applicant=self.request.user)
 
+    @action(detail=True, methods=['get'])
+    def resume(self, request, pk=None):
+        """Download the resume; visible only to the applicant and the job's employer."""
+        application = self.get_object()
+        return serve_file(request, application.resume, filename=application.get_resume_filename())
+
 
 
-class InterviewScheduleViewSet(viewsets.ModelViewSet):
-    queryset = InterviewSchedule.objects.select_related('application', 'scheduled_by', 'application__job')
+class InterviewScheduleViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
+    """
+    Interviews visible to the current user: employers see the interviews they scheduled
+    (always for their own jobs, served by the (scheduled_by, date) index), applicants see
+    their own; only employers write them. Listing requires a `?from=&to=` window (dates or datetimes,
+    `to` inclusive for plain dates) of at most MAX_WINDOW_DAYS; `?mode=calendar` returns
+    only id, date, location and meeting link.
+    """
     serializer_class = InterviewScheduleSerializer
     permission_classes = [permissions.IsAuthenticated]
+    MAX_WINDOW_DAYS = 366
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.request.query_params.get('mode') == 'calendar':
+            return InterviewCalendarSerializer
+        if self.action == 'batch':
+            return BatchInterviewScheduleSerializer
+        return InterviewScheduleSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == 'employer':
+            queryset = InterviewSchedule.objects.filter(scheduled_by=user)
+        else:
+            queryset = InterviewSchedule.objects.filter(application__applicant=user)
+        if self.action == 'list':
+            start, end = self.get_date_window()
+            queryset = queryset.filter(date__gte=start, date__lt=end)
+        return queryset
+
+    def perform_create(self, serializer):
+        if self.request.user.role != 'employer':
+            raise PermissionDenied("Only employers can schedule interviews.")
+        serializer.save()
 
+    def perform_update(self, serializer):
+        if self.request.user.role != 'employer':
+            raise PermissionDenied("Only employers can reschedule interviews.")
+        serializer.save()
 
+    def perform_destroy(self, instance):
+        if self.request.user.role != 'employer':
+            raise PermissionDenied("Only employers can cancel interviews.")
+        instance.delete()
 
-class ApplicantNoteViewSet(viewsets.ModelViewSet):
+    def get_date_window(self):
+        params = self.request.query_params
+        start = self._parse_bound('from', params.get('from'))
+        end = self._parse_bound('to', params.get('to'), inclusive=True)
+        if end <= start:
+            raise ValidationError({'to': "Must be later than 'from'."})
+        if end - start > timedelta(days=self.MAX_WINDOW_DAYS):
+            raise ValidationError({'to': f"The window may span at most {self.MAX_WINDOW_DAYS} days."})
+        return start, end
+
+    @staticmethod
+    def _parse_bound(name, value, inclusive=False):
+        if not value:
+            raise ValidationError({name: "This query parameter is required."})
+        try:
+            moment = parse_datetime(value)
+            day = parse_date(value) if moment is None else None
+        except ValueError:
+            moment = day = None
+        if moment is None:
+            if day is None:
+                raise ValidationError({name: "Enter a valid date or datetime."})
+            moment = datetime.combine(day + timedelta(days=1) if inclusive else day, time.min)
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Assign slots to many applications and create all interviews in one transaction."""
+        if request.user.role != 'employer':
+            raise PermissionDenied("Only employers can schedule interviews.")
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        interviews = serializer.save()
+        data = InterviewScheduleSerializer(interviews, many=True, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='feed-url', url_name='feed-url')
+    def feed_url(self, request):
+        """Subscription URL of the current user's iCalendar feed."""
+        url = reverse('interview-feed', kwargs={'token': feed_token(request.user)})
+        return Response({'url': request.build_absolute_uri(url)})
+
+    @feed_url.mapping.post
+    def rotate_feed_url(self, request):
+        """Issue a new feed URL, revoking every one handed out before."""
+        url = reverse('interview-feed', kwargs={'token': rotate_feed_token(request.user)})
+        return Response({'url': request.build_absolute_uri(url)})
+
+    @action(detail=False, methods=['get'], url_path='free-slots')
+    def free_slots(self, request):
+        """
+        Gaps of at least `?duration=` minutes (default 60) in the interviewer's calendar within
+        the `?from=&to=` window. Staff may look at another interviewer with `?interviewer=`.
+        """
+        start, end = self.get_date_window()
+        duration = self._parse_duration(request.query_params.get('duration'))
+        interviewer_id = request.user.pk
+        if request.query_params.get('interviewer') and request.user.is_staff:
+            try:
+                interviewer_id = int(request.query_params['interviewer'])
+            except ValueError:
+                raise ValidationError({'interviewer': "Enter a valid user id."})
+
+        busy = busy_intervals([interviewer_id], start, end).get(interviewer_id, [])
+        slots = free_slots(busy, start, end, timedelta(minutes=duration))
+        return Response({
+            'interviewer': interviewer_id,
+            'duration_minutes': duration,
+            'slots': [{'start': slot_start, 'end': slot_end} for slot_start, slot_end in slots],
+        })
+
+    @staticmethod
+    def _parse_duration(value):
+        if not value:
+            return InterviewSchedule.DEFAULT_DURATION_MINUTES
+        try:
+            duration = int(value)
+        except ValueError:
+            raise ValidationError({'duration': "Enter a whole number of minutes."})
+        if not 1 <= duration <= InterviewSchedule.MAX_DURATION_MINUTES:
+            raise ValidationError(
+                {'duration': f"Must be between 1 and {InterviewSchedule.MAX_DURATION_MINUTES} minutes."}
+            )
+        return duration
+
+
+
+class ApplicantNoteViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = ApplicantNoteSerializer
     permission_classes = [permissions.IsAuthenticated]
 
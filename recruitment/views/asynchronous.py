@@ -0,0 +1,20 @@
+from core.asynchronous import async_action, async_list, async_retrieve
+from recruitment.views.job import CategoryViewSet, TagViewSet, JobViewSet
+
+
+
+# Async reads served under SERVER_MODE = 'asgi', keyed by the router's URL names
+async_read_views = {
+    # Served from the reference snapshot, refreshed in initial()
+    'category-list': async_action(CategoryViewSet, 'list'),
+    'category-detail': async_action(CategoryViewSet, 'retrieve'),
+    'tag-list': async_action(TagViewSet, 'list'),
+    'tag-detail': async_action(TagViewSet, 'retrieve'),
+    'job-list': async_list(JobViewSet),
+    'job-detail': async_retrieve(JobViewSet),
+}
+
+# Sync-only endpoints (file uploads, downloads and archives) run on the bounded sync pool
+offloaded_views = (
+    'application-list', 'application-detail', 'application-resume', 'job-resumes-zip',
+)
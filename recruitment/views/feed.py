@@ -0,0 +1,31 @@
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from recruitment.feeds import get_feed, parse_feed_token, render_feed
+
+
+
+
+@require_safe
+def interview_feed(request, token):
+    """
+    iCalendar feed of the interviews involving the token's user. Calendar clients poll this
+    URL, so the response comes from the cached per-user feed and revalidation with
+    `If-None-Match` is answered without touching the database. Tokens of inactive users,
+    or signed with a nonce the user has since rotated, are unknown.
+    """
+    parsed = parse_feed_token(token)
+    if parsed is None:
+        raise Http404("Unknown feed.")
+
+    user_id, nonce = parsed
+    feed = get_feed(user_id)
+    if feed['nonce'] != nonce:
+        raise Http404("Unknown feed.")
+    response = get_conditional_response(request, etag=feed['etag'])
+    if response is None:
+        response = HttpResponse(render_feed(feed), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = feed['etag']
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
@@ -1,35 +1,45 @@
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import content_disposition_header
+from django.utils.text import slugify
 
 from rest_framework import viewsets, permissions, mixins
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
-from recruitment.models import Category, Tag, CompanyProfile, Job
+from recruitment.models import Category, Tag, CompanyProfile, Job, Application
 from recruitment.serializers import (
     CategorySerializer, TagSerializer, CompanyProfileSerializer,
     JobListSerializer, JobDetailSerializer
 )
+from recruitment.reference import ReferenceDataViewMixin, ReferenceTableViewSetMixin
 from core.models import User
+from core.downloads import stream_zip
+from core.mixins import SerializerQueryPlanMixin
 
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ReferenceTableViewSetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
+    reference_table = 'categories'
 
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(ReferenceTableViewSetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
+    reference_table = 'tags'
 
 
 
-class CompanyProfileViewSet(viewsets.ModelViewSet):
+class CompanyProfileViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     queryset = CompanyProfile.objects.select_related("user").all()
     serializer_class = CompanyProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -49,8 +59,11 @@ class CompanyProfileViewSet(viewsets.ModelViewSet):
 
 
 
-class JobViewSet(viewsets.ModelViewSet):
-    queryset = Job.objects.select_related("employer", "category").prefetch_related("tags").all()
+class JobViewSet(ReferenceDataViewMixin, SerializerQueryPlanMixin, viewsets.ModelViewSet):
+    # Categories and tags are rendered from the reference snapshot; only tag ids are fetched
+    queryset = Job.objects.select_related("employer").prefetch_related(
+        Prefetch("tags", queryset=Tag.objects.only("id"))
+    ).all()
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_serializer_class(self):
@@ -72,3 +85,27 @@ class JobViewSet(viewsets.ModelViewSet):
         if self.request.user.role != 'employer':
             raise PermissionDenied("Only employers can post jobs.")
         serializer.save(employer=self.request.user)
+
+    @action(detail=True, methods=['get'], url_path=r'resumes\.zip', permission_classes=[permissions.IsAuthenticated])
+    def resumes_zip(self, request, pk=None):
+        """Stream every resume submitted for one of the employer's jobs as a single ZIP archive."""
+        job = get_object_or_404(Job.objects.only('id', 'title', 'employer'), pk=pk, employer=request.user)
+        response = StreamingHttpResponse(stream_zip(self._iter_resumes(job)), content_type='application/zip')
+        response['Content-Disposition'] = content_disposition_header(True, f'{slugify(job.title) or "job"}-resumes.zip')
+        return response
+
+    @staticmethod
+    def _iter_resumes(job, batch_size=500):
+        # Keyset pagination keeps memory flat even where the DB driver buffers whole result sets
+        applications = Application.objects.filter(job=job).exclude(resume='').select_related('applicant').only(
+            'id', 'resume', 'applicant', 'applicant__username', 'applicant__email',
+            'applicant__first_name', 'applicant__last_name',
+        ).order_by('pk')
+        last_pk = 0
+        while True:
+            batch = list(applications.filter(pk__gt=last_pk)[:batch_size])
+            for application in batch:
+                yield application.get_resume_filename(), application.resume
+            if len(batch) < batch_size:
+                return
+            last_pk = batch[-1].pk